@@ -0,0 +1,80 @@
+# benchmarks/__main__.py
+"""
+Запуск всех бенчмарков с отчетом в JSON и сравнением с эталоном.
+
+Примеры:
+    python -m benchmarks --output baseline.json
+    python -m benchmarks --quick --baseline baseline.json --tolerance 0.15
+    python -m benchmarks --suite frame_parser --suite measurement_model
+
+При сравнении код возврата 1 означает, что хотя бы одна метрика ухудшилась
+больше, чем на tolerance.
+"""
+
+import argparse
+import datetime
+import importlib
+import json
+import platform
+import sys
+
+from .common import compare, format_results
+
+SUITES = {
+    'frame_parser': 'benchmarks.bench_frame_parser',
+    'signal_filters': 'benchmarks.bench_signal_filters',
+    'signal_path': 'benchmarks.bench_signal_path',
+    'measurement_model': 'benchmarks.bench_measurement_model',
+    'main_widget': 'benchmarks.bench_main_widget',
+    'plot_canvas': 'benchmarks.bench_plot_canvas',
+    'memory': 'benchmarks.bench_memory',
+    'startup': 'benchmarks.bench_startup',
+}
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument('--suite', action='append', choices=sorted(SUITES),
+                            help="Запускать только указанные наборы (можно несколько)")
+    arg_parser.add_argument('--quick', action='store_true', help="Уменьшенные размеры для быстрой проверки")
+    arg_parser.add_argument('--output', help="Сохранить результаты в JSON")
+    arg_parser.add_argument('--baseline', help="JSON эталонного запуска для сравнения")
+    arg_parser.add_argument('--tolerance', type=float, default=0.15, help="Допустимое ухудшение (доля)")
+    args = arg_parser.parse_args()
+
+    import numpy as np
+    report = {
+        'meta': {
+            'created': datetime.datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'quick': args.quick,
+        },
+        'results': {},
+    }
+    for suite in args.suite or SUITES:
+        print(f"Набор {suite}...", file=sys.stderr)
+        module = importlib.import_module(SUITES[suite])
+        report['results'][suite] = module.run(quick=args.quick)
+
+    print("\n".join(format_results(report['results'])))
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        if baseline['meta'].get('quick') != args.quick:
+            print("Внимание: эталон снят с другим значением --quick, размеры замеров не совпадают.")
+        lines, regressions = compare(report['results'], baseline['results'], args.tolerance)
+        print()
+        print("\n".join(lines))
+        print(f"\nРегрессий: {regressions} (допуск {args.tolerance:.0%})")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,77 @@
+# benchmarks/bench_frame_parser.py
+"""
+Бенчмарк потокового разборщика FrameParser.
+
+Подает на вход несколько мегабайт синтетических кадров "12.345m,0079\r\n"
+кусками разного размера и выводит пропускную способность и стоимость байта.
+
+Запуск: python -m benchmarks.bench_frame_parser [--megabytes 4]
+"""
+
+import argparse
+import random
+import time
+
+from src.utils.frame_parser import FrameParser
+from .common import metric, HIGHER, LOWER
+
+CHUNK_SIZES = (1, 7, 64, 1024, 65536)
+
+
+def make_stream(megabytes, seed=0):
+    """Формирует поток синтетических кадров измерения заданного объема."""
+    rng = random.Random(seed)
+    frames = [f"{rng.uniform(0.03, 40.0):6.3f}m,{rng.randint(0, 9999):04d}\r\n".encode('ascii')
+              for _ in range(1000)]
+    frame_bytes = b''.join(frames)
+    repeats = max(1, int(megabytes * 1024 * 1024) // len(frame_bytes))
+    return frame_bytes * repeats, len(frames) * repeats
+
+
+def run_case(stream, chunk_size):
+    """Разбирает поток кусками chunk_size, возвращает (секунды, число кадров)."""
+    parser = FrameParser()
+    view = memoryview(stream)
+    frames = 0
+    start = time.perf_counter()
+    for offset in range(0, len(stream), chunk_size):
+        frames += len(parser.feed(view[offset:offset + chunk_size]))
+    return time.perf_counter() - start, frames
+
+
+def measure(megabytes):
+    """Замеры для всех размеров кусков: список (кусок, МБ, секунды, кадры)."""
+    rows = []
+    for chunk_size in CHUNK_SIZES:
+        # Мелкие куски упираются в накладные расходы вызова, для них поток короче
+        size = megabytes if chunk_size >= 64 else megabytes / 16
+        stream, expected = make_stream(size)
+        elapsed, frames = run_case(stream, chunk_size)
+        if frames != expected:
+            raise RuntimeError(f"Разобрано {frames} кадров из {expected} (кусок {chunk_size} Б)")
+        rows.append((chunk_size, len(stream) / (1024 * 1024), elapsed, frames))
+    return rows
+
+
+def run(quick=False):
+    """Метрики для общего отчета (python -m benchmarks)."""
+    results = {}
+    for chunk_size, size_mb, elapsed, frames in measure(0.5 if quick else 4.0):
+        results[f"frames_per_s[chunk={chunk_size}]"] = metric(frames / elapsed, "кадров/с", HIGHER)
+        results[f"ns_per_byte[chunk={chunk_size}]"] = metric(elapsed * 1e9 / (size_mb * 1024 * 1024), "нс", LOWER)
+    return results
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument('--megabytes', type=float, default=4.0, help="Объем потока для крупных кусков")
+    args = arg_parser.parse_args()
+
+    print(f"{'Кусок, Б':>10} {'Объем, МБ':>10} {'МБ/с':>10} {'кадров/с':>12} {'нс/байт':>10}")
+    for chunk_size, size_mb, elapsed, frames in measure(args.megabytes):
+        print(f"{chunk_size:>10} {size_mb:>10.2f} {size_mb / elapsed:>10.2f} "
+              f"{frames / elapsed:>12.0f} {elapsed * 1e9 / (size_mb * 1024 * 1024):>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+# benchmarks/bench_main_widget.py
+"""
+Бенчмарк MainWidget.on_data_updated при росте истории.
+
+Модель заполняется до N измерений, после чего измеряется время одной
+перерисовки (индикаторы, таблица, график) при добавлении одного измерения
+между перерисовками — худший случай, когда RefreshScheduler не успевает
+объединять изменения. Замер выполняется для окна последних измерений
+и для режима «Вся сессия».
+
+Запуск: python -m benchmarks.bench_main_widget [--updates 200]
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from .common import metric, qt_application, LOWER
+
+HISTORY_SIZES = (10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6)
+
+
+def create_widget():
+    """Создает MainWidget поверх симулятора датчика."""
+    from src.controllers.data_controller import DataController
+    from src.controllers.sensor_controller import SensorController
+    from src.utils.sensor_simulator import SimulatedSerialHandler
+    from src.views.main_widget import MainWidget
+
+    widget = MainWidget(SensorController(SimulatedSerialHandler()), DataController())
+    widget.resize(900, 700)
+    widget.show()
+    return widget
+
+
+def measure(widget, app, history, updates, whole_session):
+    """Среднее время on_data_updated (мс) при истории history измерений."""
+    model = widget.data_controller.model
+    model.clear_measurements()
+    timestamps = 1.7e9 + np.arange(history) * 0.125
+    model.live_store.extend(timestamps, 5.0 + np.sin(np.arange(history) / 100.0), np.full(history, 79))
+    widget.whole_session_checkbox.setChecked(whole_session)
+    widget.on_data_updated()
+    app.processEvents()
+
+    timestamp = timestamps[-1]
+    elapsed = 0.0
+    for i in range(updates):
+        timestamp += 0.125
+        model.add_measurement(5.0 + 0.01 * (i % 7), 79, timestamp)
+        start = time.perf_counter()
+        widget.on_data_updated()
+        app.processEvents()
+        elapsed += time.perf_counter() - start
+    return elapsed * 1000.0 / updates
+
+
+def run(quick=False, updates=None):
+    """Метрики для общего отчета (python -m benchmarks)."""
+    app = qt_application()
+    widget = create_widget()
+    updates = updates or (30 if quick else 200)
+    results = {}
+    for history in HISTORY_SIZES[:3] if quick else HISTORY_SIZES:
+        for whole_session in (False, True):
+            name = 'whole_session_ms' if whole_session else 'recent_window_ms'
+            value = measure(widget, app, history, updates, whole_session)
+            results[f"{name}[n={history}]"] = metric(value, "мс", LOWER)
+    widget.close()
+    return results
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument('--updates', type=int, default=200, help="Перерисовок на замер")
+    args = arg_parser.parse_args()
+
+    results = run(updates=args.updates)
+    print(f"{'N':>10} {'окно, мс':>10} {'вся сессия, мс':>16}")
+    for history in HISTORY_SIZES:
+        print(f"{history:>10} {results[f'recent_window_ms[n={history}]']['value']:>10.2f} "
+              f"{results[f'whole_session_ms[n={history}]']['value']:>16.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+# benchmarks/bench_measurement_model.py
+"""
+Бенчмарк MeasurementModel: добавление и выборка при 10^3–10^7 измерений.
+
+Для каждого размера истории N модель заполняется пачкой до N измерений,
+после чего измеряется:
+    * add_measurement — стоимость добавления одного измерения при размере N;
+    * extend — добавление пачками по 1000 измерений в хранилище (на измерение);
+    * model_extend — то же через MeasurementModel.extend (с фильтрацией и статистикой);
+    * get_distances(1000) / get_timestamps() — выборка последнего окна и
+      всей колонки (представления без копирования);
+    * get_measurements(1000) — окно в виде MeasurementView.
+
+Запуск: python -m benchmarks.bench_measurement_model [--max-size 10000000]
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from src.models.measurement_model import MeasurementModel
+from .common import metric, LOWER
+
+SIZES = (10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6, 10 ** 7)
+APPENDS = 10000
+BATCH = 1000
+SLICE_CALLS = 10000
+
+
+def prefill(model, size):
+    """Заполняет модель size измерениями одной пачкой."""
+    timestamps = 1.7e9 + np.arange(size) * 0.125
+    distances = 5.0 + np.sin(np.arange(size) / 100.0)
+    model.live_store.extend(timestamps, distances, np.full(size, 79))
+
+
+def measure_size(size):
+    """Замеры для размера истории size; возвращает словарь ns/us на операцию."""
+    model = MeasurementModel()
+    prefill(model, size)
+    timestamp = 1.7e9 + size * 0.125
+
+    start = time.perf_counter()
+    for i in range(APPENDS):
+        model.add_measurement(5.0, 79, timestamp + i)
+    append_ns = (time.perf_counter() - start) * 1e9 / APPENDS
+
+    batch_t = np.arange(BATCH, dtype=np.float64)
+    batch_d = np.full(BATCH, 5.0)
+    batch_q = np.full(BATCH, 79)
+    batches = max(1, APPENDS // BATCH)
+    start = time.perf_counter()
+    for _ in range(batches):
+        model.live_store.extend(batch_t, batch_d, batch_q)
+    extend_ns = (time.perf_counter() - start) * 1e9 / (batches * BATCH)
+
+    start = time.perf_counter()
+    for _ in range(batches):
+        model.extend(batch_t, batch_d, batch_q)
+    model.statistics  # Досчитать отложенную синхронизацию
+    model_extend_ns = (time.perf_counter() - start) * 1e9 / (batches * BATCH)
+
+    results = {'append_ns': append_ns, 'extend_ns': extend_ns, 'model_extend_ns': model_extend_ns}
+    for name, call in (('get_distances_1000_us', lambda: model.get_distances(1000)),
+                       ('get_timestamps_all_us', model.get_timestamps),
+                       ('get_measurements_1000_us', lambda: model.get_measurements(1000))):
+        start = time.perf_counter()
+        for _ in range(SLICE_CALLS):
+            call()
+        results[name] = (time.perf_counter() - start) * 1e6 / SLICE_CALLS
+    return results
+
+
+def run(quick=False):
+    """Метрики для общего отчета (python -m benchmarks)."""
+    results = {}
+    for size in SIZES[:3] if quick else SIZES:
+        for name, value in measure_size(size).items():
+            unit = "нс" if name.endswith('_ns') else "мкс"
+            results[f"{name}[n={size}]"] = metric(value, unit, LOWER)
+    return results
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument('--max-size', type=int, default=SIZES[-1], help="Наибольший размер истории")
+    args = arg_parser.parse_args()
+
+    print(f"{'N':>10} {'append, нс':>12} {'extend, нс':>12} {'model, нс':>10} {'окно, мкс':>10} {'колонка, мкс':>13} "
+          f"{'view, мкс':>10}")
+    for size in SIZES:
+        if size > args.max_size:
+            break
+        r = measure_size(size)
+        print(f"{size:>10} {r['append_ns']:>12.0f} {r['extend_ns']:>12.1f} {r['model_extend_ns']:>10.1f} "
+              f"{r['get_distances_1000_us']:>10.2f} "
+              f"{r['get_timestamps_all_us']:>13.2f} {r['get_measurements_1000_us']:>10.2f}")
+
+
+if __name__ == '__main__':
+    main()
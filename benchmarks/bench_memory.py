@@ -0,0 +1,78 @@
+# benchmarks/bench_memory.py
+"""
+Бенчмарк пиковой памяти MeasurementModel.
+
+Каждый замер выполняется в отдельном процессе: добавляется N измерений
+(по одному через add_measurement, как при работе с датчиком), и прирост
+пикового RSS относительно текущего RSS после импортов пересчитывается
+на миллион измерений. Для сравнения выводится объем массивов хранилища.
+
+Запуск: python -m benchmarks.bench_memory [--samples 1000000]
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+
+from .common import metric, current_rss_bytes, peak_rss_bytes, LOWER
+
+SAMPLE_COUNTS = (10 ** 5, 10 ** 6, 4 * 10 ** 6)
+
+
+def child(samples):
+    """Выполняется в дочернем процессе: заполняет модель и печатает JSON с замерами."""
+    from src.models.measurement_model import MeasurementModel
+    model = MeasurementModel()
+    # Пик после импортов может быть выше текущего RSS, поэтому отсчет от текущего
+    before = current_rss_bytes() or peak_rss_bytes()
+    timestamp = 1.7e9
+    for i in range(samples):
+        model.add_measurement(5.0, 79, timestamp + i * 0.125)
+    after = peak_rss_bytes()
+    print(json.dumps({'rss_delta': after - before, 'store_bytes': model.live_store.nbytes}))
+
+
+def measure(samples):
+    """Запускает дочерний процесс; возвращает (прирост RSS, байты хранилища) в байтах."""
+    output = subprocess.run([sys.executable, '-m', 'benchmarks.bench_memory', '--child', str(samples)],
+                            check=True, capture_output=True, text=True).stdout
+    result = json.loads(output.strip().splitlines()[-1])
+    return result['rss_delta'], result['store_bytes']
+
+
+def run(quick=False):
+    """Метрики для общего отчета (python -m benchmarks)."""
+    if peak_rss_bytes() is None:
+        return {}  # Нет модуля resource (Windows)
+    results = {}
+    for samples in SAMPLE_COUNTS[:2] if quick else SAMPLE_COUNTS:
+        rss_delta, store_bytes = measure(samples)
+        scale = 1e6 / samples / (1024 * 1024)
+        results[f"peak_rss_mb_per_million[n={samples}]"] = metric(rss_delta * scale, "МБ", LOWER)
+        results[f"store_mb_per_million[n={samples}]"] = metric(store_bytes * scale, "МБ", LOWER)
+    return results
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument('--samples', type=int, default=None, help="Один замер на указанное число измерений")
+    arg_parser.add_argument('--child', type=int, default=None, help=argparse.SUPPRESS)
+    args = arg_parser.parse_args()
+
+    if args.child is not None:
+        child(args.child)
+        return
+    if peak_rss_bytes() is None:
+        print("Пиковая память недоступна на этой платформе (нет модуля resource).")
+        return
+
+    print(f"{'N':>10} {'RSS, МБ/млн':>12} {'массивы, МБ/млн':>16}")
+    for samples in (args.samples,) if args.samples else SAMPLE_COUNTS:
+        rss_delta, store_bytes = measure(samples)
+        scale = 1e6 / samples / (1024 * 1024)
+        print(f"{samples:>10} {rss_delta * scale:>12.1f} {store_bytes * scale:>16.1f}")
+
+
+if __name__ == '__main__':
+    main()
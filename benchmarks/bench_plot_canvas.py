@@ -0,0 +1,103 @@
+# benchmarks/bench_plot_canvas.py
+"""
+Бенчмарк перерисовки PlotCanvas.
+
+Для 1k/10k/100k точек измеряет число кадров в секунду при обновлении
+линии через update_line (blit по закешированному фону) и, для сравнения,
+при полной перерисовке фигуры (axes.clear() + plot() + draw()).
+Qt запускается без окна (платформа offscreen).
+
+Запуск: python -m benchmarks.bench_plot_canvas [--frames 100]
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from .common import metric, qt_application, HIGHER
+
+POINT_COUNTS = (1000, 10000, 100000)
+
+
+def make_data(points, seed=0):
+    rng = np.random.default_rng(seed)
+    x = np.arange(points) * 0.125
+    y = (5.0 + np.cumsum(rng.normal(0, 0.01, points))).astype(np.float32)
+    return x, y
+
+
+def bench_blit(canvas, app, x, y, frames):
+    """Кадров в секунду для update_line при неизменных пределах осей."""
+    canvas.reset()
+    canvas.update_line(x, y)
+    canvas.draw()  # Полная отрисовка с кешированием фона
+    app.processEvents()
+    start = time.perf_counter()
+    for frame in range(frames):
+        canvas.update_line(x, np.roll(y, frame))
+        app.processEvents()
+    return frames / (time.perf_counter() - start)
+
+
+def bench_full_redraw(canvas, app, x, y, frames):
+    """Кадров в секунду для прежней схемы: очистка осей и полная перерисовка."""
+    axes = canvas.axes
+    start = time.perf_counter()
+    for frame in range(frames):
+        axes.clear()
+        axes.plot(x, np.roll(y, frame), marker='.', linestyle='-')
+        axes.set_xlabel("Время")
+        axes.set_ylabel("Расстояние (м)")
+        axes.grid(True)
+        canvas.draw()
+        app.processEvents()
+    elapsed = time.perf_counter() - start
+    # Восстанавливаем оси для следующих замеров
+    axes.clear()
+    axes.grid(True)
+    canvas.line, = axes.plot([], [], marker='.', linestyle='-', animated=True)
+    return frames / elapsed
+
+
+def measure(frames):
+    """Замеры для всех размеров: список (точек, blit к/с, полная к/с)."""
+    app = qt_application()
+    from src.views.plot_canvas import PlotCanvas
+
+    canvas = PlotCanvas()
+    canvas.resize(800, 600)
+    canvas.show()
+    app.processEvents()
+
+    rows = []
+    for points in POINT_COUNTS:
+        x, y = make_data(points)
+        blit_fps = bench_blit(canvas, app, x, y, frames)
+        full_fps = bench_full_redraw(canvas, app, x, y, max(5, frames // 10))
+        rows.append((points, blit_fps, full_fps))
+    canvas.close()
+    return rows
+
+
+def run(quick=False):
+    """Метрики для общего отчета (python -m benchmarks)."""
+    results = {}
+    for points, blit_fps, full_fps in measure(20 if quick else 100):
+        results[f"blit_fps[points={points}]"] = metric(blit_fps, "к/с", HIGHER)
+        results[f"full_redraw_fps[points={points}]"] = metric(full_fps, "к/с", HIGHER)
+    return results
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument('--frames', type=int, default=100, help="Кадров на замер")
+    args = arg_parser.parse_args()
+
+    print(f"{'Точек':>8} {'blit, к/с':>12} {'полная, к/с':>14}")
+    for points, blit_fps, full_fps in measure(args.frames):
+        print(f"{points:>8} {blit_fps:>12.1f} {full_fps:>14.1f}")
+
+
+if __name__ == '__main__':
+    main()
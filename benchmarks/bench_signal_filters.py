@@ -0,0 +1,77 @@
+# benchmarks/bench_signal_filters.py
+"""
+Бенчмарк конвейера фильтрации FilterPipeline.
+
+Синтетический поток быстрого режима (шум 3 мм, редкие выбросы и измерения
+с плохим качеством) фильтруется пачками разного размера; выводится
+стоимость одного измерения для каждой ступени и для всего конвейера.
+
+Запуск: python -m benchmarks.bench_signal_filters [--samples 1000000]
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from src.utils.signal_filters import FilterPipeline
+from .common import metric, LOWER
+
+BATCH_SIZES = (16, 256, 4096)
+
+
+def make_stream(samples, seed=0):
+    """Поток (timestamps, distances, qualities) с выбросами и плохими измерениями."""
+    rng = np.random.default_rng(seed)
+    timestamps = 1.7e9 + np.arange(samples) * 0.05
+    distances = (5.0 + rng.normal(0.0, 0.003, samples)).astype(np.float32)
+    distances[::500] += 1.0
+    qualities = rng.integers(20, 200, samples).astype(np.uint16)
+    qualities[::700] = 5000
+    return timestamps, distances, qualities
+
+
+def run_case(stream, batch_size, stages=None):
+    """Фильтрует поток пачками; возвращает наносекунды на измерение."""
+    pipeline = FilterPipeline.from_options({})
+    if stages is not None:
+        pipeline.stages = [pipeline.stages[i] for i in stages]
+    timestamps, distances, qualities = stream
+    start = time.perf_counter()
+    for offset in range(0, len(timestamps), batch_size):
+        end = offset + batch_size
+        pipeline.process(timestamps[offset:end], distances[offset:end], qualities[offset:end])
+    return (time.perf_counter() - start) * 1e9 / len(timestamps)
+
+
+def measure(samples):
+    """Замеры: список (название, пачка, нс на измерение)."""
+    rows = []
+    for batch_size in BATCH_SIZES:
+        # Мелкие пачки упираются в накладные расходы вызова, для них поток короче
+        stream = make_stream(samples if batch_size >= 256 else samples // 16)
+        rows.append(('pipeline', batch_size, run_case(stream, batch_size)))
+    stream = make_stream(samples)
+    for name, index in (('quality_gate', 0), ('hampel', 1), ('kalman', 2)):
+        rows.append((name, BATCH_SIZES[-1], run_case(stream, BATCH_SIZES[-1], [index])))
+    return rows
+
+
+def run(quick=False):
+    """Метрики для общего отчета (python -m benchmarks)."""
+    return {f"{name}_ns[batch={batch_size}]": metric(value, "нс", LOWER)
+            for name, batch_size, value in measure(100000 if quick else 1000000)}
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument('--samples', type=int, default=1000000, help="Число измерений в потоке")
+    args = arg_parser.parse_args()
+
+    print(f"{'Ступень':<14} {'Пачка':>8} {'нс/изм.':>10}")
+    for name, batch_size, value in measure(args.samples):
+        print(f"{name:<14} {batch_size:>8} {value:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
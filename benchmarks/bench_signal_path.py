@@ -0,0 +1,86 @@
+# benchmarks/bench_signal_path.py
+"""
+Бенчмарк пути измерений через сигналы Qt: SensorController → DataController.
+
+Пачки кадров непрерывного режима подаются в SensorController так же, как
+их доставляет AsyncSensorAdapter, и измеряется стоимость одного измерения
+до записи в модель для двух способов подключения:
+
+    per_sample — measurement_taken → DataController.add_measurement
+                 (сигнал, слот и data_updated на каждое измерение);
+    batch      — measurements_batch → DataController.add_measurements_batch
+                 (один сигнал с массивами NumPy на пачку).
+
+Запуск: python -m benchmarks.bench_signal_path [--samples 200000]
+"""
+
+import argparse
+import time
+
+from .common import metric, qt_application, LOWER
+
+BATCH_SIZES = (1, 16, 256)
+
+
+def make_batches(samples, batch_size):
+    """Пачки ReadingBatch с измерениями расстояния."""
+    from src.core.async_sensor import ReadingBatch, Reading
+    from src.utils.frame_parser import DistanceFrame
+
+    batches = []
+    for offset in range(0, samples, batch_size):
+        batch = ReadingBatch()
+        for i in range(offset, min(offset + batch_size, samples)):
+            batch.append(Reading(1.7e9 + i * 0.05, DistanceFrame(5.0 + (i % 7) * 0.001, 79)))
+        batches.append(batch)
+    return batches
+
+
+def run_case(connection, samples, batch_size):
+    """Нс на измерение от пачки кадров до записи в модель."""
+    from src.controllers.data_controller import DataController
+    from src.controllers.sensor_controller import SensorController
+    from src.utils.sensor_simulator import SimulatedSerialHandler
+
+    sensor_controller = SensorController(SimulatedSerialHandler())
+    data_controller = DataController()
+    if connection == 'batch':
+        sensor_controller.measurements_batch.connect(data_controller.add_measurements_batch)
+    else:
+        sensor_controller.measurement_taken.connect(data_controller.add_measurement)
+    sensor_controller._is_measuring_continuous = True
+
+    batches = make_batches(samples, batch_size)
+    start = time.perf_counter()
+    for batch in batches:
+        sensor_controller._on_continuous_batch(batch)
+    elapsed = time.perf_counter() - start
+    assert len(data_controller.model.live_store) == samples
+    return elapsed * 1e9 / samples
+
+
+def measure(samples):
+    """Замеры: список (подключение, пачка, нс на измерение)."""
+    qt_application()
+    return [(connection, batch_size, run_case(connection, samples, batch_size))
+            for batch_size in BATCH_SIZES for connection in ('per_sample', 'batch')]
+
+
+def run(quick=False):
+    """Метрики для общего отчета (python -m benchmarks)."""
+    return {f"{connection}_ns[batch={batch_size}]": metric(value, "нс", LOWER)
+            for connection, batch_size, value in measure(20000 if quick else 200000)}
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument('--samples', type=int, default=200000, help="Число измерений")
+    args = arg_parser.parse_args()
+
+    print(f"{'Подключение':<12} {'Пачка':>6} {'нс/изм.':>10}")
+    for connection, batch_size, value in measure(args.samples):
+        print(f"{connection:<12} {batch_size:>6} {value:>10.0f}")
+
+
+if __name__ == '__main__':
+    main()
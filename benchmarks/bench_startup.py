@@ -0,0 +1,83 @@
+# benchmarks/bench_startup.py
+"""
+Бенчмарк времени запуска GUI.
+
+Каждый замер выполняется в отдельном процессе (холодные импорты): главное
+окно строится поверх симулятора датчика и показывается, после чего из
+отметок STARTUP берутся время импорта модулей и время до первой отрисовки
+(от старта процесса). Отдельно измеряется отложенное создание графика при
+первых данных. Берется медиана по нескольким запускам.
+
+Запуск: python -m benchmarks.bench_startup [--runs 5]
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+
+from .common import metric, qt_application, LOWER
+
+
+def child():
+    """Выполняется в дочернем процессе: запускает окно и печатает JSON с отметками."""
+    app = qt_application()
+    from src.controllers.data_controller import DataController
+    from src.controllers.sensor_controller import SensorController
+    from src.utils.sensor_simulator import SimulatedSerialHandler
+    from src.utils.startup_timing import STARTUP
+    from src.views.main_window import MainWindow
+
+    window = MainWindow(SensorController(SimulatedSerialHandler()), DataController())
+    window.show()
+    deadline = time.monotonic() + 10.0
+    while not {'first_paint', 'ports_listed'} <= set(STARTUP.marks) and time.monotonic() < deadline:
+        app.processEvents()
+        time.sleep(0.001)
+
+    # Первые данные: график и matplotlib создаются только сейчас
+    window.data_controller.add_measurement(5.0, 79)
+    start = time.perf_counter()
+    window.combined_widget.on_data_updated()
+    plot_ms = (time.perf_counter() - start) * 1000.0
+    print(json.dumps({**STARTUP.to_dict(), 'plot_canvas_ms': plot_ms}))
+    window.close()
+
+
+def measure():
+    """Один запуск в дочернем процессе; возвращает словарь отметок."""
+    output = subprocess.run([sys.executable, '-m', 'benchmarks.bench_startup', '--child'],
+                            check=True, capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def run(quick=False, runs=None):
+    """Метрики для общего отчета (python -m benchmarks)."""
+    samples = [measure() for _ in range(runs or (3 if quick else 7))]
+    results = {}
+    for name in ('imports', 'first_paint', 'ports_listed'):
+        values = [sample['marks_ms'][name] for sample in samples if name in sample['marks_ms']]
+        if values:
+            results[f"{name}_ms"] = metric(statistics.median(values), "мс", LOWER)
+    results['plot_canvas_ms'] = metric(statistics.median(sample['plot_canvas_ms'] for sample in samples),
+                                       "мс", LOWER)
+    return results
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument('--runs', type=int, default=5, help="Число запусков")
+    arg_parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    args = arg_parser.parse_args()
+
+    if args.child:
+        child()
+        return
+    for name, value in run(runs=args.runs).items():
+        print(f"{name:<20} {value['value']:>8.1f} {value['unit']}")
+
+
+if __name__ == '__main__':
+    main()
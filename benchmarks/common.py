@@ -0,0 +1,94 @@
+# benchmarks/common.py
+"""Общие средства бенчмарков: описание метрик, пиковая память, сравнение с эталоном."""
+
+import os
+import sys
+import time
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+HIGHER = 'higher'  # Чем больше, тем лучше (пропускная способность)
+LOWER = 'lower'    # Чем меньше, тем лучше (время, память)
+
+
+def metric(value, unit, better):
+    """Результат одного замера в формате JSON-отчета."""
+    return {'value': float(value), 'unit': unit, 'better': better}
+
+
+def timed(function, repeat=1):
+    """Лучшее время выполнения function() из repeat запусков, сек."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def peak_rss_bytes():
+    """Пиковый размер резидентной памяти процесса в байтах (None, если недоступно)."""
+    try:
+        import resource
+    except ImportError:
+        return None  # Windows
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux возвращает килобайты, macOS — байты
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def current_rss_bytes():
+    """Текущий размер резидентной памяти в байтах (Linux; иначе None)."""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def qt_application():
+    """Возвращает QApplication (без окна, платформа offscreen)."""
+    from PyQt5.QtWidgets import QApplication
+    return QApplication.instance() or QApplication([])
+
+
+def compare(results, baseline, tolerance):
+    """
+    Сравнивает результаты с эталоном.
+
+    Args:
+        results (dict): {набор: {метрика: metric(...)}} текущего запуска.
+        baseline (dict): То же для эталонного запуска.
+        tolerance (float): Допустимое ухудшение (0.15 — 15 %).
+
+    Returns:
+        tuple: (строки отчета, число регрессий).
+    """
+    lines = [f"{'Метрика':<48} {'эталон':>12} {'сейчас':>12} {'изм.':>8}"]
+    regressions = 0
+    for suite, metrics in results.items():
+        for name, current in metrics.items():
+            reference = baseline.get(suite, {}).get(name)
+            if reference is None or reference['value'] == 0:
+                continue
+            change = current['value'] / reference['value'] - 1.0
+            worse = -change if current['better'] == HIGHER else change
+            flag = ''
+            if worse > tolerance:
+                flag = '  РЕГРЕССИЯ'
+                regressions += 1
+            elif worse < -tolerance:
+                flag = '  улучшение'
+            lines.append(f"{suite + '.' + name:<48} {reference['value']:>12.4g} "
+                         f"{current['value']:>12.4g} {change * 100:>+7.1f}%{flag}")
+    return lines, regressions
+
+
+def format_results(results):
+    """Табличное представление результатов для вывода в консоль."""
+    lines = []
+    for suite, metrics in results.items():
+        lines.append(f"[{suite}]")
+        for name, value in metrics.items():
+            lines.append(f"  {name:<44} {value['value']:>14.4g} {value['unit']}")
+    return lines
@@ -0,0 +1,254 @@
+# src/cli.py
+"""
+Консольный режим для длительной записи без графического интерфейса.
+
+Пример:
+    python -m src.cli record --port /dev/ttyUSB0 --mode fast --out session.bin
+    python -m src.cli record --port COM3 --out logs/line1.bin --rotate-size 64 --rotate-time 3600
+
+Использует асинхронное ядро AsyncSensor и SessionRecorder; PyQt5 и
+matplotlib не импортируются. По SIGINT/SIGTERM поток измерений
+останавливается (X), лазер выключается (C), файл сессии дописывается и
+закрывается. Скорость записи периодически выводится в журнал.
+
+При ошибке порта или если данных нет дольше --stall-timeout, порт
+открывается заново с экспоненциальной задержкой (до --max-reconnect-delay)
+и запись продолжается в том же режиме; разрыв отмечается в сессии
+служебными записями EVENT_LINK_LOST/EVENT_LINK_RESTORED. --no-reconnect
+завершает запись при первой потере связи.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import logging
+import signal
+import sys
+import time
+
+import numpy as np
+
+from .core.async_sensor import AsyncSensor, SensorError, STREAM_COMMANDS
+from .core.reconnect import Backoff, stall_timeout
+from .models.session_recorder import RotatingSessionRecorder
+from .models.session_format import RECORD_DTYPE, EVENT_LINK_LOST, EVENT_LINK_RESTORED, SessionFormatError
+from .utils.frame_parser import DistanceFrame, ErrorFrame
+
+logger = logging.getLogger('src.cli')
+
+
+class RecordStats:
+    """Счетчики записи и периодический вывод скорости."""
+
+    def __init__(self):
+        self.started = time.monotonic()
+        self.samples = 0
+        self.errors = 0
+        self.reconnects = 0
+        self._mark = (self.started, 0)
+
+    def add(self, samples, errors):
+        self.samples += samples
+        self.errors += errors
+
+    def report(self, recorder):
+        now = time.monotonic()
+        mark_time, mark_samples = self._mark
+        rate = (self.samples - mark_samples) / max(now - mark_time, 1e-9)
+        self._mark = (now, self.samples)
+        path = recorder.recorder.path if recorder.recorder is not None else '-'
+        return (f"{self.samples} изм. ({rate:.1f} изм/с), ошибок {self.errors}, "
+                f"записей {recorder.records_written}, файл {path}")
+
+    def summary(self):
+        elapsed = time.monotonic() - self.started
+        return (f"Итого {self.samples} изм. и {self.errors} ошибок за {elapsed:.1f} с "
+                f"({self.samples / max(elapsed, 1e-9):.1f} изм/с), переподключений {self.reconnects}")
+
+
+def batch_records(batch):
+    """
+    Преобразует пачку Reading в массив RECORD_DTYPE.
+
+    Returns:
+        tuple: (массив записей, число измерений, число ошибок).
+    """
+    rows = []
+    errors = 0
+    for timestamp, record in batch:
+        if isinstance(record, DistanceFrame):
+            rows.append((timestamp, record.distance, record.quality, 0))
+        elif isinstance(record, ErrorFrame):
+            rows.append((timestamp, float('nan'), 0, record.code))
+            errors += 1
+    return np.array(rows, dtype=RECORD_DTYPE), len(rows) - errors, errors
+
+
+def _install_signal_handlers(loop, stop_event):
+    """SIGINT/SIGTERM завершают запись штатно; работает и вне главного потока цикла."""
+    def request_stop(signum, frame=None):
+        if stop_event.is_set():
+            return
+        logger.info(f"Получен сигнал {signal.Signals(signum).name}, завершение записи...")
+        loop.call_soon_threadsafe(stop_event.set)
+
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(signum, request_stop, signum)
+        except (NotImplementedError, RuntimeError):
+            signal.signal(signum, request_stop)  # Windows: обработчик Python вместо сигнала цикла
+
+
+async def record(args):
+    """Запись непрерывных измерений в файл сессии до сигнала или окончания --duration."""
+    loop = asyncio.get_running_loop()
+    stop_event = asyncio.Event()
+    _install_signal_handlers(loop, stop_event)
+
+    sensor = AsyncSensor(args.port, baudrate=args.baudrate)
+    try:
+        await sensor.open()
+    except Exception as e:
+        logger.error(f"Не удалось открыть порт {args.port}: {e}")
+        return 1
+
+    serial_number = version = ''
+    try:
+        frame = await sensor.read_version()
+        serial_number, version = frame.serial, frame.version
+        logger.info(f"Модуль: серийный номер {serial_number}, версия ПО {version}")
+    except SensorError as e:
+        logger.warning(f"Версия модуля не получена: {e}")
+
+    recorder = RotatingSessionRecorder(args.out, serial_number, version,
+                                       max_bytes=int(args.rotate_size * 1024 * 1024) if args.rotate_size else None,
+                                       max_seconds=args.rotate_time)
+    try:
+        recorder.start()
+    except (OSError, SessionFormatError) as e:
+        logger.error(f"Не удалось начать запись в {args.out}: {e}")
+        await sensor.close()
+        return 1
+    stats = RecordStats()
+    deadline = loop.time() + args.duration if args.duration else None
+    exit_code = 0
+
+    stall = args.stall_timeout or stall_timeout(args.mode)
+    backoff = Backoff(maximum=args.max_reconnect_delay)
+
+    async def stream():
+        """Пишет пачки до ошибки порта или паузы без данных дольше stall."""
+        async with contextlib.aclosing(sensor.stream_batches(args.mode)) as batches:
+            while True:
+                try:
+                    batch = await asyncio.wait_for(batches.__anext__(), stall)
+                except asyncio.TimeoutError:
+                    raise SensorError(f"нет данных {stall:.1f} с") from None
+                records, samples, errors = batch_records(batch)
+                if len(records):
+                    if not recorder.write_records(records):
+                        raise RuntimeError(f"Запись сессии остановлена: {recorder.error}")
+                    stats.add(samples, errors)
+
+    async def reconnect():
+        """Открывает порт заново, пока модуль не ответит на запрос статуса."""
+        nonlocal sensor
+        backoff.reset()
+        while True:
+            delay = backoff.next_delay()
+            logger.info(f"Попытка подключения {backoff.attempts} к {args.port} через {delay:.1f} с")
+            await asyncio.sleep(delay)
+            candidate = AsyncSensor(args.port, baudrate=args.baudrate)
+            try:
+                await candidate.open()
+                await candidate.read_status()
+            except (SensorError, OSError) as e:
+                logger.debug(f"Порт {args.port} недоступен: {e}")
+                await candidate.close()
+                continue
+            except asyncio.CancelledError:
+                await candidate.close()
+                raise
+            sensor = candidate
+            return
+
+    async def pump():
+        while True:
+            try:
+                await stream()
+            except (SensorError, OSError) as e:
+                if args.no_reconnect:
+                    raise
+                lost_at = time.time()
+                logger.warning(f"Связь с датчиком на {args.port} потеряна: {e}")
+                recorder.write_error(lost_at, EVENT_LINK_LOST)
+                await sensor.close()
+                await reconnect()
+                recorder.write_error(time.time(), EVENT_LINK_RESTORED)
+                stats.reconnects += 1
+                logger.info(f"Связь восстановлена после {time.time() - lost_at:.1f} с "
+                            f"({backoff.attempts} попыт.), запись продолжена")
+
+    async def report():
+        while True:
+            await asyncio.sleep(args.stats_interval)
+            logger.info(stats.report(recorder))
+
+    logger.info(f"Запись {args.port} в режиме {args.mode} -> {recorder.recorder.path}")
+    pump_task = asyncio.ensure_future(pump())
+    report_task = asyncio.ensure_future(report()) if args.stats_interval > 0 else None
+    stop_task = asyncio.ensure_future(stop_event.wait())
+    try:
+        timeout = None if deadline is None else max(deadline - loop.time(), 0)
+        await asyncio.wait({pump_task, stop_task}, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+        if pump_task.done() and pump_task.exception() is not None:
+            logger.error(f"Запись прервана: {pump_task.exception()}")
+            exit_code = 1
+    finally:
+        for task in (pump_task, report_task, stop_task):
+            if task is not None:
+                task.cancel()
+        await asyncio.gather(pump_task, stop_task, *(t for t in (report_task,) if t), return_exceptions=True)
+        # Поток уже остановлен (X отправлен при закрытии генератора); выключаем лазер
+        if sensor.is_open:
+            try:
+                await sensor.set_laser(False)
+            except SensorError as e:
+                logger.warning(f"Не удалось выключить лазер: {e}")
+        await sensor.close()
+        recorder.stop()
+        logger.info(stats.summary())
+        logger.info(f"Файлы сессии: {', '.join(recorder.files)}")
+    return exit_code
+
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(prog='python -m src.cli',
+                                         description="Консольная запись измерений JRT M703A без GUI")
+    commands = arg_parser.add_subparsers(dest='command', required=True)
+    record_parser = commands.add_parser('record', help="Непрерывная запись в файл сессии")
+    record_parser.add_argument('--port', required=True, help="Последовательный порт (COM3, /dev/ttyUSB0)")
+    record_parser.add_argument('--mode', default='fast', choices=tuple(STREAM_COMMANDS))
+    record_parser.add_argument('--out', required=True, help="Файл сессии (.bin)")
+    record_parser.add_argument('--baudrate', type=int, default=19200)
+    record_parser.add_argument('--rotate-size', type=float, default=None, help="Новый файл после N МБ")
+    record_parser.add_argument('--rotate-time', type=float, default=None, help="Новый файл через N секунд")
+    record_parser.add_argument('--duration', type=float, default=None, help="Остановить запись через N секунд")
+    record_parser.add_argument('--stats-interval', type=float, default=10.0,
+                               help="Период вывода скорости, сек (0 — не выводить)")
+    record_parser.add_argument('--stall-timeout', type=float, default=None,
+                               help="Потеря связи, если нет данных N секунд (по умолчанию по режиму)")
+    record_parser.add_argument('--max-reconnect-delay', type=float, default=30.0,
+                               help="Предел задержки между попытками переподключения, сек")
+    record_parser.add_argument('--no-reconnect', action='store_true',
+                               help="Завершать запись при потере связи вместо переподключения")
+    record_parser.add_argument('--verbose', action='store_true', help="Подробный журнал")
+    args = arg_parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.INFO,
+                        format='%(asctime)s %(levelname)s %(name)s: %(message)s')
+    return asyncio.run(record(args))
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,157 @@
+# src/controllers/async_adapter.py
+
+import asyncio
+import logging
+import threading
+import time
+from PyQt5.QtCore import QObject, pyqtSignal
+
+from ..core.adaptive_mode import adaptive_stream
+from ..core.async_sensor import AsyncSensor, SensorError, PRIORITY_NORMAL
+from ..utils.latency import TRACKER
+
+
+class AcquisitionLoop:
+    """
+    Общий цикл asyncio в фоновом потоке для всех датчиков приложения.
+
+    Все AsyncSensor живут в одном цикле; GUI-поток отправляет в него
+    корутины через submit()/run().
+    """
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    @classmethod
+    def instance(cls):
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever, name="AcquisitionLoop", daemon=True)
+        self._thread.start()
+
+    def submit(self, coroutine):
+        """Запускает корутину в цикле; возвращает concurrent.futures.Future."""
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop)
+
+    def run(self, coroutine, timeout=None):
+        """Выполняет корутину в цикле и ждет результат в вызывающем потоке."""
+        return self.submit(coroutine).result(timeout)
+
+
+class AsyncSensorAdapter(QObject):
+    """
+    Тонкая Qt-обертка над AsyncSensor для SensorController.
+
+    Команды ставятся в очередь AsyncSensor в общем цикле AcquisitionLoop
+    через submit_command() без ожидания ответа: результат передается
+    обратному вызову в GUI-потоке. Непрерывный режим работает как задача
+    цикла, передающая пачки в GUI-поток сигналом batch_ready. Ждут цикл
+    только open() и close().
+    """
+
+    # Пачка ReadingBatch — список Reading (timestamp, record) в порядке поступления
+    batch_ready = pyqtSignal(object)
+    # Ошибка ввода-вывода, после которой непрерывный режим завершен
+    read_failed = pyqtSignal(str)
+    # Адаптивный режим перешел на другой режим измерения: (режим, причина)
+    mode_switched = pyqtSignal(str, str)
+    # Внутренний: (обратный вызов, завершенный future) для вызова в GUI-потоке
+    _command_done = pyqtSignal(object, object)
+
+    def __init__(self, port, parent=None, **sensor_options):
+        """
+        Args:
+            port (str | serial.Serial): Имя порта или открытый объект порта.
+            **sensor_options: Параметры AsyncSensor (таймауты, capture и т.д.).
+        """
+        super().__init__(parent)
+        self.acquisition_loop = AcquisitionLoop.instance()
+        self.sensor = AsyncSensor(port, **sensor_options)
+        self._stream_future = None
+        self._command_done.connect(self._on_command_done)
+        self.logger = logging.getLogger(__name__)
+
+    @property
+    def is_streaming(self):
+        return self._stream_future is not None
+
+    def open(self):
+        self.acquisition_loop.run(self.sensor.open())
+
+    def close(self, drain_timeout=0.0):
+        """
+        Останавливает поток и закрывает датчик; ждет завершения в цикле.
+
+        Args:
+            drain_timeout (float): Сколько секунд дать уже поставленным командам
+                (например, выключению лазера) перед закрытием.
+        """
+        self.stop_stream()
+        self.acquisition_loop.run(self._close(drain_timeout), timeout=drain_timeout + 5.0)
+
+    async def _close(self, drain_timeout):
+        if drain_timeout > 0:
+            await self.sensor.drain(drain_timeout)
+        await self.sensor.close()
+
+    def submit_command(self, command, expect, timeout=None, priority=PRIORITY_NORMAL, callback=None):
+        """
+        Ставит команду в очередь датчика; не блокирует вызывающий поток.
+
+        Args:
+            callback (callable, optional): callback(future) вызывается в GUI-потоке
+                после ответа, ошибки или таймаута.
+
+        Returns:
+            concurrent.futures.Future: Кадр ответа или SensorError / SensorTimeout.
+        """
+        future = self.acquisition_loop.submit(self.sensor.command(command, expect, timeout, priority))
+        if callback is not None:
+            future.add_done_callback(lambda done: self._command_done.emit(callback, done))
+        return future
+
+    def _on_command_done(self, callback, future):
+        callback(future)
+
+    def start_stream(self, mode, policy=None):
+        """
+        Запускает непрерывный режим; не блокирует вызывающий поток.
+
+        Args:
+            mode (str): 'fast' или 'slow'; не используется, если задана policy.
+            policy (AdaptiveModePolicy, optional): Адаптивный выбор режима
+                (работает в цикле датчика, смены режима — сигнал mode_switched).
+        """
+        if self._stream_future is None:
+            source = adaptive_stream(self.sensor, policy) if policy is not None else self._fixed_mode(mode)
+            self._stream_future = self.acquisition_loop.submit(self._pump(source, policy))
+
+    def stop_stream(self):
+        """Останавливает непрерывный режим (X отправляется в цикле); не блокирует."""
+        if self._stream_future is not None:
+            self._stream_future.cancel()
+            self._stream_future = None
+
+    async def _fixed_mode(self, mode):
+        async for batch in self.sensor.stream_batches(mode):
+            yield mode, batch
+
+    async def _pump(self, source, policy):
+        current_mode = None
+        try:
+            async for mode, batch in source:
+                if mode != current_mode:
+                    current_mode = mode
+                    if policy is not None:
+                        self.mode_switched.emit(mode, policy.reason)
+                if batch.first_read_ns and TRACKER.enabled:
+                    batch.emitted_ns = time.perf_counter_ns()
+                self.batch_ready.emit(batch)
+        except SensorError as e:
+            self.logger.error(f"Непрерывный режим завершен с ошибкой: {e}")
+            self.read_failed.emit(str(e))
@@ -0,0 +1,130 @@
+# src/controllers/connection_supervisor.py
+
+import logging
+import time
+
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+
+from ..core.reconnect import Backoff, stall_timeout
+
+
+class ConnectionSupervisor(QObject):
+    """
+    Контроль связи с датчиком и автоматическое переподключение.
+
+    Связь считается потерянной, если SensorController сообщил об ошибке
+    порта (link_failed: ошибка чтения в непрерывном режиме, нет ответа на
+    запрос статуса) или если в непрерывном режиме дольше stall_timeout нет
+    ни одного кадра (watchdog). Тогда порт закрывается, и попытки
+    подключения к тому же порту повторяются с экспоненциальной задержкой.
+    Подключение считается восстановленным, когда модуль ответил на запрос
+    статуса; после этого контроллер возвращает лазер и непрерывный режим,
+    которые были до разрыва. Все действия выполняются по таймерам GUI-потока
+    и не блокируют его.
+    """
+
+    link_lost = pyqtSignal(str)                   # Причина потери связи
+    reconnect_scheduled = pyqtSignal(int, float)  # Номер попытки, задержка до нее, сек
+    link_restored = pyqtSignal(float)             # Длительность разрыва, сек
+
+    def __init__(self, sensor_controller, check_interval=0.5, stall_timeouts=None,
+                 initial_delay=0.5, max_delay=30.0, parent=None):
+        """
+        Args:
+            sensor_controller (SensorController): Контролируемый контроллер датчика.
+            check_interval (float): Период проверки watchdog, сек.
+            stall_timeouts (dict, optional): Допустимая пауза без данных по режимам
+                ('fast', 'auto', 'slow'), сек; дополняет STALL_TIMEOUTS.
+            initial_delay (float): Задержка перед первой попыткой подключения, сек.
+            max_delay (float): Предел задержки между попытками, сек.
+        """
+        super().__init__(parent)
+        self.logger = logging.getLogger(__name__)
+        self.sensor_controller = sensor_controller
+        self.stall_timeouts = stall_timeouts or {}
+        self.backoff = Backoff(initial_delay, max_delay)
+        self.lost_at = None  # Время потери связи (сек Unix), пока идет восстановление
+        self._port = None
+
+        self.watchdog_timer = QTimer(self)
+        self.watchdog_timer.setInterval(int(check_interval * 1000))
+        self.watchdog_timer.timeout.connect(self._check)
+        self.retry_timer = QTimer(self)
+        self.retry_timer.setSingleShot(True)
+        self.retry_timer.timeout.connect(self._attempt)
+        sensor_controller.connection_changed.connect(self._on_connection_changed)
+
+    @classmethod
+    def from_options(cls, sensor_controller, options, parent=None):
+        """
+        Супервизор из словаря настроек.
+
+        Ключи: check_interval, stall_timeouts, initial_delay, max_delay.
+        """
+        return cls(sensor_controller, options.get('check_interval', 0.5), options.get('stall_timeouts'),
+                   options.get('initial_delay', 0.5), options.get('max_delay', 30.0), parent)
+
+    @property
+    def active(self):
+        """True, пока связь восстанавливается."""
+        return self.lost_at is not None
+
+    def _on_connection_changed(self, connected):
+        if connected:
+            self.watchdog_timer.start()
+        elif not self.active:
+            self.watchdog_timer.stop()
+
+    def _check(self):
+        """Watchdog: нет данных в непрерывном режиме дольше допустимого."""
+        controller = self.sensor_controller
+        if self.active or not controller.is_measuring_continuous or controller.adapter is None:
+            return
+        silence = time.monotonic() - controller.last_data_time
+        if silence > stall_timeout(controller.continuous_mode, self.stall_timeouts):
+            self.link_failed(f"нет данных {silence:.1f} с")
+
+    def link_failed(self, reason):
+        """Начинает восстановление связи (повторные вызовы во время восстановления игнорируются)."""
+        if self.active:
+            return
+        self.lost_at = time.time()
+        self._port = self.sensor_controller.port
+        self.logger.warning(f"Связь с датчиком на {self._port} потеряна: {reason}")
+        self.sensor_controller.suspend_link()
+        self.link_lost.emit(reason)
+        self.backoff.reset()
+        self._schedule()
+
+    def cancel(self):
+        """Прекращает восстановление (например, пользователь отключился)."""
+        if self.active:
+            self.logger.info("Восстановление связи отменено")
+        self.retry_timer.stop()
+        self.watchdog_timer.stop()
+        self.lost_at = None
+
+    def _schedule(self):
+        delay = self.backoff.next_delay()
+        self.logger.info(f"Попытка подключения {self.backoff.attempts} к {self._port} через {delay:.1f} с")
+        self.reconnect_scheduled.emit(self.backoff.attempts, delay)
+        self.retry_timer.start(int(delay * 1000))
+
+    def _attempt(self):
+        if not self.active:
+            return
+        if not self.sensor_controller.resume_link(self._port, self._on_resumed):
+            self._schedule()
+
+    def _on_resumed(self, success):
+        """Результат проверки связи после открытия порта."""
+        if not self.active:
+            return
+        if not success:
+            self._schedule()
+            return
+        gap = time.time() - self.lost_at
+        self.lost_at = None
+        self.logger.info(f"Связь с датчиком на {self._port} восстановлена после {gap:.1f} с "
+                         f"({self.backoff.attempts} попыт.)")
+        self.link_restored.emit(gap)
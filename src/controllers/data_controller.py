@@ -1,24 +1,152 @@
+import time
+
+import numpy as np
 from PyQt5.QtCore import QObject, pyqtSignal
+from ..config import settings
 from ..models.measurement_model import MeasurementModel
+from ..models.session_format import RECORD_DTYPE
+from ..models.session_recorder import SessionRecorder
+from ..utils.latency import TRACKER
+from ..utils.signal_filters import FilterPipeline
 
 class DataController(QObject):
     """
     Контроллер для управления данными измерений.
-    Обеспечивает функции добавления, очистки и получения данных измерений.
+    Обеспечивает функции добавления, очистки и получения данных измерений,
+    а также потоковую запись сессии на диск.
+
+    Конвейер фильтрации (SENSOR_SETTINGS['filter'], см. FilterPipeline.from_options)
+    заполняет колонку отфильтрованных расстояний модели; в файл сессии
+    пишутся исходные данные.
     """
     # Сигналы для обновления данных
     data_updated = pyqtSignal()
+    data_reset = pyqtSignal()  # Хранилище очищено или заменено: представления синхронизируются сразу
+    recording_changed = pyqtSignal(bool)
+    recording_failed = pyqtSignal(str)  # Запись сессии остановлена ошибкой ввода-вывода
+    _recorder_failed = pyqtSignal(object, str)  # Из потока записи: (SessionRecorder, сообщение)
+    session_view_changed = pyqtSignal(str)  # Путь открытой сессии или '' для текущих измерений
+    error_recorded = pyqtSignal(int)  # Код ошибки датчика, добавленной в журнал
 
-    def __init__(self):
+    def __init__(self, capacity=None):
+        """
+        Args:
+            capacity (int, optional): Ограничение числа хранимых измерений
+                (кольцевой буфер). Если None, хранятся все измерения сессии.
+        """
         super().__init__()
-        self.model = MeasurementModel()
+        pipeline = FilterPipeline.from_options(settings.SENSOR_SETTINGS.get('filter', {}))
+        self.model = MeasurementModel(capacity, filter_pipeline=pipeline)
+        self.recorder = None
+        self._recorder_failed.connect(self._on_recorder_failed)
+
+    @property
+    def is_recording(self):
+        return self.recorder is not None
 
     def add_measurement(self, distance, quality):
         """Добавить новое измерение в текущую сессию."""
-        self.model.add_measurement(distance, quality)
+        if TRACKER.enabled:
+            start_ns = time.perf_counter_ns()
+        timestamp = time.time()
+        self.model.add_measurement(distance, quality, timestamp)
+        if self.recorder is not None:
+            self.recorder.write_measurement(timestamp, distance, quality)
+        if TRACKER.enabled:
+            TRACKER.sample_stored(start_ns)
+        self.data_updated.emit()
+
+    def add_measurements_batch(self, timestamps, distances, qualities):
+        """
+        Добавить пачку измерений (массивы NumPy одинаковой длины).
+
+        Модель и запись сессии обновляются одной векторной операцией, а
+        data_updated отправляется один раз на пачку.
+        """
+        if TRACKER.enabled:
+            start_ns = time.perf_counter_ns()
+        self.model.extend(timestamps, distances, qualities)
+        if self.recorder is not None:
+            records = np.zeros(len(timestamps), dtype=RECORD_DTYPE)
+            records['timestamp'] = timestamps
+            records['distance'] = distances
+            records['quality'] = qualities
+            self.recorder.write_records(records)
+        if TRACKER.enabled:
+            TRACKER.sample_stored(start_ns)
+        self.data_updated.emit()
+
+    def add_event(self, code, timestamp=None):
+        """
+        Записать служебное событие (EVENT_LINK_LOST, EVENT_LINK_RESTORED) в запись сессии.
+
+        В журнал ошибок датчика событие не попадает.
+        """
+        if self.recorder is not None:
+            self.recorder.write_error(time.time() if timestamp is None else timestamp, code)
+
+    def add_error(self, code):
+        """Зафиксировать ошибку датчика (:ErXX!) в журнале ошибок модели и в записи сессии."""
+        timestamp = time.time()
+        self.model.add_error(code, timestamp)
+        if self.recorder is not None:
+            self.recorder.write_error(timestamp, code)
+        self.error_recorded.emit(code)
+
+    def start_recording(self, path, serial='', version=''):
+        """
+        Начать запись сессии в файл.
+
+        Args:
+            path (str): Путь к файлу сессии; существующий файл дописывается.
+            serial (str): Серийный номер модуля для заголовка файла.
+            version (str): Версия ПО модуля для заголовка файла.
+        """
+        self.stop_recording()
+        recorder = SessionRecorder(path, serial, version,
+                                   on_failed=lambda message: self._recorder_failed.emit(recorder, message))
+        recorder.start()
+        self.recorder = recorder
+        self.recording_changed.emit(True)
+
+    def stop_recording(self):
+        """Завершить запись сессии."""
+        if self.recorder is None:
+            return
+        self.recorder.stop()
+        self.recorder = None
+        self.recording_changed.emit(False)
+
+    def _on_recorder_failed(self, recorder, message):
+        """Поток записи остановлен ошибкой: запись завершается, представления получают сообщение."""
+        if recorder is not self.recorder:
+            return
+        self.stop_recording()
+        self.recording_failed.emit(message)
+
+    def open_session(self, path):
+        """
+        Открыть записанную сессию для просмотра (только чтение).
+
+        Новые измерения продолжают накапливаться в текущей сессии.
+        """
+        reader = self.model.open_session(path)
+        self.session_view_changed.emit(path)
+        self.data_reset.emit()
+        self.data_updated.emit()
+        return reader
+
+    def close_session(self):
+        """Вернуться от просмотра файла к текущим измерениям."""
+        if self.model.session_reader is None:
+            return
+        self.model.close_session()
+        self.session_view_changed.emit('')
+        self.data_reset.emit()
         self.data_updated.emit()
 
     def clear_data(self):
         """Очистить все измерения в текущей сессии."""
         self.model.clear_measurements()
-        self.data_updated.emit()
\ No newline at end of file
+        self.data_reset.emit()
+        self.data_updated.emit()
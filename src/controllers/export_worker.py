@@ -0,0 +1,50 @@
+# src/controllers/export_worker.py
+
+import logging
+from PyQt5.QtCore import QThread, pyqtSignal
+
+from ..models.exporters import ExportCancelled, export_columns
+
+
+class ExportWorker(QThread):
+    """
+    Фоновый поток экспорта измерений.
+
+    Выполняет export_columns вне GUI-потока, сообщает о прогрессе сигналом
+    и может быть прерван вызовом cancel(). Колонки фиксируются заранее в
+    GUI-потоке (snapshot_columns), поэтому поступающие во время экспорта
+    измерения не смещают их друг относительно друга.
+    """
+
+    progress = pyqtSignal(int, int)  # Записано строк, всего строк
+    export_finished = pyqtSignal(int)  # Количество записанных строк
+    export_failed = pyqtSignal(str)
+    export_cancelled = pyqtSignal()
+
+    def __init__(self, columns, path, fmt=None, parent=None):
+        super().__init__(parent)
+        self.columns = columns
+        self.path = path
+        self.fmt = fmt
+        self._cancelled = False
+        self.logger = logging.getLogger(__name__)
+
+    def cancel(self):
+        """Запрашивает остановку экспорта после текущего куска."""
+        self._cancelled = True
+
+    def run(self):
+        self.logger.info(f"Экспорт {len(self.columns['timestamp'])} строк в {self.path}...")
+        try:
+            written = export_columns(self.columns, self.path, self.fmt,
+                                   progress=self.progress.emit,
+                                   is_cancelled=lambda: self._cancelled)
+        except ExportCancelled:
+            self.logger.info("Экспорт отменен пользователем.")
+            self.export_cancelled.emit()
+        except Exception as e:
+            self.logger.error(f"Ошибка экспорта в {self.path}: {e}")
+            self.export_failed.emit(str(e))
+        else:
+            self.logger.info(f"Экспорт завершен: {written} строк.")
+            self.export_finished.emit(written)
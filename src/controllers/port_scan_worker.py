@@ -0,0 +1,29 @@
+# src/controllers/port_scan_worker.py
+
+import logging
+from PyQt5.QtCore import QThread, pyqtSignal
+
+
+class PortScanWorker(QThread):
+    """
+    Фоновый поиск COM-портов.
+
+    Перечисление портов (особенно на Windows) может занимать заметное время,
+    поэтому get_available_ports() контроллера выполняется вне GUI-потока, а
+    результат передается сигналом ports_found.
+    """
+
+    ports_found = pyqtSignal(list)
+
+    def __init__(self, sensor_controller, parent=None):
+        super().__init__(parent)
+        self.sensor_controller = sensor_controller
+        self.logger = logging.getLogger(__name__)
+
+    def run(self):
+        try:
+            ports = list(self.sensor_controller.get_available_ports())
+        except Exception as e:
+            self.logger.error(f"Ошибка поиска COM-портов: {e}")
+            ports = []
+        self.ports_found.emit(ports)
@@ -0,0 +1,216 @@
+# src/controllers/replay_runner.py
+"""
+Воспроизведение записанного потока через весь конвейер приложения.
+
+Пример:
+    python -m src.controllers.replay_runner capture.cap --speed 10
+    python -m src.controllers.replay_runner session.bin --speed max --offscreen --json report.json
+
+По окончании выводится устойчивая скорость (измерений/с) и задержки по
+стадиям конвейера:
+    read  — от выдачи байт в порт до приема пачки AsyncSensor;
+    model — до обработки пачки SensorController и записи в DataController;
+    view  — до завершения перерисовки MainWidget.
+"""
+
+import bisect
+import json
+import logging
+import time
+
+import numpy as np
+from PyQt5.QtCore import QObject, QTimer
+
+from ..utils.frame_parser import DistanceFrame
+
+
+class ReplayMonitor(QObject):
+    """
+    Сбор задержек и пропускной способности при воспроизведении.
+
+    Номер последнего измерения, дошедшего до стадии, сопоставляется с
+    отметками ReplayDevice (mark_counts / mark_times), что дает время
+    выдачи этого измерения в порт.
+    """
+
+    STAGES = ('read', 'model', 'view')
+
+    def __init__(self, device, parent=None):
+        super().__init__(parent)
+        self.device = device
+        self.samples = 0
+        self.latencies = {stage: [] for stage in self.STAGES}
+        self.first_time = None
+        self.last_time = None
+
+    def attach(self, adapter, refresh_scheduler=None):
+        """
+        Подключается к AsyncSensorAdapter контроллера и планировщику перерисовки.
+
+        Вызывается после SensorController.connect_sensor(), чтобы слот пачки
+        выполнялся после обработки этой же пачки контроллером.
+        """
+        adapter.batch_ready.connect(self._on_batch)
+        if refresh_scheduler is not None:
+            refresh_scheduler.refreshed.connect(self._on_refreshed)
+
+    def _sent_time(self, sample):
+        """Время выдачи в порт измерения с номером sample (с единицы)."""
+        index = bisect.bisect_left(self.device.mark_counts, sample)
+        if index >= len(self.device.mark_times):
+            return None
+        return self.device.mark_times[index]
+
+    def _on_batch(self, batch):
+        read_time = None
+        count = 0
+        for timestamp, record in batch:
+            if isinstance(record, DistanceFrame):
+                count += 1
+                read_time = timestamp
+        if count == 0:
+            return
+        self.samples += count
+        sent = self._sent_time(self.samples)
+        if sent is None:
+            return
+        now = time.time()
+        if self.first_time is None:
+            self.first_time = self.device.mark_times[0]
+        self.last_time = now
+        self.latencies['read'].append(read_time - sent)
+        self.latencies['model'].append(now - sent)
+
+    def _on_refreshed(self):
+        if self.samples == 0:
+            return
+        sent = self._sent_time(self.samples)
+        if sent is not None:
+            now = time.time()
+            self.last_time = now
+            self.latencies['view'].append(now - sent)
+
+    def report(self):
+        """Сводка воспроизведения в виде словаря (для вывода и JSON)."""
+        duration = (self.last_time - self.first_time) if self.first_time is not None else 0.0
+        result = {
+            'samples': self.samples,
+            'samples_sent': self.device.samples_sent,
+            'bytes_sent': self.device.bytes_sent,
+            'duration_s': duration,
+            'samples_per_s': self.samples / duration if duration > 0 else 0.0,
+            'max_port_backlog_bytes': self.device.max_backlog_seen,
+            'latency_ms': {},
+        }
+        for stage, values in self.latencies.items():
+            if values:
+                values = np.asarray(values) * 1000.0
+                result['latency_ms'][stage] = {
+                    'count': len(values),
+                    'p50': float(np.percentile(values, 50)),
+                    'p95': float(np.percentile(values, 95)),
+                    'max': float(values.max()),
+                }
+        return result
+
+
+def format_report(report, speed):
+    """Текстовое представление сводки воспроизведения."""
+    speed_text = "макс." if speed is None else f"{speed:g}x"
+    lines = [
+        f"Воспроизведение ({speed_text}): {report['samples']} из {report['samples_sent']} измерений "
+        f"за {report['duration_s']:.2f} с — {report['samples_per_s']:.0f} изм/с",
+        f"Наибольший backlog порта: {report['max_port_backlog_bytes']} байт",
+    ]
+    for stage, stats in report['latency_ms'].items():
+        lines.append(f"  {stage:<6} p50 {stats['p50']:8.2f} мс   p95 {stats['p95']:8.2f} мс   "
+                     f"max {stats['max']:8.2f} мс")
+    return "\n".join(lines)
+
+
+def run_replay(path, speed=1.0, mode='fast', capacity=None, raw_interval=0.125, settle=0.5):
+    """
+    Воспроизводит файл через SensorController, DataController и MainWindow.
+
+    Должна вызываться при созданном QApplication; возвращает сводку ReplayMonitor.report().
+    """
+    from PyQt5.QtWidgets import QApplication
+    from .sensor_controller import SensorController
+    from .data_controller import DataController
+    from ..utils.replay import ReplaySerialHandler
+    from ..views.main_window import MainWindow
+
+    logger = logging.getLogger(__name__)
+    handler = ReplaySerialHandler(path, speed=speed, raw_interval=raw_interval)
+    sensor_controller = SensorController(handler)
+    data_controller = DataController(capacity)
+    window = MainWindow(sensor_controller, data_controller)
+    # Модальные окна ошибок остановили бы воспроизведение — ошибки только в журнал
+    sensor_controller.error_occurred.disconnect(window.show_error)
+    sensor_controller.error_occurred.connect(lambda message: logger.warning(message))
+    window.show()
+
+    if not sensor_controller.connect_sensor('REPLAY'):
+        raise RuntimeError("Не удалось подключиться к источнику воспроизведения")
+    monitor = ReplayMonitor(handler.device)
+    sensor_controller.start_continuous_measurement(mode)
+    monitor.attach(sensor_controller.adapter, window.combined_widget.refresh_scheduler)
+
+    app = QApplication.instance()
+    done_at = []
+
+    def check_finished():
+        drained = handler.device.finished.is_set() and handler.serial_port.in_waiting == 0
+        if drained or not sensor_controller._is_measuring_continuous:
+            # Даем последним пачкам пройти до перерисовки
+            if not done_at:
+                done_at.append(time.monotonic())
+            elif time.monotonic() - done_at[0] >= settle:
+                app.quit()
+
+    poll = QTimer()
+    poll.timeout.connect(check_finished)
+    poll.start(50)
+    app.exec_()
+    poll.stop()
+
+    window.combined_widget.refresh_scheduler.flush()
+    report = monitor.report()
+    sensor_controller.stop_continuous_measurement()
+    sensor_controller.disconnect_sensor()
+    window.close()
+    return report
+
+
+def main():
+    import argparse
+    import os
+    import sys
+
+    arg_parser = argparse.ArgumentParser(description="Воспроизведение записи через конвейер приложения")
+    arg_parser.add_argument('path', help="Файл захвата, сырой лог или файл сессии")
+    arg_parser.add_argument('--speed', default='1', help="Множитель скорости или 'max'")
+    arg_parser.add_argument('--mode', default='fast', choices=('fast', 'slow'))
+    arg_parser.add_argument('--capacity', type=int, default=None, help="Размер кольцевого буфера")
+    arg_parser.add_argument('--raw-interval', type=float, default=0.125,
+                            help="Интервал строк сырого лога без отметок времени, сек")
+    arg_parser.add_argument('--offscreen', action='store_true', help="Без вывода окна на экран")
+    arg_parser.add_argument('--json', help="Сохранить сводку в JSON")
+    args = arg_parser.parse_args()
+
+    if args.offscreen:
+        os.environ['QT_QPA_PLATFORM'] = 'offscreen'
+    speed = None if args.speed == 'max' else float(args.speed)
+
+    from PyQt5.QtWidgets import QApplication
+    app = QApplication(sys.argv)
+    report = run_replay(args.path, speed, args.mode, args.capacity, args.raw_interval)
+    print(format_report(report, speed))
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    del app
+
+
+if __name__ == '__main__':
+    main()
@@ -1,13 +1,24 @@
 # src/controllers/sensor_controller.py
 
+import concurrent.futures
 import logging
 import time
-from PyQt5.QtCore import QObject, pyqtSignal, QTimer
+
+import numpy as np
+from PyQt5.QtCore import QObject, pyqtSignal
 
 # --- Импорты из вашего пакета src ---
 try:
     from ..config import settings # Импорт настроек (COMMANDS, SENSOR_SETTINGS и т.д.)
     # SerialHandler не импортируем напрямую, он передается в __init__
+    from .async_adapter import AsyncSensorAdapter
+    from .connection_supervisor import ConnectionSupervisor
+    from ..core.adaptive_mode import AdaptiveModePolicy, RateMeter, MeasureTimeout, CONDITION_ERROR_CODES
+    from ..core.async_sensor import (SensorError, SensorTimeout, PRIORITY_HIGH, PRIORITY_NORMAL,
+                                     PRIORITY_LOW)
+    from ..utils.frame_parser import (AckFrame, DistanceFrame, ErrorFrame, StatusFrame,
+                                      VersionFrame, describe_error)
+    from ..utils.latency import TRACKER
 except ImportError as e:
     print(f"Критическая ошибка импорта в sensor_controller.py: {e}")
     print("Убедитесь, что структура папок и файлы __init__.py корректны.")
@@ -18,17 +29,41 @@ class SensorController(QObject):
     """
     Контроллер для управления LiDAR сенсором.
 
-    Отвечает за взаимодействие с устройством через SerialHandler,
-    отправляет команды, обрабатывает результаты измерений и статуса,
-    управляет состоянием подключения и лазера.
+    Порт открывается через SerialHandler, а обмен с модулем после
+    подключения ведет асинхронное ядро AsyncSensor (через AsyncSensorAdapter):
+    контроллер отправляет команды, обрабатывает результаты измерений и
+    статуса, управляет состоянием подключения и лазера.
+
+    Команды не блокируют GUI-поток: методы ставят команду в очередь датчика
+    и сразу возвращаются, а результат приходит сигналами (status_updated,
+    measurements_batch, laser_state_changed, single_measurement_finished...).
+
+    Измерения передаются пачкой массивов NumPy (measurements_batch) — один
+    вызов слота на пачку непрерывного режима. Сигнал measurement_taken на
+    каждое измерение сохранен для совместимости и отправляется, только если
+    к нему кто-то подключен.
+    Управление лазером идет с высоким приоритетом, фоновый опрос статуса —
+    с низким и может выполняться параллельно с долгим измерением D.
+
+    При потере связи (ошибка порта, нет ответа на статус, нет данных в
+    непрерывном режиме) ConnectionSupervisor (self.supervisor) переподключается
+    к тому же порту и восстанавливает лазер и непрерывный режим; отключается
+    настройкой SENSOR_SETTINGS['reconnect']['enabled'] = False.
     """
 
     # --- Сигналы для обновления UI ---
     connection_changed = pyqtSignal(bool)
     status_updated = pyqtSignal(float, float)
     measurement_taken = pyqtSignal(float, int)
-    error_occurred = pyqtSignal(str)
+    # Пачка измерений: timestamps (float64), distances (float32), qualities (uint16)
+    measurements_batch = pyqtSignal(object, object, object)
+    error_occurred = pyqtSignal(str)  # Ошибка операции (подключение, команда, остановка потока)
+    sensor_error = pyqtSignal(int)  # Код ошибки датчика :ErXX! (в error_occurred не дублируется)
+    version_received = pyqtSignal(str, str)  # Серийный номер, версия ПО
     laser_state_changed = pyqtSignal(bool)
+    single_measurement_finished = pyqtSignal(bool)  # Одиночное измерение завершено (успех)
+    acquisition_mode_changed = pyqtSignal(str, str)  # Фактический режим ('fast'/'auto'/'slow' или ''), причина
+    effective_rate_changed = pyqtSignal(float)  # Фактическая частота измерений, Гц
 
     def __init__(self, serial_handler):
         """
@@ -42,26 +77,59 @@ class SensorController(QObject):
              raise ValueError("SerialHandler не может быть None при инициализации SensorController")
 
         self.serial_handler = serial_handler
+        self.port = None
         self._is_connected = False
         self._is_measuring_continuous = False
         self._laser_state = False
         self._current_continuous_mode = None
+        self.serial_number = ''
+        self.firmware_version = ''
+        self._status_pending = False
+        self._single_pending = False
 
         self.logger = logging.getLogger(__name__)
         self.logger.info("SensorController инициализирован")
 
-        self.read_timer = QTimer(self)
-        self.read_timer.setInterval(100) # Интервал чтения для непрерывного режима
-        self.read_timer.timeout.connect(self._read_continuous_data)
+        # Асинхронный обмен с датчиком (создается при подключении)
+        self.adapter = None
+        self.command_timeout = settings.SENSOR_SETTINGS.get('command_timeout', 1.0)
+        self.measure_timeout = settings.SENSOR_SETTINGS.get('measure_timeout', 5.0)
+        self.max_commands_in_flight = settings.SENSOR_SETTINGS.get('max_commands_in_flight', 2)
+        # Запись сырого потока байт (CaptureWriter) для воспроизведения инцидентов
+        self.capture = None
 
         self.consecutive_errors = 0
         self.max_consecutive_errors = settings.SENSOR_SETTINGS.get('max_consecutive_errors', 5)
 
+        # Адаптивный режим ('auto') и замер фактической частоты непрерывного режима
+        self.adaptive_options = settings.SENSOR_SETTINGS.get('adaptive', {})
+        self.adaptive_policy = None
+        self.rate_meter = RateMeter()
+        self.rate_report_interval = 0.5
+        self._rate_reported_at = 0.0
+
+        # Контроль связи: время последнего кадра непрерывного режима (monotonic)
+        # и автоматическое переподключение
+        self.last_data_time = 0.0
+        reconnect_options = settings.SENSOR_SETTINGS.get('reconnect', {})
+        self.supervisor = None
+        if reconnect_options.get('enabled', True):
+            self.supervisor = ConnectionSupervisor.from_options(self, reconnect_options, parent=self)
+
     @property
     def is_connected(self):
         """Возвращает True, если есть активное подключение к датчику."""
         return self._is_connected and self.serial_handler.is_connected
 
+    @property
+    def is_measuring_continuous(self):
+        return self._is_measuring_continuous
+
+    @property
+    def continuous_mode(self):
+        """Выбранный режим непрерывного измерения ('fast', 'slow', 'auto') или None."""
+        return self._current_continuous_mode
+
     def get_available_ports(self):
         """Получение списка доступных COM-портов через SerialHandler."""
         self.logger.debug("Запрос списка доступных портов...")
@@ -79,12 +147,16 @@ class SensorController(QObject):
 
         self.logger.info(f"Попытка подключения к порту: {port}")
         success = self.serial_handler.connect(port)
+        if success:
+            success = self._open_adapter()
 
         if success:
             self._is_connected = True
+            self.port = port
             self.logger.info(f"Успешное подключение к {port}")
             self.connection_changed.emit(True)
-            # Запрашиваем статус и сбрасываем состояние лазера
+            # Запрашиваем версию и статус (ответы придут сигналами), сбрасываем состояние лазера
+            self.get_version_info()
             self.get_sensor_status()
             self._laser_state = False
             self.laser_state_changed.emit(False)
@@ -96,8 +168,70 @@ class SensorController(QObject):
             self.connection_changed.emit(False)
             return False
 
+    def _open_adapter(self):
+        """Запускает AsyncSensor поверх порта, открытого SerialHandler."""
+        self.adapter = AsyncSensorAdapter(self.serial_handler.serial_port, parent=self,
+                                          command_timeout=self.command_timeout,
+                                          measure_timeout=self.measure_timeout,
+                                          max_in_flight=self.max_commands_in_flight)
+        try:
+            self.adapter.open()
+        except Exception as e:
+            self.logger.error(f"Не удалось запустить обмен с датчиком: {e}")
+            self.adapter = None
+            self.serial_handler.disconnect()
+            return False
+        self.adapter.batch_ready.connect(self._on_continuous_batch)
+        self.adapter.read_failed.connect(self._on_stream_failed)
+        self.adapter.mode_switched.connect(self._on_mode_switched)
+        return True
+
+    def _close_adapter(self, drain_timeout=0.0):
+        if self.adapter is None:
+            return
+        try:
+            self.adapter.close(drain_timeout)
+        except Exception as e:
+            self.logger.error(f"Ошибка при остановке обмена с датчиком: {e}")
+        self.adapter.deleteLater()
+        self.adapter = None
+
+    def _submit_command(self, command, expect, on_result, timeout=None, priority=PRIORITY_NORMAL):
+        """
+        Ставит команду в очередь AsyncSensor, не дожидаясь ответа.
+
+        Args:
+            on_result (callable): Вызывается в GUI-потоке с аргументами (кадр ответа
+                или None, сообщение об ошибке или None, код :ErXX! или None).
+        """
+        def done(future):
+            try:
+                record = future.result()
+            except SensorTimeout as e:
+                on_result(None, str(e), None)
+            except SensorError as e:
+                on_result(None, str(e), e.code)
+            except concurrent.futures.CancelledError:
+                on_result(None, "Команда отменена", None)
+            else:
+                on_result(record, None, None)
+
+        self.adapter.submit_command(command, expect, timeout, priority, done)
+
     def disconnect_sensor(self):
         """Отключение от сенсора."""
+        if self.supervisor is not None and self.supervisor.active:
+            self.supervisor.cancel()
+            if self.adapter is None:
+                # Связь потеряна и порт уже закрыт: остается сбросить состояние сеанса
+                self.logger.info("Отключение во время восстановления связи.")
+                if self._is_measuring_continuous:
+                    self.stop_continuous_measurement()
+                self._is_connected = False
+                self._laser_state = False
+                self.connection_changed.emit(False)
+                return True
+
         if not self.is_connected:
             self.logger.info("Нет активного подключения для отключения.")
             return True
@@ -107,18 +241,23 @@ class SensorController(QObject):
             self.logger.info("Остановка непрерывного измерения перед отключением...")
             self.stop_continuous_measurement()
 
+        drain_timeout = 0.0
         if self._laser_state and settings.SENSOR_SETTINGS.get('auto_laser_off', True):
             self.logger.info("Автоматическое выключение лазера перед отключением...")
             self._send_laser_command(False)
+            drain_timeout = self.command_timeout  # Дать команде C выполниться до закрытия
 
         port_name = self.serial_handler.serial_port.port if self.serial_handler.serial_port else "Неизвестный порт"
         self.logger.info(f"Отключение от порта {port_name}...")
+        self._close_adapter(drain_timeout)
         success = self.serial_handler.disconnect()
 
         was_connected = self._is_connected
         self._is_connected = False
         self._is_measuring_continuous = False
         self._laser_state = False
+        self._status_pending = False
+        self._single_pending = False
 
         if was_connected:
              self.connection_changed.emit(False)
@@ -132,7 +271,7 @@ class SensorController(QObject):
             return False
 
     def _send_laser_command(self, turn_on):
-        """Внутренний метод для отправки команды управления лазером."""
+        """Ставит в очередь команду управления лазером; результат — сигнал laser_state_changed."""
         if not self.is_connected:
             self.logger.error("Попытка управления лазером без подключения.")
             return False
@@ -140,17 +279,19 @@ class SensorController(QObject):
         command = settings.COMMANDS['LASER_ON'] if turn_on else settings.COMMANDS['LASER_OFF']
         action_str = "включения" if turn_on else "выключения"
         self.logger.debug(f"Отправка команды {action_str} лазера ({command!r})...")
-        response = self.serial_handler.send_command(command, wait_for_response=True)
 
-        if response and ",OK!" in response:
-            self.logger.info(f"Команда {action_str} лазера успешно выполнена.")
-            self._laser_state = turn_on
+        def on_result(record, error, code):
+            if record is not None:
+                self.logger.info(f"Команда {action_str} лазера успешно выполнена.")
+                self._laser_state = turn_on
+            else:
+                self.logger.error(f"Ошибка выполнения команды {action_str} лазера: {error}")
+                self.error_occurred.emit(settings.UI_ERROR_MESSAGES["LASER_CONTROL_FAILED"] + f" ({error})")
+            # При ошибке кнопка возвращается к фактическому состоянию
             self.laser_state_changed.emit(self._laser_state)
-            return True
-        else:
-            self.logger.error(f"Ошибка выполнения команды {action_str} лазера. Ответ: '{response}'")
-            self.error_occurred.emit(settings.UI_ERROR_MESSAGES["LASER_CONTROL_FAILED"] + f" (Ответ: {response})")
-            return False
+
+        self._submit_command(command, (AckFrame,), on_result, priority=PRIORITY_HIGH)
+        return True
 
     def toggle_laser(self):
         """Переключает состояние лазера."""
@@ -163,32 +304,66 @@ class SensorController(QObject):
         target_state = not self._laser_state
         self._send_laser_command(target_state)
 
-    def get_sensor_status(self):
-        """Запрашивает и обрабатывает статус датчика."""
+    def get_sensor_status(self, priority=PRIORITY_LOW):
+        """
+        Запрашивает статус датчика; результат — сигнал status_updated.
+
+        Пока предыдущий запрос не выполнен, новый не ставится в очередь,
+        поэтому периодический опрос не накапливается за долгими командами.
+        """
         if not self.is_connected:
             self.logger.warning("Запрос статуса без подключения.")
             return
+        if self._status_pending:
+            self.logger.debug("Запрос статуса уже в очереди.")
+            return
 
         self.logger.debug("Запрос статуса датчика (команда 'S')...")
-        response = self.serial_handler.send_command(settings.COMMANDS['READ_STATUS'], wait_for_response=True)
-
-        if response:
-            temp, volt, err_msg = self.serial_handler.parse_status_response(response)
-            if err_msg:
-                self.logger.error(f"Ошибка разбора ответа статуса: {err_msg}")
-                self.error_occurred.emit(err_msg)
-            elif temp is not None and volt is not None:
-                self.logger.info(f"Статус получен: Температура={temp}°C, Напряжение={volt}V")
-                self.status_updated.emit(temp, volt)
-            else:
-                 self.logger.warning(f"Ответ на запрос статуса не распознан: '{response}'")
-                 self.error_occurred.emit(settings.UI_ERROR_MESSAGES["INVALID_RESPONSE"] + f" (Статус: {response})")
+        self._status_pending = True
+        self._submit_command(settings.COMMANDS['READ_STATUS'], (StatusFrame,), self._on_status_result,
+                             priority=priority)
+
+    def _on_status_result(self, record, error, code):
+        self._status_pending = False
+        if record is not None:
+            self.logger.info(f"Статус получен: Температура={record.temperature}°C, Напряжение={record.voltage}V")
+            self.status_updated.emit(record.temperature, record.voltage)
+        elif code is not None:
+            self.logger.error(f"Ошибка в ответе на запрос статуса: {error}")
+            self.sensor_error.emit(code)
+        elif self.supervisor is not None and self.adapter is not None:
+            # Модуль отвечает на S всегда, поэтому отсутствие ответа — признак потери связи
+            self.supervisor.link_failed(f"нет ответа на запрос статуса ({error})")
         else:
-            self.logger.error("Не получен ответ на запрос статуса.")
+            self.logger.error(f"Не получен ответ на запрос статуса: {error}")
             self.error_occurred.emit(settings.UI_ERROR_MESSAGES["STATUS_READ_FAILED"])
 
+    def get_version_info(self):
+        """Запрашивает серийный номер и версию ПО модуля (команда 'V'); результат — сигнал version_received."""
+        if not self.is_connected:
+            self.logger.warning("Запрос версии без подключения.")
+            return False
+
+        self.logger.debug("Запрос версии модуля (команда 'V')...")
+        self._submit_command(settings.COMMANDS.get('READ_VERSION', 'V'), (VersionFrame,), self._on_version_result)
+        return True
+
+    def _on_version_result(self, record, error, code):
+        if record is not None:
+            self.serial_number = record.serial
+            self.firmware_version = record.version
+            self.logger.info(f"Модуль: серийный номер {record.serial}, версия ПО {record.version}")
+            self.version_received.emit(record.serial, record.version)
+        else:
+            self.logger.warning(f"Версия модуля не получена: {error}")
+
     def get_single_measurement(self):
-        """Выполняет ОДНОкратное измерение (команда 'D')."""
+        """
+        Запускает ОДНОкратное измерение (команда 'D') без ожидания результата.
+
+        Результат приходит сигналами measurement_taken (или sensor_error) и
+        single_measurement_finished. Возвращает False, если команда не поставлена.
+        """
         if not self.is_connected:
             self.error_occurred.emit("Невозможно измерить: нет подключения.")
             self.logger.warning("Попытка единичного измерения без подключения.")
@@ -199,14 +374,41 @@ class SensorController(QObject):
              self.error_occurred.emit("Сначала остановите непрерывное измерение.")
              return False
 
+        if self._single_pending:
+            self.logger.warning("Единичное измерение уже выполняется.")
+            return False
+
         self.logger.info("Запрос единичного измерения (команда 'D')...")
-        response = self.serial_handler.send_command(settings.COMMANDS['AUTO_MEASURE'], wait_for_response=True)
-        return self._process_measurement_response(response)
+        start_ns = time.perf_counter_ns() if TRACKER.enabled else 0
+
+        def on_result(record, error, code):
+            self._single_pending = False
+            if record is not None:
+                self.logger.debug(f"Получено измерение: Расстояние={record.distance:.3f} м, Качество={record.quality}")
+                if start_ns and TRACKER.enabled:
+                    TRACKER.begin_samples(start_ns)
+                    TRACKER.record('controller', time.perf_counter_ns() - start_ns)
+                self.measurement_taken.emit(record.distance, record.quality)
+                self._emit_batch([(time.time(), record.distance, record.quality)])
+            elif code is not None:
+                self.logger.warning(f"Ошибка измерения: {error}")
+                self.sensor_error.emit(code)
+            else:
+                self.logger.debug(f"Измерение не получено: {error}")
+            self.single_measurement_finished.emit(record is not None)
+
+        self._single_pending = True
+        self._submit_command(settings.COMMANDS['AUTO_MEASURE'], (DistanceFrame,), on_result, self.measure_timeout)
+        return True
 
     def start_continuous_measurement(self, mode):
         """
         Запускает непрерывное измерение в указанном режиме ('fast', 'slow' или 'auto').
 
+        В режиме 'auto' команда (F, повторяемая D или M) выбирается по условиям
+        измерения AdaptiveModePolicy (SENSOR_SETTINGS['adaptive']); смены
+        режима сообщаются сигналом acquisition_mode_changed.
+
         Args:
             mode (str): Режим 'fast', 'slow' или 'auto'.
         """
@@ -223,7 +425,7 @@ class SensorController(QObject):
         command = None
         log_msg = ""
 
-        # ---- ДОБАВЛЕНА ОБРАБОТКА 'auto' ----
+        policy = None
         if mode == 'fast':
             command = settings.COMMANDS['FAST_MEASURE']
             log_msg = "Запуск непрерывного измерения в БЫСТРОМ режиме (команда 'F')..."
@@ -231,71 +433,176 @@ class SensorController(QObject):
             command = settings.COMMANDS['SLOW_MEASURE']
             log_msg = "Запуск непрерывного измерения в МЕДЛЕННОМ режиме (команда 'M')..."
         elif mode == 'auto':
-            # Режим "auto" из UI для непрерывного режима не имеет прямого аналога
-            # в командах датчика ('F' или 'M'). Используем 'slow' как дефолт.
-            mode = 'slow' # Фактически будем использовать медленный режим
-            command = settings.COMMANDS['SLOW_MEASURE']
-            log_msg = "Запуск непрерывного измерения в режиме 'Авто' (используется МЕДЛЕННЫЙ режим, команда 'M')..."
-            self.logger.info("Режим 'Авто' для непрерывного измерения интерпретирован как 'slow'.")
-        # ------------------------------------
+            policy = AdaptiveModePolicy.from_options(self.adaptive_options)
+            log_msg = (f"Запуск непрерывного измерения в АДАПТИВНОМ режиме (начальный режим "
+                       f"{policy.mode}, цель {policy.target_std * 1000:.1f} мм)...")
         else:
             self.logger.error(f"Неизвестный режим непрерывного измерения: {mode}")
             self.error_occurred.emit(f"Неподдерживаемый режим: {mode}")
             return False
 
         self.logger.info(log_msg)
-        self.serial_handler.send_command(command, wait_for_response=False)
-        time.sleep(0.1)
-
         self._is_measuring_continuous = True
-        self._current_continuous_mode = mode # Сохраняем фактический режим ('fast' или 'slow')
+        self._current_continuous_mode = mode # Сохраняем выбранный режим ('fast', 'slow' или 'auto')
         self.consecutive_errors = 0
-        self.read_timer.start()
-        self.logger.info(f"Таймер чтения запущен (интервал {self.read_timer.interval()} мс).")
+        self.adaptive_policy = policy
+        self.rate_meter.reset()
+        self.last_data_time = time.monotonic()
+
+        # Команду F/M (или D в адаптивном режиме) отправляет сам AsyncSensor;
+        # кадры приходят пачками в _on_continuous_batch
+        self.adapter.sensor.capture = self.capture
+        self.adapter.start_stream(mode, policy)
+        if policy is None:
+            self.acquisition_mode_changed.emit(mode, f"выбран пользователем ({command})")
         return True
 
-    def _read_continuous_data(self):
-        """Слот, вызываемый таймером для чтения данных в непрерывном режиме."""
-        if not self._is_measuring_continuous or not self.is_connected:
-            self.logger.warning("_read_continuous_data вызван некорректно. Остановка.")
-            self.stop_continuous_measurement()
+    def _on_mode_switched(self, mode, reason):
+        """Слот смены режима адаптивным выбором."""
+        if not self._is_measuring_continuous:
+            return
+        self.logger.info(f"Адаптивный режим: {mode} ({reason})")
+        self.acquisition_mode_changed.emit(mode, reason)
+
+    def _on_continuous_batch(self, batch):
+        """Слот обработки пачки кадров непрерывного режима от AsyncSensor."""
+        if batch and not isinstance(batch[-1].record, MeasureTimeout):
+            # Таймаут D в режиме auto — не данные: watchdog супервизора должен его видеть
+            self.last_data_time = time.monotonic()
+        tracking = TRACKER.enabled and getattr(batch, 'emitted_ns', 0)
+        if tracking:
+            start_ns = time.perf_counter_ns()
+            TRACKER.record('batching', batch.emitted_ns - batch.first_read_ns)
+            TRACKER.record('dispatch', start_ns - batch.emitted_ns)
+            TRACKER.begin_samples(batch.first_read_ns)
+        per_sample = self.receivers(self.measurement_taken) > 0
+        rows = []
+        distances = 0
+        for timestamp, record in batch:
+            if isinstance(record, DistanceFrame):
+                if tracking:
+                    TRACKER.record('controller', time.perf_counter_ns() - start_ns)
+                rows.append((timestamp, record.distance, record.quality))
+                if per_sample:
+                    self.measurement_taken.emit(record.distance, record.quality)
+                if self.consecutive_errors > 0:
+                    self.logger.info("Счетчик ошибок сброшен.")
+                self.consecutive_errors = 0
+            elif isinstance(record, ErrorFrame):
+                # Измерения до ошибки передаются раньше нее, чтобы сохранить порядок в записи сессии
+                distances += len(rows)
+                self._emit_batch(rows)
+                rows = []
+                # Ошибки датчика учитываются журналом ошибок (DataController) и
+                # показываются панелью с ограничением частоты, а не через error_occurred
+                self.logger.debug(f"Ошибка измерения: {describe_error(record.code)}")
+                self.sensor_error.emit(record.code)
+                if not self._is_measuring_continuous:
+                    continue
+                policy = self.adaptive_policy
+                if policy is not None and policy.mode != 'slow' and record.code in CONDITION_ERROR_CODES:
+                    # Плохие условия измерения в адаптивном режиме ведут к смене режима, а не к остановке
+                    continue
+                self.consecutive_errors += 1
+                self.logger.warning(f"Ошибка чтения/разбора. Счетчик ошибок: {self.consecutive_errors}/{self.max_consecutive_errors}")
+                if self.consecutive_errors >= self.max_consecutive_errors:
+                    self.logger.error(f"Превышен лимит ошибок. Остановка.")
+                    self.error_occurred.emit(f"Остановка из-за {self.max_consecutive_errors} ошибок подряд.")
+                    self.stop_continuous_measurement()
+            elif isinstance(record, StatusFrame):
+                self.status_updated.emit(record.temperature, record.voltage)
+            elif isinstance(record, MeasureTimeout):
+                # Режим auto: измерение D без ответа учитывает политика выбора режима
+                self.logger.debug(f"Нет ответа на измерение: {record.message}")
+            else:
+                # Подтверждения и версия в потоке измерений ошибкой не считаются
+                self.logger.debug(f"Получен служебный кадр: {record}")
+        distances += len(rows)
+        self._emit_batch(rows)
+        if distances and self._is_measuring_continuous:
+            self._update_rate(distances)
+
+    def _emit_batch(self, rows):
+        """Отправляет список (timestamp, distance, quality) сигналом measurements_batch."""
+        if not rows:
+            return
+        timestamps, distances, qualities = zip(*rows)
+        self.measurements_batch.emit(np.array(timestamps, dtype=np.float64),
+                                     np.array(distances, dtype=np.float32),
+                                     np.array(qualities, dtype=np.uint16))
+
+    def _update_rate(self, count):
+        """Учитывает принятые измерения и не чаще rate_report_interval сообщает частоту."""
+        now = time.monotonic()
+        self.rate_meter.add(now, count)
+        if now - self._rate_reported_at >= self.rate_report_interval:
+            self._rate_reported_at = now
+            self.effective_rate_changed.emit(self.rate_meter.rate)
+
+    def _on_stream_failed(self, message):
+        """Слот обработки ошибки ввода-вывода в непрерывном режиме."""
+        self.logger.error(f"Непрерывный режим завершился с ошибкой: {message}")
+        if self.supervisor is not None and self._is_measuring_continuous:
+            self.supervisor.link_failed(message)
             return
+        self.error_occurred.emit(settings.UI_ERROR_MESSAGES["INVALID_RESPONSE"] + f" ({message})")
+        self.stop_continuous_measurement()
 
-        self.logger.debug("Чтение данных из буфера в непрерывном режиме...")
-        response = self.serial_handler.send_command(None, wait_for_response=True, timeout=0.05)
-        success = self._process_measurement_response(response)
-
-        if not success and response is not None:
-             self.consecutive_errors += 1
-             self.logger.warning(f"Ошибка чтения/разбора. Счетчик ошибок: {self.consecutive_errors}/{self.max_consecutive_errors}")
-             if self.consecutive_errors >= self.max_consecutive_errors:
-                 self.logger.error(f"Превышен лимит ошибок. Остановка.")
-                 self.error_occurred.emit(f"Остановка из-за {self.max_consecutive_errors} ошибок подряд.")
-                 self.stop_continuous_measurement()
-        elif success:
-             if self.consecutive_errors > 0:
-                  self.logger.info("Счетчик ошибок сброшен.")
-             self.consecutive_errors = 0
-
-    def _process_measurement_response(self, response_str):
-        """Общий метод для обработки ответа с измерением."""
-        if response_str is None:
-            self.logger.debug("Получен пустой ответ (таймаут).")
-            return False
+    def suspend_link(self):
+        """
+        Закрывает порт после потери связи, сохраняя состояние сеанса
+        (подключение, лазер, выбранный непрерывный режим) для resume_link().
+        """
+        self._close_adapter()
+        try:
+            self.serial_handler.disconnect()
+        except Exception as e:
+            self.logger.error(f"Ошибка при закрытии порта после потери связи: {e}")
+        self._status_pending = False
+        self._single_pending = False
+        self.rate_meter.reset()
+        self.effective_rate_changed.emit(0.0)
+
+    def resume_link(self, port, on_done):
+        """
+        Открывает порт заново после suspend_link() и проверяет связь запросом статуса.
 
-        dist, qual, err_msg = self.serial_handler.parse_distance_response(response_str)
+        При ответе модуля кадром статуса восстанавливаются лазер и непрерывный
+        режим, бывшие до разрыва, затем в GUI-потоке вызывается on_done(True);
+        без ответа или с ответом :ErXX! порт снова закрывается и вызывается
+        on_done(False).
 
-        if err_msg:
-            self.logger.warning(f"Ошибка измерения/разбора: {err_msg} (Ответ: '{response_str}')")
-            self.error_occurred.emit(err_msg)
+        Returns:
+            bool: False, если порт открыть не удалось (on_done не вызывается).
+        """
+        try:
+            opened = self.serial_handler.connect(port)
+        except Exception as e:
+            self.logger.debug(f"Порт {port} не открыт: {e}")
+            opened = False
+        if not opened or not self._open_adapter():
             return False
-        elif dist is not None and qual is not None:
-            self.logger.debug(f"Получено измерение: Расстояние={dist:.3f} м, Качество={qual}")
-            self.measurement_taken.emit(dist, qual)
-            return True
-        else:
-            self.logger.debug(f"Получен ответ, не являющийся измерением: '{response_str}'")
-            return False # Не ошибка, но и не валидное измерение
+
+        def on_status(record, error, code):
+            if self.adapter is None:
+                return  # Отключено во время проверки
+            if record is None:
+                # Связь восстановлена только при ответе StatusFrame; :ErXX! не подтверждает ее
+                self.logger.warning(f"Модуль на {port} не ответил на запрос статуса: {error}")
+                self.suspend_link()
+                on_done(False)
+                return
+            self.status_updated.emit(record.temperature, record.voltage)
+            if self._laser_state:
+                self._send_laser_command(True)
+            mode = self._current_continuous_mode
+            if mode is not None:
+                self._is_measuring_continuous = False
+                self.start_continuous_measurement(mode)
+            on_done(True)
+
+        self._submit_command(settings.COMMANDS['READ_STATUS'], (StatusFrame,), on_status, priority=PRIORITY_HIGH)
+        return True
 
     def stop_continuous_measurement(self):
         """Останавливает непрерывное измерение."""
@@ -304,21 +611,18 @@ class SensorController(QObject):
             return True
 
         self.logger.info("Остановка непрерывного измерения...")
-        self.read_timer.stop()
         self._is_measuring_continuous = False
         self._current_continuous_mode = None
-
-        if self.is_connected:
-             self.logger.debug("Отправка команды остановки ('X')...")
-             self.serial_handler.send_command(settings.COMMANDS['STOP_MEASURE'], wait_for_response=False)
-             time.sleep(0.1)
-             if self.serial_handler.serial_port:
-                  try:
-                      self.serial_handler.serial_port.reset_input_buffer()
-                  except Exception as e:
-                       self.logger.error(f"Ошибка при очистке буфера после остановки: {e}")
+        self.adaptive_policy = None
+        self.rate_meter.reset()
+        self.acquisition_mode_changed.emit('', '')
+        self.effective_rate_changed.emit(0.0)
+
+        # X отправляет AsyncSensor; запоздавшие кадры отбрасываются без паузы и очистки буфера
+        if self.adapter is not None:
+            self.adapter.stop_stream()
         else:
-             self.logger.warning("Не удалось отправить команду 'X', т.к. нет подключения.")
+            self.logger.warning("Не удалось отправить команду 'X', т.к. нет подключения.")
 
         self.logger.info("Непрерывное измерение остановлено.")
-        return True
\ No newline at end of file
+        return True
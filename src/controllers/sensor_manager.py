@@ -0,0 +1,140 @@
+# src/controllers/sensor_manager.py
+
+import logging
+from PyQt5.QtCore import QObject, pyqtSignal
+
+from ..config import settings
+from .sensor_controller import SensorController
+from .data_controller import DataController
+from ..models.session_format import EVENT_LINK_LOST, EVENT_LINK_RESTORED
+from ..utils.frame_parser import describe_error
+from ..utils.notification_throttle import NotificationThrottle
+
+
+class SensorChannel:
+    """Один датчик стенда: порт, его контроллер и собственное хранилище данных."""
+
+    def __init__(self, port, sensor_controller, data_controller):
+        self.port = port
+        self.sensor_controller = sensor_controller
+        self.data_controller = data_controller
+
+    @property
+    def store(self):
+        return self.data_controller.model.live_store
+
+
+class SensorManager(QObject):
+    """
+    Менеджер нескольких датчиков JRT M703A.
+
+    Для каждого порта создается отдельный обработчик порта, SensorController
+    со своим AsyncSensor и DataController с кольцевым буфером. Все датчики
+    обслуживает один цикл событий AcquisitionLoop, а GUI-поток получает от
+    каждого датчика готовые пачки, поэтому суммарная скорость растет с числом
+    датчиков, а перерисовка общего вида объединяется одним RefreshScheduler.
+    """
+
+    sensors_changed = pyqtSignal()
+    data_updated = pyqtSignal()           # Новые данные от любого датчика
+    sensor_error = pyqtSignal(str, str)   # Порт, сообщение об ошибке
+
+    def __init__(self, handler_factory, capacity=None, parent=None):
+        """
+        Args:
+            handler_factory (callable): Создает новый обработчик порта (SerialHandler)
+                для каждого датчика.
+            capacity (int, optional): Размер кольцевого буфера каждого датчика.
+        """
+        super().__init__(parent)
+        self.handler_factory = handler_factory
+        self.capacity = capacity or settings.SENSOR_SETTINGS.get('multi_sensor_capacity', 100000)
+        self.channels = {}  # Порт -> SensorChannel, в порядке подключения
+        # Ошибки датчиков (:ErXX!) сообщаются sensor_error с ограничением частоты
+        self.error_throttle = NotificationThrottle()
+        self.logger = logging.getLogger(__name__)
+
+    def discover_ports(self, exclude=()):
+        """Порты, к которым еще не подключен ни один датчик."""
+        ports = self.handler_factory().get_available_ports()
+        return [port for port in ports if port not in self.channels and port not in exclude]
+
+    def open_sensors(self, ports):
+        """
+        Подключает датчики к указанным портам.
+
+        Returns:
+            list: Порты, к которым удалось подключиться.
+        """
+        opened = [port for port in ports if self._open_sensor(port)]
+        if opened:
+            self.sensors_changed.emit()
+        return opened
+
+    def _open_sensor(self, port):
+        if port in self.channels:
+            return True
+        sensor_controller = SensorController(self.handler_factory())
+        data_controller = DataController(self.capacity)
+        sensor_controller.measurements_batch.connect(data_controller.add_measurements_batch)
+        sensor_controller.sensor_error.connect(data_controller.add_error)
+        sensor_controller.sensor_error.connect(lambda code, port=port: self._on_sensor_error_code(port, code))
+        sensor_controller.error_occurred.connect(lambda message, port=port: self.sensor_error.emit(port, message))
+        data_controller.data_updated.connect(self.data_updated)
+        supervisor = sensor_controller.supervisor
+        if supervisor is not None:
+            supervisor.link_lost.connect(lambda reason, port=port: self._on_link_lost(port, reason))
+            supervisor.link_restored.connect(lambda gap, port=port: self._on_link_restored(port, gap))
+
+        if not sensor_controller.connect_sensor(port):
+            self.logger.error(f"Не удалось подключить датчик на {port}")
+            return False
+        self.channels[port] = SensorChannel(port, sensor_controller, data_controller)
+        self.logger.info(f"Датчик на {port} подключен ({len(self.channels)} всего)")
+        return True
+
+    def _on_link_lost(self, port, reason):
+        channel = self.channels.get(port)
+        if channel is not None:
+            channel.data_controller.add_event(EVENT_LINK_LOST, channel.sensor_controller.supervisor.lost_at)
+        self.sensor_error.emit(port, f"Связь потеряна ({reason}), переподключение...")
+
+    def _on_link_restored(self, port, gap):
+        channel = self.channels.get(port)
+        if channel is not None:
+            channel.data_controller.add_event(EVENT_LINK_RESTORED)
+        self.sensor_error.emit(port, f"Связь восстановлена после {gap:.1f} с")
+
+    def _on_sensor_error_code(self, port, code):
+        suppressed = self.error_throttle.offer((port, code))
+        if suppressed is not None:
+            message = describe_error(code)
+            self.sensor_error.emit(port, f"{message} (еще {suppressed} повтор.)" if suppressed else message)
+
+    def start_all(self, mode):
+        """Запускает непрерывное измерение на всех датчиках."""
+        for channel in self.channels.values():
+            channel.sensor_controller.start_continuous_measurement(mode)
+
+    def stop_all(self):
+        """Останавливает непрерывное измерение на всех датчиках."""
+        for channel in self.channels.values():
+            channel.sensor_controller.stop_continuous_measurement()
+
+    def close_sensor(self, port):
+        channel = self.channels.pop(port, None)
+        if channel is None:
+            return
+        channel.sensor_controller.stop_continuous_measurement()
+        channel.sensor_controller.disconnect_sensor()
+        channel.data_controller.stop_recording()
+        self.sensors_changed.emit()
+
+    def close_all(self):
+        """Отключает все датчики."""
+        for port in list(self.channels):
+            self.close_sensor(port)
+
+    def clear_data(self):
+        for channel in self.channels.values():
+            channel.data_controller.clear_data()
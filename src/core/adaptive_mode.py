@@ -0,0 +1,230 @@
+# src/core/adaptive_mode.py
+"""
+Адаптивный выбор режима непрерывного измерения (без зависимости от Qt).
+
+Режимы по убыванию скорости и возрастанию точности:
+
+    fast — F, непрерывный быстрый режим;
+    auto — повторяемая команда D (модуль сам выбирает скорость под отражатель);
+    slow — M, непрерывный медленный режим.
+
+AdaptiveModePolicy следит за последними измерениями текущего режима: шумом
+расстояния, долей ошибок условий измерения (:Er07! фоновый свет, :Er08!
+слабый сигнал, :Er15! нестабильный сигнал, а в режиме auto — и измерений D
+без ответа) и качеством сигнала. Если точность хуже цели target_std или
+ошибок слишком много, режим меняется на более точный; если шум заметно
+ниже цели (upgrade_margin), пробуется более быстрый.
+Гистерезис обеспечивают минимальное время в режиме и запрет возврата в режим,
+из которого только что ушли (время запрета удваивается при повторах).
+
+adaptive_stream() выполняет эту политику поверх AsyncSensor.
+"""
+
+import contextlib
+import math
+import time
+from collections import deque, namedtuple
+
+import numpy as np
+
+from .async_sensor import SensorError, SensorTimeout, ReadingBatch, Reading
+from ..utils.frame_parser import DistanceFrame, ErrorFrame
+
+MODES = ('fast', 'auto', 'slow')
+# Ошибки, говорящие о плохих условиях измерения (а не о неисправности)
+CONDITION_ERROR_CODES = frozenset((7, 8, 15))
+
+# Запись пачки режима auto: команда D осталась без ответа (обычно слабое
+# отражение); политика учитывает ее как измерение в плохих условиях
+MeasureTimeout = namedtuple('MeasureTimeout', ['message'])
+
+
+class RateMeter:
+    """Эффективная частота измерений (Гц) по скользящему интервалу времени."""
+
+    def __init__(self, span=2.0):
+        self.span = span
+        self._events = deque()  # (время, число измерений)
+        self._count = 0
+
+    def reset(self):
+        self._events.clear()
+        self._count = 0
+
+    def add(self, timestamp, count=1):
+        self._events.append((timestamp, count))
+        self._count += count
+        while self._events and timestamp - self._events[0][0] > self.span:
+            self._count -= self._events.popleft()[1]
+
+    @property
+    def rate(self):
+        if len(self._events) < 2:
+            return 0.0
+        elapsed = self._events[-1][0] - self._events[0][0]
+        # Первое событие открывает интервал, его измерения не входят в частоту
+        return (self._count - self._events[0][1]) / elapsed if elapsed > 0 else 0.0
+
+
+class AdaptiveModePolicy:
+    """
+    Выбор режима F / D / M по условиям измерения.
+
+    observe() вызывается для каждой пачки кадров текущего режима и
+    возвращает True, если режим нужно сменить; новый режим — в mode,
+    причина — в reason.
+    """
+
+    # Ключи словаря настроек (совпадают с аргументами конструктора)
+    OPTIONS = ('target_std', 'max_error_rate', 'window', 'min_dwell', 'upgrade_margin',
+               'max_upgrade_quality', 'holdoff', 'max_holdoff', 'initial_mode')
+
+    def __init__(self, target_std=0.003, max_error_rate=0.1, window=40, min_dwell=2.0,
+                 upgrade_margin=0.5, max_upgrade_quality=300, holdoff=5.0, max_holdoff=120.0,
+                 initial_mode='fast'):
+        """
+        Args:
+            target_std (float): Целевая СКО шума расстояния, м.
+            max_error_rate (float): Допустимая доля ошибок условий измерения.
+            window (int): Число последних кадров режима для оценки.
+            min_dwell (float): Минимальное время в режиме перед сменой, сек.
+            upgrade_margin (float): Переход на более быстрый режим, если шум ниже
+                target_std * upgrade_margin (и ошибок меньше max_error_rate * upgrade_margin).
+            max_upgrade_quality (int): Медиана качества сигнала (меньше — лучше),
+                выше которой более быстрый режим не пробуется.
+            holdoff (float): Запрет возврата в режим после ухода из него, сек.
+            max_holdoff (float): Предел удвоения запрета, сек.
+            initial_mode (str): Начальный режим.
+        """
+        if initial_mode not in MODES:
+            raise ValueError(f"Неизвестный режим: {initial_mode}")
+        self.target_std = target_std
+        self.max_error_rate = max_error_rate
+        self.window = max(3, window)
+        self.min_dwell = min_dwell
+        self.upgrade_margin = upgrade_margin
+        self.max_upgrade_quality = max_upgrade_quality
+        self.holdoff = holdoff
+        self.max_holdoff = max_holdoff
+        self.initial_mode = initial_mode
+        self.reset()
+
+    @classmethod
+    def from_options(cls, options):
+        """Политика из словаря настроек (см. OPTIONS)."""
+        return cls(**{key: options[key] for key in cls.OPTIONS if key in options})
+
+    def reset(self, now=None):
+        self._holdoffs = {mode: self.holdoff for mode in MODES}
+        self._blocked_until = {mode: 0.0 for mode in MODES}
+        self._enter(self.initial_mode, "начальный режим", time.monotonic() if now is None else now)
+
+    def _enter(self, mode, reason, now):
+        self.mode = mode
+        self.reason = reason
+        self.entered = now
+        self.noise = math.nan
+        self.error_rate = 0.0
+        self._distances = deque(maxlen=self.window)
+        self._qualities = deque(maxlen=self.window)
+        self._frames = deque(maxlen=self.window)  # True — ошибка условий измерения
+
+    def observe(self, batch, now=None):
+        """
+        Учитывает пачку Reading текущего режима.
+
+        Returns:
+            bool: True, если режим изменен (см. mode и reason).
+        """
+        now = time.monotonic() if now is None else now
+        for reading in batch:
+            record = reading.record
+            if isinstance(record, DistanceFrame):
+                self._distances.append(record.distance)
+                self._qualities.append(record.quality)
+                self._frames.append(False)
+            elif isinstance(record, ErrorFrame):
+                self._frames.append(record.code in CONDITION_ERROR_CODES)
+            elif isinstance(record, MeasureTimeout):
+                self._frames.append(True)
+
+        if len(self._frames) < self.window or now - self.entered < self.min_dwell:
+            return False
+        self.error_rate = sum(self._frames) / len(self._frames)
+        if len(self._distances) >= 3:
+            # Шум по разностям соседних измерений не зависит от медленного движения цели
+            self.noise = float(np.std(np.diff(np.asarray(self._distances)))) / math.sqrt(2.0)
+        return self._decide(now)
+
+    def _decide(self, now):
+        index = MODES.index(self.mode)
+        noisy = not math.isnan(self.noise) and self.noise > self.target_std
+        if self.error_rate > self.max_error_rate or noisy:
+            if index + 1 >= len(MODES):
+                return False
+            if noisy:
+                reason = f"шум {self.noise * 1000:.1f} мм > {self.target_std * 1000:.1f} мм"
+            else:
+                reason = f"ошибки условий измерения {self.error_rate:.0%}"
+            self._leave(self.mode, now)
+            self._enter(MODES[index + 1], reason, now)
+            return True
+
+        if now - self.entered > self.max_holdoff:
+            self._holdoffs[self.mode] = self.holdoff  # Режим давно держит точность — запрет снова короткий
+        if index == 0 or math.isnan(self.noise):
+            return False
+        faster = MODES[index - 1]
+        quality = float(np.median(np.asarray(self._qualities))) if self._qualities else math.inf
+        if (self.noise < self.target_std * self.upgrade_margin
+                and self.error_rate <= self.max_error_rate * self.upgrade_margin
+                and quality <= self.max_upgrade_quality
+                and now >= self._blocked_until[faster]):
+            reason = f"шум {self.noise * 1000:.1f} мм, качество {quality:.0f}"
+            self._enter(faster, reason, now)
+            return True
+        return False
+
+    def _leave(self, mode, now):
+        """Запрещает возврат в покидаемый режим; при повторах запрет удваивается."""
+        self._blocked_until[mode] = now + self._holdoffs[mode]
+        self._holdoffs[mode] = min(self._holdoffs[mode] * 2.0, self.max_holdoff)
+
+
+async def _single_measurements(sensor):
+    """
+    Пачки из одного измерения D подряд (режим auto).
+
+    Таймаут D не прерывает измерения: он выдается записью MeasureTimeout.
+    Наружу передаются только ошибки порта (SensorError без кода).
+    """
+    while True:
+        try:
+            record = await sensor.measure()
+        except SensorTimeout as e:
+            record = MeasureTimeout(str(e))
+        except SensorError as e:
+            if e.code is None:
+                raise
+            record = ErrorFrame(e.code)
+        batch = ReadingBatch()
+        batch.append(Reading(time.time(), record))
+        yield batch
+
+
+async def adaptive_stream(sensor, policy):
+    """
+    Асинхронный генератор (режим, ReadingBatch) с переключением режимов по policy.
+
+    При смене режима текущий поток закрывается (X), и запускается новый;
+    пачка, по которой принято решение, выдается со старым режимом.
+    """
+    while True:
+        mode = policy.mode
+        source = _single_measurements(sensor) if mode == 'auto' else sensor.stream_batches(mode)
+        async with contextlib.aclosing(source) as batches:
+            async for batch in batches:
+                switched = policy.observe(batch)
+                yield mode, batch
+                if switched:
+                    break
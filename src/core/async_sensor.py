@@ -0,0 +1,489 @@
+# src/core/async_sensor.py
+"""
+Асинхронное ядро работы с датчиком JRT M703A (без зависимости от Qt).
+
+Пример:
+
+    sensor = AsyncSensor('/dev/ttyUSB0')
+    await sensor.open()
+    version = await sensor.read_version()
+    async with contextlib.aclosing(sensor.stream('fast')) as readings:
+        async for reading in readings:
+            print(reading.timestamp, reading.record)
+    await sensor.close()
+
+Генератор потока отправляет X при закрытии, поэтому при выходе из цикла
+через break его нужно закрывать явно (aclosing), а не оставлять сборщику мусора.
+
+Команды проходят через очередь с приоритетами: ответ сопоставляется с
+запросом по типу ожидаемого кадра (,OK! — AckFrame, 'C, V — StatusFrame,
+m, — DistanceFrame, версия — VersionFrame), поэтому команды с разными
+типами ответа выполняются конвейером (например, опрос статуса во время
+долгого измерения D), а с одинаковыми — строго по очереди.
+
+Один цикл событий обслуживает любое число датчиков. На POSIX порт pyserial
+читается через loop.add_reader по файловому дескриптору — без отдельных
+потоков. Для портов без дескриптора (Windows, симулятор, воспроизведение)
+используется запасной вариант: поток блокирующего чтения на порт.
+"""
+
+import asyncio
+import heapq
+import itertools
+import os
+import sys
+import threading
+import time
+from collections import namedtuple
+
+from ..utils.frame_parser import (FrameParser, AckFrame, DistanceFrame, ErrorFrame, StatusFrame,
+                                  VersionFrame, describe_error)
+from ..utils.latency import TRACKER
+
+# Измерение (или другой кадр) с временем приема (сек Unix)
+Reading = namedtuple('Reading', ['timestamp', 'record'])
+
+STREAM_COMMANDS = {'fast': 'F', 'slow': 'M'}
+STOP_COMMAND = 'X'
+
+# Приоритеты команд в очереди: меньше — раньше
+PRIORITY_HIGH = 0     # Управление лазером
+PRIORITY_NORMAL = 1   # Измерения и служебные запросы
+PRIORITY_LOW = 2      # Фоновый опрос статуса
+
+
+class SensorError(Exception):
+    """Ошибка датчика или обмена; code — код :ErXX!, если ошибку сообщил модуль."""
+
+    def __init__(self, message, code=None):
+        super().__init__(message)
+        self.code = code
+
+
+class SensorTimeout(SensorError):
+    """Модуль не ответил за отведенное время."""
+
+
+class ReadingBatch(list):
+    """
+    Пачка Reading, принятых вместе, с отметками perf_counter_ns для замера задержек.
+
+    first_read_ns — прием первых байт пачки, emitted_ns — передача потребителю;
+    при выключенном TRACKER обе отметки равны 0.
+    """
+
+    def __init__(self, first_read_ns=0):
+        super().__init__()
+        self.first_read_ns = first_read_ns
+        self.emitted_ns = 0
+
+
+class _PendingCommand:
+    """Команда в очереди или отправленная и ожидающая ответа."""
+
+    def __init__(self, command, expect, timeout, future):
+        self.command = command
+        self.expect = expect
+        self.timeout = timeout
+        self.future = future
+        self.timer = None  # Таймаут ответа (после отправки)
+
+    @property
+    def expects_distance(self):
+        return any(issubclass(kind, DistanceFrame) for kind in self.expect)
+
+    def conflicts_with(self, other):
+        """True, если ответы двух команд нельзя различить по типу кадра."""
+        return any(issubclass(mine, theirs) or issubclass(theirs, mine)
+                   for mine in self.expect for theirs in other.expect)
+
+
+class _FdTransport:
+    """Чтение неблокирующего дескриптора порта в цикле событий (POSIX)."""
+
+    def __init__(self, port, loop, on_data, on_error):
+        self.port = port
+        self.loop = loop
+        self.on_data = on_data
+        self.on_error = on_error
+        self.fd = port.fileno()
+        loop.add_reader(self.fd, self._ready)
+
+    def _ready(self):
+        try:
+            data = os.read(self.fd, 65536)
+        except BlockingIOError:
+            return
+        except OSError as e:
+            self.close()
+            self.on_error(e)
+            return
+        if data:
+            self.on_data(data)
+        else:
+            self.close()
+            self.on_error(EOFError("Порт закрыт"))
+
+    def write(self, data):
+        self.port.write(data)
+
+    def close(self):
+        if self.fd is not None:
+            self.loop.remove_reader(self.fd)
+            self.fd = None
+
+
+class _ThreadTransport:
+    """Запасной вариант: поток блокирующего чтения, передающий данные в цикл событий."""
+
+    def __init__(self, port, loop, on_data, on_error):
+        self.port = port
+        self.loop = loop
+        self.on_data = on_data
+        self.on_error = on_error
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name=f"AsyncSensor {getattr(port, 'port', '')}",
+                                        daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while self._running:
+            try:
+                data = self.port.read(self.port.in_waiting or 1)
+            except Exception as e:
+                if self._running:
+                    self.loop.call_soon_threadsafe(self.on_error, e)
+                return
+            if data and self._running:
+                self.loop.call_soon_threadsafe(self.on_data, data)
+
+    def write(self, data):
+        self.port.write(data)
+
+    def close(self):
+        self._running = False
+        if hasattr(self.port, 'cancel_read'):
+            try:
+                self.port.cancel_read()
+            except Exception:
+                pass
+        if self._thread is not threading.current_thread():
+            self._thread.join(1.0)
+
+
+def _make_transport(port, loop, on_data, on_error):
+    if sys.platform != 'win32' and hasattr(port, 'fileno'):
+        try:
+            return _FdTransport(port, loop, on_data, on_error)
+        except (OSError, ValueError, NotImplementedError, AttributeError):
+            pass  # Нет дескриптора или цикл не поддерживает add_reader
+    return _ThreadTransport(port, loop, on_data, on_error)
+
+
+class AsyncSensor:
+    """
+    Датчик JRT M703A поверх asyncio.
+
+    Команды ставятся в очередь с приоритетами (submit/command). Одновременно
+    отправлено не больше max_in_flight команд, и только с различимыми типами
+    ответа; ответ передается самой ранней отправленной команде, ожидающей
+    такой тип кадра. Ошибка :ErXX! передается команде измерения (или самой
+    ранней отправленной) и превращается в SensorError. Таймаут отсчитывается
+    от отправки команды, а не от постановки в очередь.
+    В непрерывном режиме кадры передаются потребителю пачками через
+    asyncio.Queue. После остановки (X) кадры измерений, пришедшие в течение
+    stop_settle секунд, отбрасываются — вместо прежних паузы и очистки буфера.
+    """
+
+    def __init__(self, port, baudrate=19200, command_timeout=1.0, measure_timeout=5.0,
+                 stop_settle=0.15, capture=None, max_in_flight=2):
+        """
+        Args:
+            port (str | serial.Serial): Имя порта или уже открытый объект порта.
+            baudrate (int): Скорость порта, если он открывается по имени.
+            command_timeout (float): Таймаут ответа на служебные команды, сек.
+            measure_timeout (float): Таймаут одиночного измерения D, сек.
+            stop_settle (float): Сколько секунд после X отбрасывать кадры измерений.
+            capture (CaptureWriter, optional): Запись сырого потока байт.
+            max_in_flight (int): Сколько команд может ожидать ответа одновременно
+                (1 — строго последовательный обмен).
+        """
+        self.port = port
+        self.baudrate = baudrate
+        self.command_timeout = command_timeout
+        self.measure_timeout = measure_timeout
+        self.stop_settle = stop_settle
+        self.capture = capture
+        self.max_in_flight = max(1, max_in_flight)
+
+        self.serial_port = None
+        self.parser = FrameParser()
+        self.dropped_records = 0  # Кадры, не ожидаемые ни командой, ни потоком
+        self._loop = None
+        self._transport = None
+        self._owns_port = False
+        self._queue = []           # Куча (приоритет, номер, _PendingCommand) неотправленных команд
+        self._in_flight = []       # Отправленные команды в порядке отправки
+        self._sequence = itertools.count()
+        self._settle_timer = None
+        self._stream_queue = None
+        self._settle_until = 0.0
+
+    @property
+    def is_open(self):
+        return self._transport is not None
+
+    @property
+    def is_streaming(self):
+        return self._stream_queue is not None
+
+    async def open(self):
+        """Открывает порт (в пуле потоков, если задано имя) и начинает прием."""
+        self._loop = asyncio.get_running_loop()
+        if isinstance(self.port, str):
+            self.serial_port = await self._loop.run_in_executor(None, self._open_serial)
+            self._owns_port = True
+        else:
+            self.serial_port = self.port
+        self.parser.reset()
+        self._transport = _make_transport(self.serial_port, self._loop, self._on_data, self._on_error)
+
+    def _open_serial(self):
+        import serial
+        return serial.Serial(self.port, self.baudrate, timeout=0.1)
+
+    async def close(self):
+        """Останавливает поток измерений (X) и закрывает прием; порт, открытый по имени, закрывается."""
+        if self._transport is None:
+            # После ошибки чтения прием уже остановлен, но порт, открытый по имени, еще занят
+            await self._close_owned_port()
+            return
+        if self._stream_queue is not None:
+            self._write(STOP_COMMAND)
+            self._stream_queue.put_nowait(SensorError("Датчик закрыт"))
+            self._stream_queue = None
+        transport, self._transport = self._transport, None
+        await self._loop.run_in_executor(None, transport.close)
+        await self._close_owned_port()
+        self._fail_commands(SensorError("Датчик закрыт"))
+
+    async def _close_owned_port(self):
+        if self._owns_port:
+            self._owns_port = False
+            try:
+                await self._loop.run_in_executor(None, self.serial_port.close)
+            except OSError:
+                pass  # Устройство уже отключено
+
+    async def drain(self, timeout=None):
+        """Ждет завершения всех поставленных в очередь команд (не дольше timeout сек)."""
+        futures = [pending.future for pending in self._in_flight] + [item[2].future for item in self._queue]
+        if futures:
+            await asyncio.wait(futures, timeout=timeout)
+
+    def _write(self, command):
+        if self._transport is not None:
+            self._transport.write(command.encode('ascii'))
+
+    # --- Прием ---
+
+    def _on_data(self, data):
+        if self.capture is not None:
+            self.capture.write(data)
+        if TRACKER.enabled:
+            read_ns = time.perf_counter_ns()
+            records = self.parser.feed(data)
+            TRACKER.record('parse', time.perf_counter_ns() - read_ns)
+        else:
+            read_ns = 0
+            records = self.parser.feed(data)
+        if not records:
+            return
+
+        timestamp = time.time()
+        batch = None
+        for record in records:
+            if self._in_flight and self._deliver_to_command(record):
+                continue
+            if self._stream_queue is not None:
+                if batch is None:
+                    batch = ReadingBatch(read_ns)
+                batch.append(Reading(timestamp, record))
+            else:
+                # Остатки потока после X или кадры без запроса
+                self.dropped_records += 1
+        if batch:
+            self._stream_queue.put_nowait(batch)
+
+    def _deliver_to_command(self, record):
+        """Передает кадр отправленной команде, ожидающей его тип; False — кадр не ответ."""
+        if isinstance(record, (DistanceFrame, ErrorFrame)) and self._loop.time() < self._settle_until:
+            return False  # Запоздавший кадр остановленного потока
+        waiting = [pending for pending in self._in_flight if not pending.future.done()]
+        for pending in waiting:
+            if isinstance(record, pending.expect):
+                pending.future.set_result(record)
+                return True
+        if isinstance(record, ErrorFrame) and self._stream_queue is None and waiting:
+            target = next((pending for pending in waiting if pending.expects_distance), waiting[0])
+            target.future.set_exception(SensorError(describe_error(record.code), record.code))
+            return True
+        return False
+
+    def _on_error(self, exc):
+        self._transport = None
+        self._fail_commands(SensorError(f"Ошибка чтения порта: {exc}"))
+        if self._stream_queue is not None:
+            self._stream_queue.put_nowait(SensorError(f"Ошибка чтения порта: {exc}"))
+
+    def _fail_commands(self, error):
+        """Завершает ошибкой все отправленные и ожидающие в очереди команды."""
+        for pending in self._in_flight + [item[2] for item in self._queue]:
+            if not pending.future.done():
+                pending.future.set_exception(error)
+
+    # --- Команды ---
+
+    def submit(self, command, expect=(AckFrame,), timeout=None, priority=PRIORITY_NORMAL):
+        """
+        Ставит команду в очередь; вызывается из цикла событий датчика.
+
+        Returns:
+            asyncio.Future: Кадр ответа одного из типов expect или исключение
+                SensorTimeout (нет ответа за timeout, по умолчанию command_timeout)
+                либо SensorError (ответ :ErXX!, порт закрыт). Отмена future
+                снимает команду с очереди.
+
+        Raises:
+            SensorError: Датчик не открыт или команда измерения во время потока.
+        """
+        if self._transport is None:
+            raise SensorError("Датчик не открыт")
+        pending = _PendingCommand(command, tuple(expect), timeout or self.command_timeout,
+                                  self._loop.create_future())
+        if self._stream_queue is not None and pending.expects_distance:
+            raise SensorError("Сначала остановите непрерывное измерение")
+        heapq.heappush(self._queue, (priority, next(self._sequence), pending))
+        pending.future.add_done_callback(lambda future: self._finish(pending))
+        self._dispatch()
+        return pending.future
+
+    async def command(self, command, expect=(AckFrame,), timeout=None, priority=PRIORITY_NORMAL):
+        """
+        Выполняет команду через очередь и возвращает кадр ответа (см. submit).
+
+        Raises:
+            SensorTimeout: Ответ не получен за timeout.
+            SensorError: Модуль ответил ошибкой или порт закрыт.
+        """
+        return await self.submit(command, expect, timeout, priority)
+
+    def _dispatch(self):
+        """Отправляет команды из очереди, пока есть место и ответы различимы."""
+        while self._queue and len(self._in_flight) < self.max_in_flight and self._transport is not None:
+            ready = None
+            for item in sorted(self._queue):
+                pending = item[2]
+                if pending.future.done():
+                    continue  # Отменена или завершена ошибкой; снимется в _finish
+                if pending.expects_distance and self._stream_queue is not None:
+                    # Поток запущен, пока измерение ждало очереди: D остановил бы поток
+                    pending.future.set_exception(SensorError("Сначала остановите непрерывное измерение"))
+                    continue
+                if any(pending.conflicts_with(sent) for sent in self._in_flight):
+                    continue
+                if pending.expects_distance and self._loop.time() < self._settle_until:
+                    # Сразу после X измерение ждет, чтобы не принять кадр остановленного потока
+                    if self._settle_timer is None:
+                        self._settle_timer = self._loop.call_at(self._settle_until, self._settled)
+                    continue
+                ready = item
+                break
+            if ready is None:
+                return
+            self._queue.remove(ready)
+            heapq.heapify(self._queue)
+            pending = ready[2]
+            self._in_flight.append(pending)
+            pending.timer = self._loop.call_later(pending.timeout, self._expire, pending)
+            self._write(pending.command)
+
+    def _settled(self):
+        self._settle_timer = None
+        self._dispatch()
+
+    def _expire(self, pending):
+        if not pending.future.done():
+            pending.future.set_exception(SensorTimeout(f"Нет ответа на команду {pending.command!r}"))
+
+    def _finish(self, pending):
+        """Снимает завершенную (или отмененную) команду и отправляет следующие."""
+        if pending.timer is not None:
+            pending.timer.cancel()
+        if pending in self._in_flight:
+            self._in_flight.remove(pending)
+        else:
+            self._queue = [item for item in self._queue if item[2] is not pending]
+            heapq.heapify(self._queue)
+        self._dispatch()
+
+    async def read_version(self):
+        return await self.command('V', (VersionFrame,))
+
+    async def read_status(self, priority=PRIORITY_NORMAL):
+        return await self.command('S', (StatusFrame,), priority=priority)
+
+    async def set_laser(self, turn_on):
+        return await self.command('O' if turn_on else 'C', (AckFrame,), priority=PRIORITY_HIGH)
+
+    async def measure(self):
+        """Одиночное измерение (команда D)."""
+        return await self.command('D', (DistanceFrame,), self.measure_timeout)
+
+    # --- Непрерывный режим ---
+
+    async def stream_batches(self, mode='fast'):
+        """
+        Асинхронный генератор пачек ReadingBatch в режиме 'fast' (F) или 'slow' (M).
+
+        Все пачки, накопившиеся к моменту выдачи, объединяются в одну. При
+        выходе из цикла, отмене задачи или закрытии генератора отправляется X.
+        """
+        if mode not in STREAM_COMMANDS:
+            raise ValueError(f"Неизвестный режим непрерывного измерения: {mode}")
+        if self._stream_queue is not None:
+            raise SensorError("Непрерывное измерение уже запущено")
+        queue = asyncio.Queue()
+        self._stream_queue = queue
+        error = None
+        try:
+            self._write(STREAM_COMMANDS[mode])
+            while error is None:
+                batch = await queue.get()
+                if isinstance(batch, Exception):
+                    raise batch
+                while not queue.empty():
+                    more = queue.get_nowait()
+                    if isinstance(more, Exception):
+                        error = more
+                        break
+                    batch.extend(more)
+                yield batch
+            raise error
+        finally:
+            if self._stream_queue is queue:
+                self._stream_queue = None
+                if self._transport is not None:
+                    self._write(STOP_COMMAND)
+                    self._settle_until = self._loop.time() + self.stop_settle
+
+    async def stream(self, mode='fast'):
+        """Асинхронный генератор отдельных Reading (см. stream_batches)."""
+        batches = self.stream_batches(mode)
+        try:
+            async for batch in batches:
+                for reading in batch:
+                    yield reading
+        finally:
+            await batches.aclose()
+
@@ -0,0 +1,42 @@
+# src/core/reconnect.py
+"""
+Общие правила переподключения к датчику (без зависимости от Qt).
+
+Используются супервизором связи GUI (ConnectionSupervisor) и консольной
+записью (python -m src.cli record):
+
+    Backoff        — экспоненциальная задержка между попытками подключения;
+    stall_timeout  — сколько ждать данных в непрерывном режиме, прежде чем
+                     считать порт зависшим (watchdog).
+"""
+
+# Допустимая пауза без данных по режимам: M и D при плохом отражении
+# выдают измерение раз в несколько секунд, F — несколько раз в секунду
+STALL_TIMEOUTS = {'fast': 3.0, 'auto': 12.0, 'slow': 12.0}
+
+
+def stall_timeout(mode, overrides=None):
+    """Пауза без данных (сек), после которой связь в режиме mode считается потерянной."""
+    timeouts = dict(STALL_TIMEOUTS, **(overrides or {}))
+    return timeouts.get(mode, max(timeouts.values()))
+
+
+class Backoff:
+    """Задержки initial, initial * factor, ... не больше maximum."""
+
+    def __init__(self, initial=0.5, maximum=30.0, factor=2.0):
+        if initial <= 0 or factor < 1:
+            raise ValueError("Задержка должна быть положительной, множитель — не меньше 1")
+        self.initial = initial
+        self.maximum = maximum
+        self.factor = factor
+        self.reset()
+
+    def reset(self):
+        self.attempts = 0
+
+    def next_delay(self):
+        """Задержка перед следующей попыткой, сек; увеличивает счетчик попыток."""
+        delay = min(self.initial * self.factor ** self.attempts, self.maximum)
+        self.attempts += 1
+        return delay
@@ -0,0 +1,182 @@
+from collections import deque
+
+import numpy as np
+
+from .session_format import SERVICE_CODE_BASE
+from ..utils.frame_parser import ERROR_CODES
+
+# Коды ошибок из документации (1..15); остальные учитываются в счетчике 0
+MAX_ERROR_CODE = max(ERROR_CODES)
+
+
+def _counter_index(code):
+    return code if 0 < code <= MAX_ERROR_CODE else 0
+
+
+class ErrorEventStore:
+    """
+    Журнал ошибок датчика (:ErXX!) с компактными записями.
+
+    Каждая ошибка хранится как (время float64, код uint8) — 9 байт, колонки
+    растут удвоением (или образуют кольцевой буфер при capacity). Рядом
+    ведутся счетчики по кодам за все время и за последние rate_window
+    секунд, поэтому add() и запросы счетчиков и частоты выполняются за O(1)
+    (амортизированно) независимо от длины журнала.
+    """
+
+    TIMESTAMP_DTYPE = np.float64
+    CODE_DTYPE = np.uint8
+
+    def __init__(self, capacity=None, rate_window=60.0, initial_size=256):
+        """
+        Args:
+            capacity (int, optional): Максимальное число хранимых записей; счетчики
+                учитывают и вытесненные записи. Если None, журнал растет без ограничений.
+            rate_window (float): Интервал скользящего окна частоты ошибок, сек.
+            initial_size (int): Начальный размер массивов в неограниченном режиме.
+        """
+        if capacity is not None and capacity <= 0:
+            raise ValueError("capacity должна быть положительной")
+        self.capacity = capacity
+        self.rate_window = rate_window
+        self._initial_size = max(1, initial_size)
+        self.clear()
+
+    def clear(self):
+        size = self.capacity or self._initial_size
+        self._timestamps = np.empty(size, dtype=self.TIMESTAMP_DTYPE)
+        self._codes = np.empty(size, dtype=self.CODE_DTYPE)
+        self._size = 0
+        self._head = 0
+        self.total_count = 0
+        self.counts = [0] * (MAX_ERROR_CODE + 1)
+        self.last_timestamp = None
+        self._recent = deque()  # (время, индекс счетчика) ошибок в окне
+        self._window_counts = [0] * (MAX_ERROR_CODE + 1)
+
+    def __len__(self):
+        return self._size
+
+    def add(self, timestamp, code):
+        """Добавляет ошибку с кодом code в момент timestamp (сек Unix)."""
+        if self.capacity:
+            self._timestamps[self._head] = timestamp
+            self._codes[self._head] = min(code, 255)
+            self._head = (self._head + 1) % self.capacity
+            self._size = min(self._size + 1, self.capacity)
+        else:
+            if self._size == len(self._timestamps):
+                self._grow(self._size + 1)
+            self._timestamps[self._size] = timestamp
+            self._codes[self._size] = min(code, 255)
+            self._size += 1
+        self.total_count += 1
+        self.last_timestamp = timestamp
+
+        index = _counter_index(code)
+        self.counts[index] += 1
+        self._recent.append((timestamp, index))
+        self._window_counts[index] += 1
+        self._expire(timestamp)
+
+    def extend(self, timestamps, codes):
+        """Добавляет пачку ошибок (массивы одинаковой длины) векторно."""
+        timestamps = np.asarray(timestamps, dtype=self.TIMESTAMP_DTYPE)
+        codes = np.asarray(codes)
+        if len(timestamps) != len(codes):
+            raise ValueError("Длины массивов пачки не совпадают")
+        if len(codes) == 0:
+            return
+        indexes = np.where((codes > 0) & (codes <= MAX_ERROR_CODE), codes, 0).astype(np.intp)
+        stored = np.minimum(codes, 255).astype(self.CODE_DTYPE)
+        count = len(codes)
+        if self.capacity:
+            keep = min(count, self.capacity)
+            positions = (self._head + count - keep + np.arange(keep)) % self.capacity
+            self._timestamps[positions] = timestamps[-keep:]
+            self._codes[positions] = stored[-keep:]
+            self._head = (self._head + count) % self.capacity
+            self._size = min(self._size + count, self.capacity)
+        else:
+            end = self._size + count
+            if end > len(self._timestamps):
+                self._grow(end)
+            self._timestamps[self._size:end] = timestamps
+            self._codes[self._size:end] = stored
+            self._size = end
+        self.total_count += count
+        self.last_timestamp = float(timestamps[-1])
+
+        for index, value in enumerate(np.bincount(indexes, minlength=MAX_ERROR_CODE + 1).tolist()):
+            self.counts[index] += value
+        # В окно попадают только ошибки не старше rate_window от последней
+        recent = np.searchsorted(timestamps, self.last_timestamp - self.rate_window, side='left')
+        for timestamp, index in zip(timestamps[recent:].tolist(), indexes[recent:].tolist()):
+            self._recent.append((timestamp, index))
+            self._window_counts[index] += 1
+        self._expire(self.last_timestamp)
+
+    def _grow(self, required):
+        new_size = max(required, 2 * len(self._timestamps))
+        timestamps, codes = self._timestamps, self._codes
+        self._timestamps = np.empty(new_size, dtype=self.TIMESTAMP_DTYPE)
+        self._codes = np.empty(new_size, dtype=self.CODE_DTYPE)
+        self._timestamps[:self._size] = timestamps[:self._size]
+        self._codes[:self._size] = codes[:self._size]
+
+    def _expire(self, now):
+        """Убирает из окна ошибки старше now - rate_window."""
+        recent = self._recent
+        limit = now - self.rate_window
+        while recent and recent[0][0] < limit:
+            self._window_counts[recent.popleft()[1]] -= 1
+
+    def _ordered(self, column):
+        if not self.capacity or self._size < self.capacity:
+            return column[:self._size]
+        return np.concatenate((column[self._head:], column[:self._head]))
+
+    def timestamps(self):
+        """Время хранимых ошибок в порядке поступления."""
+        return self._ordered(self._timestamps)
+
+    def codes(self):
+        """Коды хранимых ошибок в порядке поступления."""
+        return self._ordered(self._codes)
+
+    def window_counts(self, now=None):
+        """
+        Число ошибок по кодам за последние rate_window секунд.
+
+        Args:
+            now (float, optional): Текущее время; по умолчанию — время последней ошибки
+                (для просмотра записанной сессии).
+
+        Returns:
+            dict: {код: число}; код 0 — коды вне документации.
+        """
+        if now is not None:
+            self._expire(now)
+        return {code: count for code, count in enumerate(self._window_counts) if count}
+
+    def rate(self, code=None, now=None):
+        """Частота ошибок (всех или с кодом code) в скользящем окне, 1/сек."""
+        if now is not None:
+            self._expire(now)
+        count = len(self._recent) if code is None else self._window_counts[_counter_index(code)]
+        return count / self.rate_window
+
+    def summary(self, now=None):
+        """Список (код, всего, в минуту) для встречавшихся кодов."""
+        window = self.window_counts(now)
+        return [(code, total, window.get(code, 0) * 60.0 / self.rate_window)
+                for code, total in enumerate(self.counts) if total]
+
+    @classmethod
+    def from_records(cls, timestamps, error_codes, rate_window=60.0):
+        """Журнал из колонок записанной сессии (записи ошибок датчика, без служебных)."""
+        error_codes = np.asarray(error_codes)
+        mask = (error_codes > 0) & (error_codes < SERVICE_CODE_BASE)
+        store = cls(rate_window=rate_window, initial_size=int(mask.sum()))
+        store.extend(np.asarray(timestamps)[mask], error_codes[mask])
+        return store
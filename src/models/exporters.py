@@ -0,0 +1,199 @@
+import os
+
+import numpy as np
+
+# Необязательные зависимости: без них недоступен только соответствующий формат
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+try:
+    import h5py
+except ImportError:
+    h5py = None
+
+DEFAULT_CHUNK_SIZE = 65536
+COLUMNS = ('timestamp', 'distance', 'quality', 'error_code')
+
+
+class ExportCancelled(Exception):
+    """Экспорт прерван пользователем."""
+
+
+def snapshot_columns(store):
+    """
+    Фиксирует данные хранилища для экспорта.
+
+    Вызывается в потоке, который пополняет хранилище (GUI-поток), до
+    запуска фонового экспорта: все колонки берутся по одному окну
+    измерений. Для неограниченного хранилища и файла сессии возвращаются
+    представления (новые измерения в них не попадают, при очистке и росте
+    хранилище выделяет новые массивы, копирования нет). Кольцевой буфер
+    копируется, так как во время экспорта его ячейки перезаписываются;
+    объем копии ограничен его емкостью.
+
+    Returns:
+        dict: Колонки COLUMNS одинаковой длины.
+    """
+    count = len(store)
+    columns = {
+        'timestamp': store.timestamps(count),
+        'distance': store.distances(count),
+        'quality': store.qualities(count),
+    }
+    if hasattr(store, 'error_codes'):
+        columns['error_code'] = store.error_codes(count)
+    else:
+        columns['error_code'] = np.zeros(count, dtype=np.uint16)
+    if store.capacity:
+        columns = {name: np.array(values) for name, values in columns.items()}
+    return columns
+
+
+class CsvExporter:
+    """Запись CSV: каждый кусок форматируется одной операцией над шаблоном строк."""
+
+    ROW_FORMAT = "%.6f,%.3f,%d,%d\n"
+
+    def __init__(self, path):
+        self._file = open(path, 'w', encoding='utf-8', newline='')
+        self._file.write(",".join(COLUMNS) + "\n")
+
+    def write_chunk(self, chunk):
+        count = len(chunk['timestamp'])
+        if count == 0:
+            return
+        table = np.empty((count, len(COLUMNS)), dtype=np.float64)
+        for index, name in enumerate(COLUMNS):
+            table[:, index] = chunk[name]
+        self._file.write((self.ROW_FORMAT * count) % tuple(table.ravel().tolist()))
+
+    def close(self):
+        self._file.close()
+
+
+class ParquetExporter:
+    """Запись Parquet (pyarrow): каждый кусок — отдельная группа строк."""
+
+    def __init__(self, path):
+        if pyarrow is None:
+            raise RuntimeError("Для экспорта в Parquet требуется пакет pyarrow")
+        self._schema = pyarrow.schema([
+            ('timestamp', pyarrow.float64()),
+            ('distance', pyarrow.float32()),
+            ('quality', pyarrow.uint16()),
+            ('error_code', pyarrow.uint16()),
+        ])
+        self._writer = pyarrow.parquet.ParquetWriter(path, self._schema)
+
+    def write_chunk(self, chunk):
+        arrays = [pyarrow.array(np.ascontiguousarray(chunk[field.name]), type=field.type)
+                  for field in self._schema]
+        self._writer.write_table(pyarrow.Table.from_arrays(arrays, schema=self._schema))
+
+    def close(self):
+        self._writer.close()
+
+
+class Hdf5Exporter:
+    """Запись HDF5 (h5py): расширяемые наборы данных по колонкам."""
+
+    DTYPES = {'timestamp': 'f8', 'distance': 'f4', 'quality': 'u2', 'error_code': 'u2'}
+
+    def __init__(self, path, chunk_size=DEFAULT_CHUNK_SIZE):
+        if h5py is None:
+            raise RuntimeError("Для экспорта в HDF5 требуется пакет h5py")
+        self._file = h5py.File(path, 'w')
+        group = self._file.create_group('measurements')
+        self._datasets = {name: group.create_dataset(name, shape=(0,), maxshape=(None,), dtype=dtype,
+                                                     chunks=(chunk_size,), compression='gzip')
+                          for name, dtype in self.DTYPES.items()}
+        self._count = 0
+
+    def write_chunk(self, chunk):
+        count = len(chunk['timestamp'])
+        end = self._count + count
+        for name, dataset in self._datasets.items():
+            dataset.resize((end,))
+            dataset[self._count:end] = chunk[name]
+        self._count = end
+
+    def close(self):
+        self._file.close()
+
+
+EXPORTERS = {
+    'csv': CsvExporter,
+    'parquet': ParquetExporter,
+    'hdf5': Hdf5Exporter,
+}
+
+EXTENSIONS = {
+    '.csv': 'csv',
+    '.parquet': 'parquet',
+    '.h5': 'hdf5',
+    '.hdf5': 'hdf5',
+}
+
+
+def format_from_path(path):
+    """Определяет формат экспорта по расширению файла (по умолчанию CSV)."""
+    return EXTENSIONS.get(os.path.splitext(path)[1].lower(), 'csv')
+
+
+def export_store(store, path, fmt=None, chunk_size=DEFAULT_CHUNK_SIZE, progress=None, is_cancelled=None):
+    """
+    Экспортирует хранилище измерений (см. export_columns).
+
+    Хранилище не должно пополняться во время вызова; для фонового экспорта
+    колонки фиксируются snapshot_columns заранее и передаются в export_columns.
+    """
+    return export_columns(snapshot_columns(store), path, fmt, chunk_size, progress, is_cancelled)
+
+
+def export_columns(columns, path, fmt=None, chunk_size=DEFAULT_CHUNK_SIZE, progress=None, is_cancelled=None):
+    """
+    Экспортирует зафиксированные колонки кусками фиксированного размера.
+
+    Память, используемая при экспорте, ограничена размером куска и не
+    зависит от длины сессии (кроме копии кольцевого буфера, см. snapshot_columns).
+
+    Args:
+        columns (dict): Колонки COLUMNS одинаковой длины (результат snapshot_columns).
+        path (str): Путь к выходному файлу.
+        fmt (str, optional): 'csv', 'parquet' или 'hdf5'; по умолчанию — по расширению.
+        chunk_size (int): Количество строк в куске.
+        progress (callable, optional): progress(written, total) после каждого куска.
+        is_cancelled (callable, optional): Возвращает True, если экспорт нужно прервать.
+
+    Returns:
+        int: Количество записанных строк.
+
+    Raises:
+        ExportCancelled: Если экспорт прерван; неполный файл удаляется.
+    """
+    fmt = fmt or format_from_path(path)
+    if fmt not in EXPORTERS:
+        raise ValueError(f"Неизвестный формат экспорта: {fmt}")
+
+    total = len(columns['timestamp'])
+    exporter = EXPORTERS[fmt](path)
+    written = 0
+    try:
+        for start in range(0, total, chunk_size):
+            if is_cancelled is not None and is_cancelled():
+                raise ExportCancelled()
+            end = min(start + chunk_size, total)
+            exporter.write_chunk({name: values[start:end] for name, values in columns.items()})
+            written = end
+            if progress is not None:
+                progress(written, total)
+    except BaseException:
+        exporter.close()
+        if os.path.exists(path):
+            os.remove(path)
+        raise
+    exporter.close()
+    return written
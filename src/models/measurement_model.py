@@ -1,37 +1,205 @@
-import os
-import csv
+import copy
 import time
-import pandas as pd
+
 import numpy as np
-from datetime import datetime
+
+from .error_events import ErrorEventStore
+from .measurement_store import MeasurementStore, MeasurementView
+from .online_stats import MeasurementStatistics
+from .session_reader import SessionReader, SessionFileStore
+from ..utils.signal_filters import FilterPipeline
 
 class MeasurementModel:
-    def __init__(self):
+    # Максимум измерений, накопленных до фильтрации и обновления статистики
+    SYNC_BATCH = 4096
+    # Размер куска при фильтрации сессии из файла
+    SESSION_FILTER_CHUNK = 1 << 18
+
+    def __init__(self, capacity=None, stats_window=100, filter_pipeline=None):
         """
         Инициализирует модель измерений.
 
-        Создает пустой список для хранения измерений и устанавливает идентификатор текущей сессии в None.
+        Создает колоночное хранилище измерений и устанавливает идентификатор текущей сессии в None.
+
+        Новые измерения всегда попадают в live_store, а методы чтения работают
+        с отображаемым хранилищем store: это либо live_store, либо открытая
+        для просмотра сессия из файла (только чтение).
+
+        Args:
+            capacity (int, optional): Максимальное число хранимых измерений (кольцевой буфер).
+                Если None, хранятся все измерения сессии.
+            stats_window (int): Число последних измерений для скользящей статистики.
+            filter_pipeline (FilterPipeline, optional): Фильтры для колонки filtered;
+                если None, отфильтрованные значения совпадают с исходными.
         """
-        self.measurements = []
+        self.live_store = MeasurementStore(capacity)
+        # Ошибки датчика хранятся отдельно от измерений (счетчики по кодам и частота)
+        self.live_errors = ErrorEventStore(capacity)
+        self.store = self.live_store
+        self.session_reader = None
         self.current_session_id = None
-        
-    def add_measurement(self, distance, quality):
+        # Фильтрация и статистика догоняют хранилище пачками (векторно) при
+        # обращении или после SYNC_BATCH новых измерений; пачка не длиннее
+        # capacity, поэтому ни одно измерение не пропускается
+        self.stats_window = stats_window
+        self.live_statistics = MeasurementStatistics(stats_window)
+        self.filter_pipeline = filter_pipeline if filter_pipeline is not None else FilterPipeline()
+        self._pending = 0
+        self._sync_batch = min(self.SYNC_BATCH, capacity or self.SYNC_BATCH)
+        self._session_statistics = None
+        self._session_filtered = None
+        self._session_errors = None
+
+    @property
+    def statistics(self):
+        """
+        Статистика отображаемых данных (MeasurementStatistics).
+
+        Для открытой сессии из файла считается один раз при первом обращении.
+        """
+        if self.store is self.live_store:
+            self._sync_pending()
+            return self.live_statistics
+        if self._session_statistics is None:
+            self._session_statistics = MeasurementStatistics.from_store(self.store, self.stats_window)
+        return self._session_statistics
+
+    @property
+    def errors(self):
+        """
+        Журнал ошибок датчика отображаемых данных (ErrorEventStore).
+
+        Для открытой сессии из файла строится один раз при первом обращении.
+        """
+        if self.store is self.live_store:
+            return self.live_errors
+        if self._session_errors is None:
+            reader = self.session_reader
+            self._session_errors = ErrorEventStore.from_records(reader.timestamps, reader.error_codes,
+                                                                self.live_errors.rate_window)
+        return self._session_errors
+
+    def _sync_pending(self):
+        """Фильтрует измерения, поступившие после прошлой синхронизации, и добавляет их в статистику."""
+        pending = self._pending
+        if not pending:
+            return
+        self._pending = 0
+        store = self.live_store
+        timestamps, distances, qualities = store.timestamps(pending), store.distances(pending), store.qualities(pending)
+        store.set_filtered(self.filter_pipeline.process(timestamps, distances, qualities))
+        self.live_statistics.add_many(timestamps, distances, qualities)
+
+    @property
+    def read_only(self):
+        """True, если отображается сессия из файла."""
+        return self.store.read_only
+
+    def open_session(self, path):
+        """
+        Открывает записанную сессию для просмотра без загрузки в память.
+
+        Args:
+            path (str): Путь к файлу сессии.
+
+        Returns:
+            SessionReader: Открытый файл сессии.
+        """
+        reader = SessionReader(path)
+        self.close_session()
+        self.session_reader = reader
+        self._session_statistics = None
+        self._session_filtered = None
+        self._session_errors = None
+        self.store = SessionFileStore(reader)
+        self.current_session_id = path
+        return reader
+
+    def close_session(self):
+        """Закрывает просматриваемую сессию и возвращается к текущим измерениям."""
+        if self.session_reader is None:
+            return
+        self.store = self.live_store
+        self._session_statistics = None
+        self._session_filtered = None
+        self._session_errors = None
+        self.session_reader.close()
+        self.session_reader = None
+        self.current_session_id = None
+
+    @property
+    def measurements(self):
+        """Все измерения в виде последовательности кортежей (timestamp, distance, quality)."""
+        return self.get_measurements()
+
+    def add_measurement(self, distance, quality, timestamp=None):
         """
         Добавляет новое измерение.
 
-        Добавляет измерение с текущей временной меткой, дистанцией и качеством сигнала в список измерений.
+        Добавляет измерение с временной меткой, дистанцией и качеством сигнала в хранилище.
 
         Args:
             distance (float): Значение дистанции.
             quality (float): Значение качества сигнала.
+            timestamp (float, optional): Время измерения; по умолчанию текущее время.
 
         Returns:
-            int: Количество измерений в списке после добавления нового измерения.
+            int: Количество измерений в хранилище после добавления нового измерения.
         """
-        timestamp = time.time()
-        self.measurements.append((timestamp, distance, quality))
-        return len(self.measurements)
-    
+        if timestamp is None:
+            timestamp = time.time()
+        self.live_store.append(timestamp, distance, quality)
+        self._pending += 1
+        if self._pending >= self._sync_batch:
+            self._sync_pending()
+        return len(self.live_store)
+
+    def extend(self, timestamps, distances, qualities):
+        """
+        Добавляет пачку измерений (массивы одинаковой длины).
+
+        Пачка записывается в хранилище векторно кусками не длиннее интервала
+        синхронизации, поэтому при кольцевом буфере фильтрация и статистика
+        не пропускают измерения даже для пачки длиннее capacity.
+
+        Args:
+            timestamps (array_like): Временные метки измерений.
+            distances (array_like): Значения дистанций.
+            qualities (array_like): Значения качества сигнала.
+
+        Returns:
+            int: Количество измерений в хранилище после добавления пачки.
+        """
+        timestamps, distances, qualities = np.asarray(timestamps), np.asarray(distances), np.asarray(qualities)
+        if not (len(distances) == len(qualities) == len(timestamps)):
+            raise ValueError("Длины массивов пачки не совпадают")
+        step = self._sync_batch
+        if self._pending + len(timestamps) < step:
+            # Частый случай: пачка меньше оставшегося до синхронизации
+            self.live_store.extend(timestamps, distances, qualities)
+            self._pending += len(timestamps)
+            return len(self.live_store)
+        for start in range(0, len(timestamps), step):
+            end = start + step
+            count = len(timestamps[start:end])
+            if self._pending + count > step:
+                self._sync_pending()
+            self.live_store.extend(timestamps[start:end], distances[start:end], qualities[start:end])
+            self._pending += count
+        if self._pending >= step:
+            self._sync_pending()
+        return len(self.live_store)
+
+    def add_error(self, code, timestamp=None):
+        """
+        Добавляет ошибку датчика (:ErXX!) в журнал ошибок.
+
+        Args:
+            code (int): Код ошибки.
+            timestamp (float, optional): Время ошибки; по умолчанию текущее время.
+        """
+        self.live_errors.add(time.time() if timestamp is None else timestamp, code)
+
     def get_measurements(self, count=None):
         """
         Возвращает измерения.
@@ -42,12 +210,24 @@ class MeasurementModel:
             count (int, optional): Количество последних измерений для возврата. Если None, возвращаются все измерения.
 
         Returns:
-            list: Список измерений.
+            MeasurementView: Представление измерений без копирования (последовательность кортежей
+                с доступом к колонкам timestamps, distances, qualities).
         """
-        if count is None:
-            return self.measurements
-        return self.measurements[-count:]
-        
+        return MeasurementView(self.store.timestamps(count), self.store.distances(count),
+                               self.store.qualities(count))
+
+    def get_timestamps(self, count=None):
+        """
+        Возвращает временные метки измерений.
+
+        Args:
+            count (int, optional): Количество последних измерений. Если None, используются все измерения.
+
+        Returns:
+            numpy.ndarray: Представление массива временных меток (float64).
+        """
+        return self.store.timestamps(count)
+
     def get_distances(self, count=None):
         """
         Возвращает значения дистанций из измерений.
@@ -56,11 +236,42 @@ class MeasurementModel:
             count (int, optional): Количество последних измерений для извлечения дистанций. Если None, используются все измерения.
 
         Returns:
-            list: Список значений дистанций.
+            numpy.ndarray: Представление массива дистанций (float32).
         """
-        measurements = self.get_measurements(count)
-        return [m[1] for m in measurements]
-    
+        return self.store.distances(count)
+
+    def get_filtered_distances(self, count=None):
+        """
+        Возвращает отфильтрованные дистанции (рядом с исходными в хранилище).
+
+        Для открытой сессии из файла фильтры применяются ко всей сессии один
+        раз при первом обращении (в файле хранятся только исходные данные).
+
+        Args:
+            count (int, optional): Количество последних измерений. Если None, используются все измерения.
+
+        Returns:
+            numpy.ndarray: Отфильтрованные дистанции (float32); NaN — измерение отбраковано.
+        """
+        if self.store is self.live_store:
+            self._sync_pending()
+            return self.live_store.filtered(count)
+        if self._session_filtered is None:
+            pipeline = copy.deepcopy(self.filter_pipeline)
+            pipeline.reset()
+            store = self.store
+            timestamps, distances, qualities = store.timestamps(), store.distances(), store.qualities()
+            filtered = np.empty(len(store), dtype=np.float32)
+            # Кусками, чтобы промежуточные массивы фильтров не зависели от длины сессии
+            for start in range(0, len(store), self.SESSION_FILTER_CHUNK):
+                end = start + self.SESSION_FILTER_CHUNK
+                filtered[start:end] = pipeline.process(timestamps[start:end], distances[start:end],
+                                                       qualities[start:end])
+            self._session_filtered = filtered
+        if count is None:
+            return self._session_filtered
+        return self._session_filtered[len(self._session_filtered) - min(count, len(self._session_filtered)):]
+
     def get_quality_values(self, count=None):
         """
         Возвращает значения качества сигнала из измерений.
@@ -69,11 +280,14 @@ class MeasurementModel:
             count (int, optional): Количество последних измерений для извлечения значений качества. Если None, используются все измерения.
 
         Returns:
-            list: Список значений качества сигнала.
+            numpy.ndarray: Представление массива значений качества (uint16).
         """
-        measurements = self.get_measurements(count)
-        return [m[2] for m in measurements]
-    
+        return self.store.qualities(count)
+
     def clear_measurements(self):
         """Очищает все измерения в текущей сессии."""
-        self.measurements = []
\ No newline at end of file
+        self.live_store.clear()
+        self.live_errors.clear()
+        self.live_statistics.reset()
+        self.filter_pipeline.reset()
+        self._pending = 0
\ No newline at end of file
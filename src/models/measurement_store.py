@@ -0,0 +1,215 @@
+from collections.abc import Sequence
+
+import numpy as np
+
+
+class MeasurementStore:
+    """
+    Колоночное хранилище измерений на массивах NumPy.
+
+    Хранит колонки: время (float64, сек Unix), расстояние (float32, м),
+    качество сигнала (uint16) и рядом с исходным расстоянием — отфильтрованное
+    (float32, м; NaN — отбраковано). Чтение возвращает срезы-представления
+    без копирования.
+
+    append()/extend() пишут только исходные данные; колонку filtered
+    заполняет владелец хранилища (MeasurementModel) через set_filtered()
+    пачками, поэтому ее значения для последних, еще не отфильтрованных
+    измерений не определены.
+
+    Режимы работы:
+        * capacity=None — неограниченный рост; массивы удваиваются при
+          заполнении (амортизированное O(1) на добавление);
+        * capacity=N — кольцевой буфер на N последних измерений. Каждое
+          значение пишется дважды (в позиции i и i + N), поэтому любые
+          последние k <= N измерений лежат в памяти непрерывно и отдаются
+          представлением даже после переноса через край буфера.
+
+    Расход памяти на одно измерение: 18 байт (8 + 4 + 2 + 4) полезных данных.
+    В неограниченном режиме резерв роста дает не более 36 байт на измерение,
+    в кольцевом — ровно 36 байт на ячейку (зеркальная копия). Для сравнения,
+    кортеж (float, float, int) в списке занимает около 100 байт.
+
+    Представления кольцевого буфера отражают текущее содержимое памяти:
+    после следующих capacity добавлений их значения будут перезаписаны.
+    Если данные нужно сохранить, следует сделать копию (np.array(view)).
+    """
+
+    TIMESTAMP_DTYPE = np.float64
+    DISTANCE_DTYPE = np.float32
+    QUALITY_DTYPE = np.uint16
+    FILTERED_DTYPE = np.float32
+    BYTES_PER_SAMPLE = 18
+    read_only = False
+
+    def __init__(self, capacity=None, initial_size=1024):
+        """
+        Args:
+            capacity (int, optional): Максимальное число хранимых измерений.
+                Если None, хранилище растет без ограничений.
+            initial_size (int): Начальный размер массивов в неограниченном режиме.
+        """
+        if capacity is not None and capacity <= 0:
+            raise ValueError("capacity должна быть положительной")
+        self.capacity = capacity
+        self._initial_size = max(1, initial_size)
+        self._allocate(2 * capacity if capacity else self._initial_size)
+        self._size = 0    # Количество доступных измерений
+        self._head = 0    # Позиция следующей записи (в кольцевом режиме — в [0, capacity))
+        self.total_count = 0  # Сколько измерений добавлено с момента очистки
+
+    def _allocate(self, size):
+        self._timestamps = np.empty(size, dtype=self.TIMESTAMP_DTYPE)
+        self._distances = np.empty(size, dtype=self.DISTANCE_DTYPE)
+        self._qualities = np.empty(size, dtype=self.QUALITY_DTYPE)
+        self._filtered = np.empty(size, dtype=self.FILTERED_DTYPE)
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def nbytes(self):
+        """Объем памяти, занятой массивами хранилища, в байтах."""
+        return (self._timestamps.nbytes + self._distances.nbytes + self._qualities.nbytes
+                + self._filtered.nbytes)
+
+    def append(self, timestamp, distance, quality):
+        """Добавляет одно измерение."""
+        if self.capacity:
+            head = self._head
+            mirror = head + self.capacity
+            self._timestamps[head] = self._timestamps[mirror] = timestamp
+            self._distances[head] = self._distances[mirror] = distance
+            self._qualities[head] = self._qualities[mirror] = quality
+            self._head = (head + 1) % self.capacity
+            if self._size < self.capacity:
+                self._size += 1
+        else:
+            if self._size == len(self._timestamps):
+                self._grow(self._size + 1)
+            self._timestamps[self._size] = timestamp
+            self._distances[self._size] = distance
+            self._qualities[self._size] = quality
+            self._size += 1
+            self._head = self._size
+        self.total_count += 1
+
+    def extend(self, timestamps, distances, qualities):
+        """Добавляет пачку измерений (массивы одинаковой длины) одной векторной операцией."""
+        timestamps = np.asarray(timestamps, dtype=self.TIMESTAMP_DTYPE)
+        distances = np.asarray(distances, dtype=self.DISTANCE_DTYPE)
+        qualities = np.asarray(qualities, dtype=self.QUALITY_DTYPE)
+        count = len(timestamps)
+        if not (len(distances) == len(qualities) == count):
+            raise ValueError("Длины массивов пачки не совпадают")
+        if count == 0:
+            return
+
+        if self.capacity:
+            # В кольцо попадают только последние capacity измерений пачки
+            keep = min(count, self.capacity)
+            positions = (self._head + count - keep + np.arange(keep)) % self.capacity
+            for column, values in ((self._timestamps, timestamps),
+                                   (self._distances, distances),
+                                   (self._qualities, qualities)):
+                column[positions] = values[-keep:]
+                column[positions + self.capacity] = values[-keep:]
+            self._head = (self._head + count) % self.capacity
+            self._size = min(self.capacity, self._size + count)
+        else:
+            end = self._size + count
+            if end > len(self._timestamps):
+                self._grow(end)
+            self._timestamps[self._size:end] = timestamps
+            self._distances[self._size:end] = distances
+            self._qualities[self._size:end] = qualities
+            self._size = end
+            self._head = end
+        self.total_count += count
+
+    def _grow(self, required):
+        """Удваивает массивы неограниченного режима до размера не меньше required."""
+        new_size = max(required, 2 * len(self._timestamps))
+        old = (self._timestamps, self._distances, self._qualities, self._filtered)
+        self._allocate(new_size)
+        for column, values in zip((self._timestamps, self._distances, self._qualities, self._filtered), old):
+            column[:self._size] = values[:self._size]
+
+    def _window(self, count):
+        """Границы непрерывного окна последних count измерений."""
+        size = self._size if count is None else max(0, min(count, self._size))
+        end = self._head + self.capacity if self.capacity else self._size
+        return end - size, end
+
+    def timestamps(self, count=None):
+        """Представление временных меток последних count (или всех) измерений."""
+        start, end = self._window(count)
+        return self._timestamps[start:end]
+
+    def distances(self, count=None):
+        """Представление расстояний последних count (или всех) измерений."""
+        start, end = self._window(count)
+        return self._distances[start:end]
+
+    def qualities(self, count=None):
+        """Представление значений качества последних count (или всех) измерений."""
+        start, end = self._window(count)
+        return self._qualities[start:end]
+
+    def filtered(self, count=None):
+        """Представление отфильтрованных расстояний последних count (или всех) измерений."""
+        start, end = self._window(count)
+        return self._filtered[start:end]
+
+    def set_filtered(self, values):
+        """Записывает отфильтрованные расстояния для последних len(values) измерений."""
+        count = len(values)
+        if count > self._size:
+            raise ValueError("Отфильтрованных значений больше, чем измерений")
+        if count == 0:
+            return
+        start, end = self._window(count)
+        self._filtered[start:end] = values
+        if self.capacity:
+            # Зеркальная копия: позиции i и i + capacity хранят одно измерение
+            positions = np.arange(start, end)
+            self._filtered[np.where(positions < self.capacity, positions + self.capacity,
+                                    positions - self.capacity)] = values
+
+    def clear(self):
+        """Удаляет все измерения; в неограниченном режиме освобождает память."""
+        if not self.capacity:
+            self._allocate(self._initial_size)
+        self._size = 0
+        self._head = 0
+        self.total_count = 0
+
+
+class MeasurementView(Sequence):
+    """
+    Представление набора измерений без копирования данных.
+
+    Дает доступ к колонкам (timestamps, distances, qualities) как к массивам
+    NumPy и одновременно ведет себя как прежний список кортежей
+    (timestamp, distance, quality): поддерживает len(), индексацию,
+    срезы, итерацию и reversed().
+    """
+
+    def __init__(self, timestamps, distances, qualities):
+        self.timestamps = timestamps
+        self.distances = distances
+        self.qualities = qualities
+
+    def __len__(self):
+        return len(self.timestamps)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return MeasurementView(self.timestamps[index], self.distances[index], self.qualities[index])
+        return (float(self.timestamps[index]), float(self.distances[index]), int(self.qualities[index]))
+
+    def __iter__(self):
+        return zip(self.timestamps.tolist(), self.distances.tolist(), self.qualities.tolist())
+
+    def __repr__(self):
+        return f"MeasurementView({len(self)} измерений)"
@@ -0,0 +1,453 @@
+import heapq
+import math
+from collections import deque, namedtuple
+
+import numpy as np
+
+# Сводка статистики расстояния: среднее, СКО, минимум, максимум, медиана (м),
+# дрейф (м/с, наклон линейной регрессии по времени) и среднее с весом по качеству (м)
+StatisticsSnapshot = namedtuple('StatisticsSnapshot',
+                                ['count', 'mean', 'std', 'min', 'max', 'median', 'drift', 'weighted_mean'])
+
+EMPTY_SNAPSHOT = StatisticsSnapshot(0, math.nan, math.nan, math.nan, math.nan, math.nan, math.nan, math.nan)
+
+
+class RunningStats:
+    """
+    Статистика за всю сессию по алгоритму Уэлфорда.
+
+    Хранит только несколько чисел: среднее и сумму квадратов отклонений
+    (дисперсия без потери точности при большом числе измерений), минимум,
+    максимум, суммы для среднего с весом и ко-момент время-расстояние для
+    наклона (дрейфа). Пачки добавляются векторно и объединяются формулами
+    Чана для параллельной дисперсии.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self.weight_sum = 0.0
+        self.weighted_sum = 0.0
+        self.time_mean = 0.0
+        self.time_m2 = 0.0
+        self.comoment = 0.0   # Сумма (t - mean_t)(x - mean_x)
+
+    def add(self, timestamp, value, weight=1.0):
+        """Добавляет одно значение за O(1)."""
+        self.count += 1
+        n = self.count
+        delta = value - self.mean
+        self.mean += delta / n
+        self.m2 += delta * (value - self.mean)
+        time_delta = timestamp - self.time_mean
+        self.time_mean += time_delta / n
+        self.time_m2 += time_delta * (timestamp - self.time_mean)
+        self.comoment += time_delta * (value - self.mean)
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        self.weight_sum += weight
+        self.weighted_sum += weight * value
+
+    def add_many(self, timestamps, values, weights):
+        """Добавляет пачку массивов: статистика пачки считается NumPy и объединяется с накопленной."""
+        count = len(values)
+        if count == 0:
+            return
+        values = np.asarray(values, dtype=np.float64)
+        timestamps = np.asarray(timestamps, dtype=np.float64)
+        weights = np.asarray(weights, dtype=np.float64)
+        mean = float(values.mean())
+        time_mean = float(timestamps.mean())
+        deviations = values - mean
+        time_deviations = timestamps - time_mean
+        m2 = float(deviations @ deviations)
+        time_m2 = float(time_deviations @ time_deviations)
+        comoment = float(time_deviations @ deviations)
+
+        total = self.count + count
+        delta = mean - self.mean
+        time_delta = time_mean - self.time_mean
+        factor = self.count * count / total
+        self.m2 += m2 + delta * delta * factor
+        self.time_m2 += time_m2 + time_delta * time_delta * factor
+        self.comoment += comoment + time_delta * delta * factor
+        self.mean += delta * count / total
+        self.time_mean += time_delta * count / total
+        self.count = total
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        self.weight_sum += float(weights.sum())
+        self.weighted_sum += float(weights @ values)
+
+    @property
+    def variance(self):
+        return self.m2 / (self.count - 1) if self.count > 1 else math.nan
+
+    @property
+    def drift(self):
+        return self.comoment / self.time_m2 if self.time_m2 > 0 else math.nan
+
+    @property
+    def weighted_mean(self):
+        return self.weighted_sum / self.weight_sum if self.weight_sum > 0 else math.nan
+
+
+class QuantizedMedian:
+    """
+    Точная медиана потока значений, квантованных с шагом resolution.
+
+    Дальномер выдает расстояние с разрешением 1 мм, поэтому гистограмма
+    с шагом 1 мм хранит поток без потерь: добавление пачки — один вызов
+    np.bincount, память — один счетчик на миллиметр диапазона (40 м — 320 КБ),
+    запрос медианы — накопленная сумма по гистограмме. Ни то, ни другое не
+    зависит от числа измерений.
+    """
+
+    def __init__(self, resolution=0.001, max_value=1000.0):
+        self.resolution = resolution
+        self.max_index = int(round(max_value / resolution))
+        self.reset()
+
+    def reset(self):
+        self.counts = np.zeros(0, dtype=np.int64)
+        self.count = 0
+
+    def _indices(self, values):
+        indices = np.rint(np.asarray(values, dtype=np.float64) / self.resolution).astype(np.int64)
+        return np.clip(indices, 0, self.max_index, out=indices)
+
+    def add(self, value):
+        self.add_many((value,))
+
+    def add_many(self, values):
+        if len(values) == 0:
+            return
+        counts = np.bincount(self._indices(values))
+        if len(counts) > len(self.counts):
+            grown = np.zeros(max(len(counts), 2 * len(self.counts)), dtype=np.int64)
+            grown[:len(self.counts)] = self.counts
+            self.counts = grown
+        self.counts[:len(counts)] += counts
+        self.count += len(values)
+
+    @property
+    def value(self):
+        if self.count == 0:
+            return math.nan
+        cumulative = np.cumsum(self.counts)
+        lower, upper = np.searchsorted(cumulative, [(self.count - 1) // 2 + 1, self.count // 2 + 1])
+        return (lower + upper) / 2 * self.resolution
+
+
+class SlidingMedian:
+    """
+    Медиана последних size значений на двух кучах с ленивым удалением.
+
+    Нижняя половина — max-куча, верхняя — min-куча; значения упорядочены
+    парой (значение, номер), поэтому при равных значениях всегда известно,
+    в какой куче лежит удаляемый элемент. Вышедшие из окна элементы
+    помечаются и удаляются, когда оказываются на вершине; если кучи
+    разрастаются в несколько раз больше окна, они перестраиваются. Добавление —
+    O(log size), чтение медианы — O(1).
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self.reset()
+
+    def reset(self):
+        self._window = deque()
+        self._low = []      # (-значение, -номер): max-куча нижней половины
+        self._high = []     # (значение, номер): min-куча верхней половины
+        self._low_size = 0
+        self._high_size = 0
+        self._expired = set()
+        self._seq = 0
+
+    def __len__(self):
+        return len(self._window)
+
+    def _prune(self, heap, sign):
+        while heap and sign * heap[0][1] in self._expired:
+            self._expired.discard(sign * heapq.heappop(heap)[1])
+
+    def _low_top(self):
+        self._prune(self._low, -1)
+        return (-self._low[0][0], -self._low[0][1]) if self._low else None
+
+    def add(self, value):
+        key = (value, self._seq)
+        self._seq += 1
+        self._window.append(key)
+        low_top = self._low_top()
+        if low_top is not None and key <= low_top:
+            heapq.heappush(self._low, (-value, -key[1]))
+            self._low_size += 1
+        else:
+            heapq.heappush(self._high, key)
+            self._high_size += 1
+        if len(self._window) > self.size:
+            self._remove(self._window.popleft())
+        self._rebalance()
+        if len(self._low) + len(self._high) > 4 * self.size + 16:
+            self._compact()
+
+    def _remove(self, key):
+        low_top = self._low_top()
+        if low_top is not None and key <= low_top:
+            self._low_size -= 1
+        else:
+            self._high_size -= 1
+        self._expired.add(key[1])
+
+    def _rebalance(self):
+        while self._low_size > self._high_size + 1:
+            self._prune(self._low, -1)
+            value, seq = heapq.heappop(self._low)
+            heapq.heappush(self._high, (-value, -seq))
+            self._low_size -= 1
+            self._high_size += 1
+        while self._high_size > self._low_size:
+            self._prune(self._high, 1)
+            value, seq = heapq.heappop(self._high)
+            heapq.heappush(self._low, (-value, -seq))
+            self._high_size -= 1
+            self._low_size += 1
+        self._prune(self._low, -1)
+        self._prune(self._high, 1)
+
+    def rebuild(self, values):
+        """Заполняет окно последними size значениями массива (сортировка вместо поштучных вставок)."""
+        self.reset()
+        values = np.asarray(values, dtype=np.float64)[-self.size:].tolist()
+        keys = [(value, seq) for seq, value in enumerate(values)]
+        self._window.extend(keys)
+        self._seq = len(keys)
+        ordered = sorted(keys)
+        half = (len(ordered) + 1) // 2
+        self._low = [(-value, -seq) for value, seq in ordered[:half]]
+        self._high = ordered[half:]
+        heapq.heapify(self._low)
+        heapq.heapify(self._high)
+        self._low_size, self._high_size = half, len(ordered) - half
+
+    def _compact(self):
+        """Удаляет помеченные элементы из глубины куч (амортизированно O(1) на добавление)."""
+        self._low = [item for item in self._low if -item[1] not in self._expired]
+        self._high = [item for item in self._high if item[1] not in self._expired]
+        heapq.heapify(self._low)
+        heapq.heapify(self._high)
+        self._expired.clear()
+
+    @property
+    def value(self):
+        if not self._window:
+            return math.nan
+        self._prune(self._low, -1)
+        self._prune(self._high, 1)
+        if self._low_size > self._high_size:
+            return -self._low[0][0]
+        return (-self._low[0][0] + self._high[0][0]) / 2
+
+
+class SlidingWindowStats:
+    """
+    Статистика последних size измерений с обновлением за O(1).
+
+    Среднее, дисперсия, среднее с весом и наклон регрессии считаются по
+    скользящим суммам со сдвигом (значения и время отсчитываются от опорной
+    точки, чтобы не терять точность). Чтобы ошибки округления при вычитании
+    не накапливались, суммы раз в size обновлений пересчитываются по окну
+    заново (амортизированно O(1)). Минимум и максимум — монотонные очереди,
+    медиана — SlidingMedian. Пачка не короче окна заменяет окно целиком
+    векторным пересчетом.
+    """
+
+    def __init__(self, size):
+        if size <= 0:
+            raise ValueError("size должен быть положительным")
+        self.size = size
+        self.median = SlidingMedian(size)
+        self.reset()
+
+    def reset(self):
+        self._items = deque()         # (время, значение, вес)
+        self._minima = deque()        # (номер, значение) по возрастанию значений
+        self._maxima = deque()        # (номер, значение) по убыванию значений
+        self._seq = 0
+        self.median.reset()
+        self._recompute()
+
+    def __len__(self):
+        return len(self._items)
+
+    def _recompute(self):
+        """Точный пересчет сумм по текущему окну."""
+        self._updates = 0
+        if self._items:
+            data = np.array(self._items, dtype=np.float64)
+            self._time_ref, self._value_ref = float(data[0, 0]), float(data[0, 1])
+            t = data[:, 0] - self._time_ref
+            x = data[:, 1] - self._value_ref
+            w = data[:, 2]
+            self._sums = [float(x.sum()), float(x @ x), float(t.sum()), float(t @ t), float(t @ x),
+                          float(w.sum()), float(w @ x)]
+        else:
+            self._time_ref = self._value_ref = 0.0
+            self._sums = [0.0] * 7
+
+    def _accumulate(self, timestamp, value, weight, sign):
+        t = timestamp - self._time_ref
+        x = value - self._value_ref
+        sums = self._sums
+        sums[0] += sign * x
+        sums[1] += sign * x * x
+        sums[2] += sign * t
+        sums[3] += sign * t * t
+        sums[4] += sign * t * x
+        sums[5] += sign * weight
+        sums[6] += sign * weight * x
+
+    def add(self, timestamp, value, weight=1.0):
+        if not self._items:
+            self._time_ref, self._value_ref = timestamp, value
+        self._items.append((timestamp, value, weight))
+        self._accumulate(timestamp, value, weight, 1)
+        seq = self._seq
+        self._seq += 1
+        while self._minima and self._minima[-1][1] >= value:
+            self._minima.pop()
+        self._minima.append((seq, value))
+        while self._maxima and self._maxima[-1][1] <= value:
+            self._maxima.pop()
+        self._maxima.append((seq, value))
+        self.median.add(value)
+
+        if len(self._items) > self.size:
+            old = self._items.popleft()
+            self._accumulate(*old, -1)
+            first = seq - self.size + 1
+            if self._minima[0][0] < first:
+                self._minima.popleft()
+            if self._maxima[0][0] < first:
+                self._maxima.popleft()
+            self._updates += 1
+            if self._updates >= self.size:
+                self._recompute()
+
+    def add_many(self, timestamps, values, weights):
+        """Добавляет пачку массивов; стоимость не больше O(size log size) при любой длине пачки."""
+        timestamps = np.asarray(timestamps, dtype=np.float64)
+        values = np.asarray(values, dtype=np.float64)
+        weights = np.asarray(weights, dtype=np.float64)
+        if len(values) >= self.size:
+            self._rebuild(timestamps[-self.size:], values[-self.size:], weights[-self.size:])
+            return
+        for timestamp, value, weight in zip(timestamps.tolist(), values.tolist(), weights.tolist()):
+            self.add(timestamp, value, weight)
+
+    def _rebuild(self, timestamps, values, weights):
+        self._items = deque(zip(timestamps.tolist(), values.tolist(), weights.tolist()))
+        self._seq = len(values)
+        self._recompute()
+        self.median.rebuild(values)
+        # Монотонные очереди: остаются элементы строго меньше (больше) всех последующих
+        self._minima = self._monotonic(values, np.minimum, np.inf)
+        self._maxima = self._monotonic(values, np.maximum, -np.inf)
+
+    @staticmethod
+    def _monotonic(values, ufunc, fill):
+        following = np.empty_like(values)
+        following[-1] = fill
+        following[:-1] = ufunc.accumulate(values[::-1])[::-1][1:]
+        keep = values < following if ufunc is np.minimum else values > following
+        indices = np.flatnonzero(keep)
+        return deque(zip(indices.tolist(), values[indices].tolist()))
+
+    def snapshot(self):
+        n = len(self._items)
+        if n == 0:
+            return EMPTY_SNAPSHOT
+        sum_x, sum_xx, sum_t, sum_tt, sum_tx, sum_w, sum_wx = self._sums
+        mean = sum_x / n
+        variance = max(sum_xx - sum_x * mean, 0.0) / (n - 1) if n > 1 else math.nan
+        time_spread = sum_tt - sum_t * sum_t / n
+        drift = (sum_tx - sum_t * mean) / time_spread if time_spread > 0 else math.nan
+        weighted_mean = self._value_ref + sum_wx / sum_w if sum_w > 0 else math.nan
+        return StatisticsSnapshot(n, self._value_ref + mean, math.sqrt(variance), self._minima[0][1],
+                                  self._maxima[0][1], self.median.value, drift, weighted_mean)
+
+
+class MeasurementStatistics:
+    """
+    Статистика расстояния для MeasurementModel: окно последних window
+    измерений (SlidingWindowStats) и вся сессия (RunningStats, медиана —
+    QuantizedMedian). Вес для среднего по качеству — 1 / max(качество, 1):
+    у M703A меньшее значение качества означает более надежное измерение,
+    поэтому самые шумные измерения получают наименьший вес.
+
+    Измерения добавляются пачками массивов (add_many): сессионные
+    показатели объединяются векторно, а окно обходит не больше window
+    значений пачки, поэтому стоимость не зависит от длины истории.
+    Записи ошибок (расстояние NaN) в статистику не входят.
+    """
+
+    def __init__(self, window=100):
+        self.window = SlidingWindowStats(window)
+        self.session = RunningStats()
+        self.session_median = QuantizedMedian()
+
+    def reset(self):
+        self.window.reset()
+        self.session.reset()
+        self.session_median.reset()
+
+    def add(self, timestamp, distance, quality):
+        distance = float(distance)
+        if math.isnan(distance):
+            return
+        weight = 1.0 / max(float(quality), 1.0)
+        self.window.add(timestamp, distance, weight)
+        self.session.add(timestamp, distance, weight)
+        self.session_median.add(distance)
+
+    def add_many(self, timestamps, distances, qualities):
+        distances = np.asarray(distances, dtype=np.float64)
+        valid = np.isfinite(distances)
+        if not valid.all():
+            timestamps, distances, qualities = (np.asarray(timestamps)[valid], distances[valid],
+                                                np.asarray(qualities)[valid])
+        if len(distances) == 0:
+            return
+        weights = 1.0 / np.maximum(np.asarray(qualities, dtype=np.float64), 1.0)
+        self.window.add_many(timestamps, distances, weights)
+        self.session.add_many(timestamps, distances, weights)
+        self.session_median.add_many(distances)
+
+    def window_snapshot(self):
+        return self.window.snapshot()
+
+    def session_snapshot(self):
+        session = self.session
+        if session.count == 0:
+            return EMPTY_SNAPSHOT
+        return StatisticsSnapshot(session.count, session.mean, math.sqrt(session.variance), session.min,
+                                  session.max, self.session_median.value, session.drift, session.weighted_mean)
+
+    @classmethod
+    def from_store(cls, store, window=100, chunk_size=1 << 20):
+        """Статистика по готовому хранилищу (например, сессии из файла), кусками по chunk_size."""
+        statistics = cls(window)
+        timestamps, distances, qualities = store.timestamps(), store.distances(), store.qualities()
+        for start in range(0, len(store), chunk_size):
+            end = start + chunk_size
+            statistics.add_many(timestamps[start:end], distances[start:end], qualities[start:end])
+        return statistics
@@ -0,0 +1,81 @@
+import os
+import struct
+
+import numpy as np
+
+# Формат файла сессии (.bin):
+#   заголовок HEADER_SIZE байт, затем записи фиксированной длины RECORD_DTYPE.
+# Запись ошибки датчика: distance = NaN, quality = 0, error_code = номер :ErXX!.
+# Служебные записи (разрыв связи с датчиком) оформлены так же, но с кодами
+# от SERVICE_CODE_BASE, которые не пересекаются с кодами датчика.
+
+MAGIC = b'LIDARSES'
+FORMAT_VERSION = 1
+HEADER_SIZE = 64
+
+SERVICE_CODE_BASE = 0xFF00
+EVENT_LINK_LOST = SERVICE_CODE_BASE          # Связь с датчиком потеряна
+EVENT_LINK_RESTORED = SERVICE_CODE_BASE + 1  # Связь восстановлена, запись продолжена
+# magic, версия формата, размер записи, время создания, серийный номер, версия ПО модуля
+HEADER_STRUCT = struct.Struct('<8sHHd16s8s')
+
+RECORD_DTYPE = np.dtype([
+    ('timestamp', '<f8'),
+    ('distance', '<f4'),
+    ('quality', '<u2'),
+    ('error_code', '<u2'),
+])
+RECORD_SIZE = RECORD_DTYPE.itemsize  # 16 байт
+
+
+class SessionFormatError(ValueError):
+    """Файл не является файлом сессии или имеет неподдерживаемый формат."""
+
+
+def pack_header(serial='', version='', created=0.0):
+    """Формирует заголовок файла сессии."""
+    header = HEADER_STRUCT.pack(MAGIC, FORMAT_VERSION, RECORD_SIZE, created,
+                                serial.encode('ascii', errors='replace')[:16],
+                                version.encode('ascii', errors='replace')[:8])
+    return header.ljust(HEADER_SIZE, b'\x00')
+
+
+def unpack_header(data):
+    """
+    Разбирает заголовок файла сессии.
+
+    Returns:
+        dict: created, serial, version.
+
+    Raises:
+        SessionFormatError: Если заголовок поврежден или версия не поддерживается.
+    """
+    if len(data) < HEADER_SIZE:
+        raise SessionFormatError("Файл короче заголовка сессии")
+    magic, format_version, record_size, created, serial, version = HEADER_STRUCT.unpack_from(data)
+    if magic != MAGIC:
+        raise SessionFormatError("Неверная сигнатура файла сессии")
+    if format_version != FORMAT_VERSION or record_size != RECORD_SIZE:
+        raise SessionFormatError(f"Неподдерживаемая версия формата: {format_version} (запись {record_size} байт)")
+    return {
+        'created': created,
+        'serial': serial.rstrip(b'\x00').decode('ascii', errors='replace'),
+        'version': version.rstrip(b'\x00').decode('ascii', errors='replace'),
+    }
+
+
+def recover_session_file(path):
+    """
+    Проверяет заголовок и отсекает неполную последнюю запись (после аварийного завершения).
+
+    Returns:
+        tuple: (header, record_count, truncated_bytes).
+    """
+    with open(path, 'r+b') as f:
+        header = unpack_header(f.read(HEADER_SIZE))
+        size = os.fstat(f.fileno()).st_size
+        record_count = (size - HEADER_SIZE) // RECORD_SIZE
+        valid_size = HEADER_SIZE + record_count * RECORD_SIZE
+        if valid_size < size:
+            f.truncate(valid_size)
+        return header, record_count, size - valid_size
@@ -0,0 +1,171 @@
+import os
+
+import numpy as np
+
+from .session_format import (HEADER_SIZE, RECORD_DTYPE, RECORD_SIZE, EVENT_LINK_LOST, EVENT_LINK_RESTORED,
+                             unpack_header)
+
+
+class SessionReader:
+    """
+    Чтение файла сессии через отображение в память (np.memmap).
+
+    Файл не загружается целиком: открытие выполняется за постоянное время,
+    а страницы с данными подгружаются операционной системой по мере обращения.
+    Записи доступны как структурированный массив RECORD_DTYPE; выборка по
+    интервалу времени выполняется двоичным поиском по колонке timestamp
+    (записи в файле идут в порядке поступления).
+
+    Неполная последняя запись (файл пишется или запись была прервана)
+    игнорируется; сам файл при чтении не изменяется.
+    """
+
+    def __init__(self, path):
+        """
+        Args:
+            path (str): Путь к файлу сессии.
+
+        Raises:
+            SessionFormatError: Если файл не является файлом сессии.
+        """
+        self.path = path
+        with open(path, 'rb') as f:
+            self.header = unpack_header(f.read(HEADER_SIZE))
+        count = (os.path.getsize(path) - HEADER_SIZE) // RECORD_SIZE
+        if count > 0:
+            self.records = np.memmap(path, dtype=RECORD_DTYPE, mode='r', offset=HEADER_SIZE, shape=(count,))
+        else:
+            self.records = np.empty(0, dtype=RECORD_DTYPE)
+
+    @property
+    def serial(self):
+        return self.header['serial']
+
+    @property
+    def version(self):
+        return self.header['version']
+
+    @property
+    def created(self):
+        return self.header['created']
+
+    def __len__(self):
+        return len(self.records)
+
+    def __getitem__(self, index):
+        return self.records[index]
+
+    @property
+    def timestamps(self):
+        return self.records['timestamp']
+
+    @property
+    def distances(self):
+        return self.records['distance']
+
+    @property
+    def qualities(self):
+        return self.records['quality']
+
+    @property
+    def error_codes(self):
+        return self.records['error_code']
+
+    def index_range(self, start_time=None, end_time=None):
+        """
+        Границы записей с временем в интервале [start_time, end_time].
+
+        Returns:
+            tuple: (i0, i1) — срез records[i0:i1].
+        """
+        timestamps = self.timestamps
+        i0 = 0 if start_time is None else int(np.searchsorted(timestamps, start_time, side='left'))
+        i1 = len(timestamps) if end_time is None else int(np.searchsorted(timestamps, end_time, side='right'))
+        return i0, max(i0, i1)
+
+    def time_slice(self, start_time=None, end_time=None):
+        """Записи в интервале времени (представление без копирования)."""
+        i0, i1 = self.index_range(start_time, end_time)
+        return self.records[i0:i1]
+
+    def link_gaps(self):
+        """
+        Разрывы связи с датчиком, отмеченные при записи.
+
+        Returns:
+            list: Пары (время потери, время восстановления или None, если
+                запись закончилась до восстановления).
+        """
+        codes = self.error_codes
+        events = np.flatnonzero((codes == EVENT_LINK_LOST) | (codes == EVENT_LINK_RESTORED))
+        gaps = []
+        for index in events.tolist():
+            timestamp = float(self.timestamps[index])
+            if codes[index] == EVENT_LINK_LOST:
+                gaps.append((timestamp, None))
+            elif gaps and gaps[-1][1] is None:
+                gaps[-1] = (gaps[-1][0], timestamp)
+        return gaps
+
+    def close(self):
+        """
+        Освобождает отображение файла.
+
+        Отображение не закрывается явно: представления, полученные из
+        timestamps, distances или time_slice (экспорт, таблица), могут еще
+        использоваться. Файл отображается до удаления последнего из них.
+        """
+        self.records = np.empty(0, dtype=RECORD_DTYPE)
+
+
+class SessionFileStore:
+    """
+    Хранилище только для чтения поверх SessionReader.
+
+    Реализует интерфейс чтения MeasurementStore (len, total_count,
+    timestamps/distances/qualities), поэтому таблица и график просматривают
+    записанную сессию без загрузки в память. Записи ошибок датчика
+    отображаются строками с расстоянием NaN.
+    """
+
+    capacity = None
+    read_only = True
+
+    def __init__(self, reader):
+        self.reader = reader
+
+    def __len__(self):
+        return len(self.reader)
+
+    @property
+    def total_count(self):
+        return len(self.reader)
+
+    @property
+    def nbytes(self):
+        return 0  # Данные не копируются в память процесса
+
+    def _window(self, count):
+        size = len(self.reader)
+        return size if count is None else max(0, min(count, size))
+
+    def timestamps(self, count=None):
+        return self.reader.timestamps[len(self.reader) - self._window(count):]
+
+    def distances(self, count=None):
+        return self.reader.distances[len(self.reader) - self._window(count):]
+
+    def qualities(self, count=None):
+        return self.reader.qualities[len(self.reader) - self._window(count):]
+
+    def error_codes(self, count=None):
+        return self.reader.error_codes[len(self.reader) - self._window(count):]
+
+    def append(self, timestamp, distance, quality):
+        raise TypeError("Сессия из файла доступна только для чтения")
+
+    def extend(self, timestamps, distances, qualities):
+        raise TypeError("Сессия из файла доступна только для чтения")
+
+    def clear(self):
+        raise TypeError("Сессия из файла доступна только для чтения")
@@ -0,0 +1,300 @@
+import logging
+import os
+import queue
+import threading
+import time
+
+import numpy as np
+
+from .session_format import HEADER_SIZE, RECORD_DTYPE, RECORD_SIZE, pack_header, recover_session_file
+
+
+class SessionRecorder:
+    """
+    Потоковая запись сессии измерений в бинарный файл.
+
+    Записи фиксированной длины (время, расстояние, качество, код ошибки)
+    только дописываются в конец файла. Вызовы write_* из потока измерений
+    лишь кладут кортеж в очередь; преобразование в бинарный вид, запись
+    через буфер и периодический fsync выполняет отдельный поток, поэтому
+    запись не добавляет задержек в тракт измерений.
+
+    Если файл уже существует, запись продолжается в конец; неполная
+    последняя запись, оставшаяся после аварийного завершения, отсекается.
+
+    При ошибке ввода-вывода поток записи завершается: сообщение сохраняется
+    в error и передается в on_failed (вызывается из потока записи), очередь
+    освобождается, а write_* больше не принимают записи.
+    """
+
+    _STOP = object()
+
+    def __init__(self, path, serial='', version='', fsync_interval=1.0, buffer_size=1 << 16, on_failed=None):
+        """
+        Args:
+            path (str): Путь к файлу сессии.
+            serial (str): Серийный номер модуля (из ответа на команду V).
+            version (str): Версия ПО модуля (из ответа на команду V).
+            fsync_interval (float): Период сброса данных на диск, сек.
+            buffer_size (int): Размер буфера записи, байт.
+            on_failed (callable, optional): Вызывается с сообщением об ошибке,
+                если поток записи остановлен ошибкой ввода-вывода.
+        """
+        self.path = path
+        self.serial = serial
+        self.version = version
+        self.fsync_interval = fsync_interval
+        self.buffer_size = buffer_size
+        self.records_written = 0
+        self.recovered_bytes = 0
+        self.on_failed = on_failed
+        self.error = None  # Сообщение об ошибке, остановившей запись
+        self.logger = logging.getLogger(__name__)
+
+        self._queue = queue.SimpleQueue()
+        self._file = None
+        self._thread = None
+
+    @property
+    def is_recording(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def failed(self):
+        return self.error is not None
+
+    def start(self):
+        """Открывает файл (создает с заголовком или восстанавливает) и запускает поток записи."""
+        if self.is_recording:
+            return
+        if os.path.exists(self.path) and os.path.getsize(self.path) > 0:
+            header, count, self.recovered_bytes = recover_session_file(self.path)
+            self.serial, self.version = header['serial'], header['version']
+            self.records_written = count
+            if self.recovered_bytes:
+                self.logger.warning(f"Отсечена неполная запись ({self.recovered_bytes} байт) в {self.path}")
+            self.logger.info(f"Продолжение записи сессии {self.path} ({count} записей)")
+            self._file = open(self.path, 'ab', buffering=self.buffer_size)
+        else:
+            self._file = open(self.path, 'wb', buffering=self.buffer_size)
+            self._file.write(pack_header(self.serial, self.version, time.time()))
+            self._sync()
+            self.logger.info(f"Начата запись сессии {self.path}")
+
+        self._thread = threading.Thread(target=self._run, name="SessionRecorder", daemon=True)
+        self._thread.start()
+
+    def write_measurement(self, timestamp, distance, quality):
+        """Ставит в очередь запись измерения; False, если запись остановлена ошибкой."""
+        if self.error is not None:
+            return False
+        self._queue.put((timestamp, distance, quality, 0))
+        return True
+
+    def write_error(self, timestamp, code):
+        """Ставит в очередь запись ошибки датчика (:ErXX!); False, если запись остановлена ошибкой."""
+        if self.error is not None:
+            return False
+        self._queue.put((timestamp, np.nan, 0, code))
+        return True
+
+    def write_records(self, records):
+        """Ставит в очередь готовый массив RECORD_DTYPE; False, если запись остановлена ошибкой."""
+        if self.error is not None:
+            return False
+        self._queue.put(records)
+        return True
+
+    def stop(self, timeout=5.0):
+        """Дописывает очередь, сбрасывает данные на диск и закрывает файл."""
+        if self._thread is None:
+            return
+        if self._thread.is_alive():  # После ошибки поток уже завершен
+            self._queue.put(self._STOP)
+        self._thread.join(timeout)
+        if self._thread.is_alive():
+            self.logger.error("Поток записи сессии не завершился вовремя.")
+            return
+        self._thread = None
+        try:
+            if self.error is None:
+                self._sync()
+            self._file.close()
+        except OSError as e:
+            self.logger.error(f"Ошибка при закрытии сессии {self.path}: {e}")
+        self._file = None
+        self.logger.info(f"Запись сессии {self.path} завершена ({self.records_written} записей)")
+
+    def _run(self):
+        last_sync = time.monotonic()
+        running = True
+        while running:
+            pending = []
+            try:
+                item = self._queue.get(timeout=self.fsync_interval)
+                while True:
+                    if item is self._STOP:
+                        running = False
+                        break
+                    pending.append(item)
+                    item = self._queue.get_nowait()
+            except queue.Empty:
+                pass
+
+            if pending:
+                try:
+                    self._write(pending)
+                except OSError as e:
+                    self._fail(f"Ошибка записи сессии {self.path}: {e}")
+                    return
+
+            now = time.monotonic()
+            if now - last_sync >= self.fsync_interval:
+                try:
+                    self._sync()
+                except OSError as e:
+                    self._fail(f"Ошибка сброса сессии {self.path} на диск: {e}")
+                    return
+                last_sync = now
+
+    def _fail(self, message):
+        """Останавливает прием записей после ошибки ввода-вывода и сообщает о ней."""
+        self.logger.error(message)
+        self.error = message
+        # Записи, поставленные до ошибки, уже не будут записаны
+        try:
+            while True:
+                self._queue.get_nowait()
+        except queue.Empty:
+            pass
+        if self.on_failed is not None:
+            self.on_failed(message)
+
+    def _write(self, pending):
+        """Преобразует накопленные записи одним массивом и пишет их в файл."""
+        rows = [item for item in pending if isinstance(item, tuple)]
+        if len(rows) == len(pending):
+            chunks = [np.array(rows, dtype=RECORD_DTYPE)]
+        else:
+            # Сохраняем порядок поступления одиночных записей и готовых массивов
+            chunks = [item if not isinstance(item, tuple) else np.array([item], dtype=RECORD_DTYPE)
+                      for item in pending]
+        for chunk in chunks:
+            self._file.write(chunk.tobytes())
+            self.records_written += len(chunk)
+
+    def _sync(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+
+class RotatingSessionRecorder:
+    """
+    Запись сессии с ротацией файлов по размеру и/или по времени.
+
+    Интерфейс записи тот же, что у SessionRecorder. Файлы получают имена
+    <основа>_<ГГГГММДД-ЧЧММСС><расширение> по времени открытия; без
+    ограничений ротации запись идет в один файл с исходным именем.
+    """
+
+    def __init__(self, path, serial='', version='', max_bytes=None, max_seconds=None, **recorder_options):
+        """
+        Args:
+            path (str): Базовый путь файла сессии.
+            serial (str): Серийный номер модуля.
+            version (str): Версия ПО модуля.
+            max_bytes (int, optional): Размер файла, после которого начинается новый.
+            max_seconds (float, optional): Длительность файла, после которой начинается новый.
+            **recorder_options: Параметры SessionRecorder (fsync_interval, buffer_size).
+        """
+        self.path = path
+        self.serial = serial
+        self.version = version
+        self.max_bytes = max_bytes
+        self.max_seconds = max_seconds
+        self.recorder_options = recorder_options
+        self.files = []            # Пути всех открытых файлов по порядку
+        self.records_written = 0   # Записи в закрытых файлах + поставленные в очередь текущего
+        self.recorder = None
+        self.logger = logging.getLogger(__name__)
+
+        self._file_records = 0
+        self._opened_at = 0.0
+
+    @property
+    def rotating(self):
+        return bool(self.max_bytes or self.max_seconds)
+
+    @property
+    def is_recording(self):
+        return self.recorder is not None and self.recorder.is_recording
+
+    @property
+    def error(self):
+        """Сообщение об ошибке, остановившей запись текущего файла, или None."""
+        return self.recorder.error if self.recorder is not None else None
+
+    def _next_path(self):
+        if not self.rotating:
+            return self.path
+        base, ext = os.path.splitext(self.path)
+        stamp = time.strftime('%Y%m%d-%H%M%S')
+        path = f"{base}_{stamp}{ext}"
+        index = 1
+        while path in self.files or os.path.exists(path):
+            path = f"{base}_{stamp}-{index}{ext}"
+            index += 1
+        return path
+
+    def start(self):
+        """Открывает первый (или очередной) файл сессии."""
+        if self.is_recording:
+            return
+        self.recorder = SessionRecorder(self._next_path(), self.serial, self.version, **self.recorder_options)
+        self.recorder.start()
+        self.files.append(self.recorder.path)
+        self._file_records = self.recorder.records_written
+        self._opened_at = time.monotonic()
+
+    def rotate(self):
+        """Закрывает текущий файл и начинает новый."""
+        self.stop()
+        self.start()
+
+    def _check_rotation(self):
+        if self.max_bytes and HEADER_SIZE + self._file_records * RECORD_SIZE >= self.max_bytes:
+            self.rotate()
+        elif self.max_seconds and time.monotonic() - self._opened_at >= self.max_seconds:
+            self.rotate()
+
+    def _count(self, count):
+        self._file_records += count
+        self.records_written += count
+
+    def write_measurement(self, timestamp, distance, quality):
+        self._check_rotation()
+        if not self.recorder.write_measurement(timestamp, distance, quality):
+            return False
+        self._count(1)
+        return True
+
+    def write_error(self, timestamp, code):
+        self._check_rotation()
+        if not self.recorder.write_error(timestamp, code):
+            return False
+        self._count(1)
+        return True
+
+    def write_records(self, records):
+        self._check_rotation()
+        if not self.recorder.write_records(records):
+            return False
+        self._count(len(records))
+        return True
+
+    def stop(self, timeout=5.0):
+        """Дописывает и закрывает текущий файл."""
+        if self.recorder is None:
+            return
+        self.recorder.stop(timeout)
+        self.recorder = None
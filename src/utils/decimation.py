@@ -0,0 +1,246 @@
+# src/utils/decimation.py
+
+import numpy as np
+
+
+def _nan_argmin(values, axis=None):
+    """argmin, пропускающий NaN (записи ошибок); для строк из одних NaN — индекс 0."""
+    return np.argmin(np.where(np.isnan(values), np.inf, values), axis=axis)
+
+
+def _nan_argmax(values, axis=None):
+    """argmax, пропускающий NaN (записи ошибок); для строк из одних NaN — индекс 0."""
+    return np.argmax(np.where(np.isnan(values), -np.inf, values), axis=axis)
+
+
+def minmax_decimate(x, y, buckets):
+    """
+    Прореживает ряд до ~2 * buckets точек, сохраняя минимум и максимум каждой корзины.
+
+    В отличие от простого шага по индексу, выбросы и провалы остаются видимыми
+    на графике. Точки каждой корзины возвращаются в порядке следования по x.
+
+    Args:
+        x (numpy.ndarray): Значения по оси X (монотонные).
+        y (numpy.ndarray): Значения по оси Y.
+        buckets (int): Количество корзин (обычно ширина графика в пикселях).
+
+    Returns:
+        tuple: (x, y) — прореженные массивы; если точек мало, исходные массивы.
+    """
+    count = len(x)
+    buckets = max(1, int(buckets))
+    if count <= 2 * buckets:
+        return x, y
+
+    size = -(-count // buckets)  # Размер корзины с округлением вверх
+    full = count // size
+    rows = np.arange(full)
+    y_blocks = y[:full * size].reshape(full, size)
+    first = rows * size
+    indices = [first + _nan_argmin(y_blocks, axis=1), first + _nan_argmax(y_blocks, axis=1)]
+    if full * size < count:
+        tail = np.arange(full * size, count)
+        indices.append([tail[_nan_argmin(y[tail])], tail[_nan_argmax(y[tail])]])
+    # Повторы (min == max) не мешают отрисовке, поэтому не удаляются
+    order = np.sort(np.concatenate([np.asarray(i, dtype=np.intp) for i in indices]))
+    return x[order], y[order]
+
+
+class _Level:
+    """Уровень пирамиды: для каждого блока время начала и положения min/max."""
+
+    COLUMNS = ('t_start', 't_min', 'y_min', 't_max', 'y_max')
+
+    def __init__(self, initial_size=256):
+        self.count = 0
+        self._columns = {name: np.empty(initial_size, dtype=np.float64) for name in self.COLUMNS}
+
+    def __getitem__(self, name):
+        return self._columns[name][:self.count]
+
+    def extend(self, values):
+        added = len(values['t_start'])
+        required = self.count + added
+        if required > len(self._columns['t_start']):
+            new_size = max(required, 2 * len(self._columns['t_start']))
+            for name, column in self._columns.items():
+                grown = np.empty(new_size, dtype=np.float64)
+                grown[:self.count] = column[:self.count]
+                self._columns[name] = grown
+        for name in self.COLUMNS:
+            self._columns[name][self.count:required] = values[name]
+        self.count = required
+
+
+class MinMaxPyramid:
+    """
+    Многоуровневая пирамида min/max для быстрого отображения длинной истории.
+
+    Уровень k хранит по одному блоку на factor**k исходных измерений: время
+    начала блока и положения минимума и максимума. Пирамида пополняется
+    инкрементально (update() обрабатывает только новые измерения), а запрос
+    query() для любого окна времени выбирает самый детальный уровень, при
+    котором число точек не превышает заданного (обычно 2 × ширина графика
+    в пикселях). Поэтому масштабирование и прокрутка по миллионам точек
+    стоят O(ширины графика), а не O(числа измерений).
+
+    Уровни хранятся независимо от исходного хранилища, так что при кольцевом
+    буфере обзор всей сессии остается доступен в огрубленном виде.
+    """
+
+    def __init__(self, factor=4):
+        if factor < 2:
+            raise ValueError("factor должен быть не меньше 2")
+        self.factor = factor
+        self.levels = []
+        self._store = None
+        self.clear()
+
+    def clear(self):
+        """Удаляет все уровни."""
+        self.levels = []
+        self._count = 0  # Сколько исходных измерений учтено
+        self._pending_t = np.empty(0, dtype=np.float64)  # Измерения неполного блока уровня 1
+        self._pending_y = np.empty(0, dtype=np.float64)
+        self.origin = None  # Время первого измерения сессии
+
+    def update(self, store):
+        """
+        Добавляет в пирамиду измерения, появившиеся в хранилище с прошлого вызова.
+
+        Args:
+            store (MeasurementStore): Хранилище измерений.
+        """
+        total = store.total_count
+        if store is not self._store or total < self._count:
+            # Хранилище очищено или заменено (например, открыта сессия из файла)
+            self.clear()
+            self._store = store
+        new = total - self._count
+        if new == 0:
+            return
+        available = min(new, len(store))  # Вытесненные из кольца измерения уже недоступны
+        timestamps = store.timestamps(available)
+        distances = store.distances(available)
+        self._count = total
+        if self.origin is None and available:
+            self.origin = float(timestamps[0])
+
+        t = np.concatenate((self._pending_t, timestamps))
+        y = np.concatenate((self._pending_y, distances))
+        blocks = len(t) // self.factor
+        used = blocks * self.factor
+        if blocks:
+            t_blocks = t[:used].reshape(blocks, self.factor)
+            y_blocks = y[:used].reshape(blocks, self.factor)
+            rows = np.arange(blocks)
+            i_min = _nan_argmin(y_blocks, axis=1)
+            i_max = _nan_argmax(y_blocks, axis=1)
+            self._append(0, {
+                't_start': t_blocks[:, 0],
+                't_min': t_blocks[rows, i_min], 'y_min': y_blocks[rows, i_min],
+                't_max': t_blocks[rows, i_max], 'y_max': y_blocks[rows, i_max],
+            })
+        self._pending_t = t[used:].copy()
+        self._pending_y = y[used:].copy()
+
+    def _append(self, index, values):
+        """Добавляет блоки на уровень index и сворачивает полные группы на уровень выше."""
+        if index == len(self.levels):
+            self.levels.append(_Level())
+        level = self.levels[index]
+        level.extend(values)
+
+        consumed = self.levels[index + 1].count * self.factor if index + 1 < len(self.levels) else 0
+        groups = (level.count - consumed) // self.factor
+        if groups == 0:
+            return
+        end = consumed + groups * self.factor
+        block = {name: level[name][consumed:end].reshape(groups, self.factor) for name in _Level.COLUMNS}
+        rows = np.arange(groups)
+        i_min = _nan_argmin(block['y_min'], axis=1)
+        i_max = _nan_argmax(block['y_max'], axis=1)
+        self._append(index + 1, {
+            't_start': block['t_start'][:, 0],
+            't_min': block['t_min'][rows, i_min], 'y_min': block['y_min'][rows, i_min],
+            't_max': block['t_max'][rows, i_max], 'y_max': block['y_max'][rows, i_max],
+        })
+
+    def query(self, store, t0, t1, max_points):
+        """
+        Возвращает точки окна [t0, t1] в разрешении, достаточном для max_points.
+
+        Args:
+            store (MeasurementStore): Хранилище с исходными измерениями.
+            t0 (float): Начало окна (абсолютное время).
+            t1 (float): Конец окна (абсолютное время).
+            max_points (int): Допустимое число точек (обычно 2 × ширина в пикселях).
+
+        Returns:
+            tuple: (timestamps, distances) — массивы для отрисовки.
+        """
+        timestamps = store.timestamps()
+        distances = store.distances()
+        i0 = int(np.searchsorted(timestamps, t0, side='left'))
+        i1 = int(np.searchsorted(timestamps, t1, side='right'))
+        # Исходных данных достаточно, если начало окна не вытеснено из кольцевого буфера
+        raw_complete = len(store) == store.total_count or (len(timestamps) > 0 and timestamps[0] <= t0)
+        if raw_complete and i1 - i0 <= max_points:
+            # Исходные данные помещаются целиком — отдаем представления хранилища
+            return timestamps[i0:i1], distances[i0:i1]
+
+        # Самый детальный уровень, у которого в окне не больше max_points точек
+        chosen = len(self.levels) - 1
+        for index, level in enumerate(self.levels):
+            j0, j1 = self._level_window(level, t0, t1)
+            if 2 * (j1 - j0) <= max_points:
+                chosen = index
+                break
+        if chosen < 0:
+            return minmax_decimate(timestamps[i0:i1], distances[i0:i1], max_points // 2)
+
+        segments_t = []
+        segments_y = []
+        level = self.levels[chosen]
+        j0, j1 = self._level_window(level, t0, t1)
+        self._collect(level, j0, j1, segments_t, segments_y)
+        # Хвост: неполные группы более детальных уровней и неполный блок
+        for index in range(chosen - 1, -1, -1):
+            finer = self.levels[index]
+            start = self.levels[index + 1].count * self.factor
+            k0, k1 = self._level_window(finer, t0, t1)
+            self._collect(finer, max(k0, start), k1, segments_t, segments_y)
+        in_window = (self._pending_t >= t0) & (self._pending_t <= t1)
+        segments_t.append(self._pending_t[in_window])
+        segments_y.append(self._pending_y[in_window])
+
+        t = np.concatenate(segments_t)
+        y = np.concatenate(segments_y)
+        if len(t) > max_points:
+            return minmax_decimate(t, y, max_points // 2)
+        return t, y
+
+    @staticmethod
+    def _level_window(level, t0, t1):
+        starts = level['t_start']
+        j0 = max(0, int(np.searchsorted(starts, t0, side='right')) - 1)
+        j1 = int(np.searchsorted(starts, t1, side='right'))
+        return j0, j1
+
+    @staticmethod
+    def _collect(level, j0, j1, segments_t, segments_y):
+        """Добавляет по две точки (min и max в порядке времени) на каждый блок [j0, j1)."""
+        if j1 <= j0:
+            return
+        t_min, y_min = level['t_min'][j0:j1], level['y_min'][j0:j1]
+        t_max, y_max = level['t_max'][j0:j1], level['y_max'][j0:j1]
+        min_first = t_min <= t_max
+        t = np.empty(2 * (j1 - j0))
+        y = np.empty(2 * (j1 - j0))
+        t[0::2] = np.where(min_first, t_min, t_max)
+        t[1::2] = np.where(min_first, t_max, t_min)
+        y[0::2] = np.where(min_first, y_min, y_max)
+        y[1::2] = np.where(min_first, y_max, y_min)
+        segments_t.append(t)
+        segments_y.append(y)
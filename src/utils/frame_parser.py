@@ -0,0 +1,160 @@
+# src/utils/frame_parser.py
+
+import re
+from collections import namedtuple
+
+# --- Типизированные записи протокола JRT M703A ---
+# Ответ D/M/F: "12.345m,0079" — расстояние (м) и качество сигнала (меньше — лучше)
+DistanceFrame = namedtuple('DistanceFrame', ['distance', 'quality'])
+# Ответ ":Er05!" (или "Er.05!") — код ошибки измерения
+ErrorFrame = namedtuple('ErrorFrame', ['code'])
+# Ответ S: "18.0'C, 3.0V" — температура и напряжение питания
+StatusFrame = namedtuple('StatusFrame', ['temperature', 'voltage'])
+# Ответ V: "170225002929456" — серийный номер (10 цифр) и версия ПО (5 цифр)
+VersionFrame = namedtuple('VersionFrame', ['serial', 'version'])
+# Ответ O/C: ",OK!"
+AckFrame = namedtuple('AckFrame', [])
+
+# Коды ошибок из документации на модуль
+ERROR_CODES = {
+    1: "VBAT слишком низкий, напряжение питания должно быть >= 2.0V",
+    2: "Внутренняя ошибка",
+    3: "Температура модуля слишком низкая (<-20°C)",
+    4: "Температура модуля слишком высокая (>+40°C)",
+    5: "Цель вне диапазона измерения",
+    6: "Недействительный результат измерения",
+    7: "Фоновый свет слишком сильный",
+    8: "Лазерный сигнал слишком слабый",
+    9: "Лазерный сигнал слишком сильный",
+    10: "Аппаратная неисправность 1",
+    11: "Аппаратная неисправность 2",
+    12: "Аппаратная неисправность 3",
+    13: "Аппаратная неисправность 4",
+    14: "Аппаратная неисправность 5",
+    15: "Лазерный сигнал нестабилен",
+}
+
+
+def describe_error(code):
+    """Возвращает текстовое описание кода ошибки датчика."""
+    description = ERROR_CODES.get(code, "Неизвестная ошибка")
+    return f":Er{code:02d}! {description}"
+
+
+class FrameParser:
+    """
+    Потоковый (push) разборщик ответов датчика JRT M703A.
+
+    Принимает произвольные куски байт (частичные кадры, несколько кадров подряд,
+    перемешанные измерения, ошибки, статус и подтверждения) и возвращает все
+    полностью принятые записи. Незавершенный хвост хранится в заранее выделенном
+    bytearray и дополняется следующими кусками. Каждый байт просматривается
+    регулярным выражением один раз, а повторно — только хвост длиной не более
+    MAX_FRAME_LENGTH, поэтому стоимость разбора на байт не зависит от того,
+    какими кусками приходят данные.
+
+    Все кадры протокола самоограничены (заканчиваются на 4 цифры качества, '!',
+    'V' или 15-ю цифру версии), поэтому разделители строк не обязательны.
+    """
+
+    FRAME_PATTERN = re.compile(
+        rb"(?P<dist>\d{1,3}\.\d{1,4})m,(?P<qual>\d{4})"
+        rb"|:?Er\.?(?P<err>\d{2})!"
+        rb"|(?P<ack>,OK!)"
+        rb"|(?P<temp>-?\d{1,3}(?:\.\d+)?)'C,\s*(?P<volt>\d{1,2}(?:\.\d+)?)V"
+        rb"|(?P<serial>\d{10})(?P<sw>\d{5})"
+    )
+    WHITESPACE = b' \t\r\n\x00'
+    MAX_FRAME_LENGTH = 32  # Самый длинный кадр (статус) с запасом
+
+    def __init__(self, buffer_size=4096):
+        """
+        Args:
+            buffer_size (int): Размер внутреннего буфера; большие куски
+                разбираются частями этого размера.
+        """
+        if buffer_size <= 2 * self.MAX_FRAME_LENGTH:
+            raise ValueError(f"buffer_size должен быть больше {2 * self.MAX_FRAME_LENGTH}")
+        self._buffer = bytearray(buffer_size)
+        self._length = 0
+        self._step = buffer_size - self.MAX_FRAME_LENGTH
+        self.garbage_bytes = 0  # Байты, не относящиеся ни к одному кадру
+
+    @property
+    def pending(self):
+        """Количество байт незавершенного кадра в буфере."""
+        return self._length
+
+    def reset(self):
+        """Сбрасывает незавершенный кадр (например, после очистки буфера порта)."""
+        self._length = 0
+
+    def feed(self, data):
+        """
+        Добавляет кусок данных и возвращает список полностью принятых записей.
+
+        Args:
+            data (bytes | bytearray | memoryview): Очередной кусок из порта.
+
+        Returns:
+            list: Записи DistanceFrame / ErrorFrame / StatusFrame / VersionFrame / AckFrame
+                  в порядке поступления.
+        """
+        records = []
+        view = memoryview(data)
+        size = len(view)
+        offset = 0
+        while offset < size:
+            piece = view[offset:offset + self._step]
+            count = len(piece)
+            self._buffer[self._length:self._length + count] = piece
+            self._length += count
+            offset += count
+            self._scan(records)
+        return records
+
+    def _scan(self, records):
+        """Извлекает кадры из буфера и переносит незавершенный хвост в начало."""
+        buffer = self._buffer
+        end = self._length
+        pos = 0
+        search = self.FRAME_PATTERN.search
+        make_record = self._make_record
+
+        match = search(buffer, pos, end)
+        while match is not None:
+            start = match.start()
+            if start > pos:
+                self._count_garbage(pos, start)
+            records.append(make_record(match))
+            pos = match.end()
+            match = search(buffer, pos, end)
+
+        # Хвост после последнего разделителя строк может быть началом кадра
+        tail_start = max(pos,
+                         buffer.rfind(b'\n', pos, end) + 1,
+                         buffer.rfind(b'\r', pos, end) + 1,
+                         end - self.MAX_FRAME_LENGTH)
+        if tail_start > pos:
+            self._count_garbage(pos, tail_start)
+        tail_length = end - tail_start
+        buffer[0:tail_length] = buffer[tail_start:end]
+        self._length = tail_length
+
+    def _count_garbage(self, start, end):
+        """Учитывает байты между кадрами, не являющиеся пробельными символами."""
+        self.garbage_bytes += len(self._buffer[start:end].translate(None, self.WHITESPACE))
+
+    @staticmethod
+    def _make_record(match):
+        """Создает типизированную запись по совпавшей ветви шаблона."""
+        kind = match.lastgroup
+        if kind == 'qual':
+            return DistanceFrame(float(match.group('dist')), int(match.group('qual')))
+        if kind == 'err':
+            return ErrorFrame(int(match.group('err')))
+        if kind == 'ack':
+            return AckFrame()
+        if kind == 'volt':
+            return StatusFrame(float(match.group('temp')), float(match.group('volt')))
+        return VersionFrame(match.group('serial').decode('ascii'), match.group('sw').decode('ascii'))
@@ -0,0 +1,212 @@
+# src/utils/latency.py
+"""
+Измерение задержек по стадиям конвейера измерений.
+
+Стадии (время по монотонным часам time.perf_counter_ns):
+
+    parse        — разбор куска байт FrameParser (цикл AsyncSensor);
+    batching     — от чтения первых байт пачки до ее отправки в GUI-поток;
+    dispatch     — доставка пачки через очередь сигналов Qt;
+    controller   — от начала обработки пачки SensorController до сигнала измерения;
+    model        — DataController.add_measurements_batch (хранилище и запись сессии, на пачку);
+    refresh_wait — ожидание перерисовки (объединение RefreshScheduler);
+    redraw       — MainWidget.on_data_updated (таблица, индикаторы, график);
+    end_to_end   — от чтения байт до окончания перерисовки.
+
+Значения копятся в гистограммах с логарифмически-линейными корзинами (как
+в HdrHistogram): запись — O(1) без выделения памяти, относительная ошибка
+процентилей не больше 1/64. Пока TRACKER.enabled == False, точки измерения
+выполняют только одну проверку атрибута.
+"""
+
+import json
+import time
+
+SUB_BITS = 7                    # 128 корзин на первую октаву, далее по 64 на октаву
+SUB_COUNT = 1 << SUB_BITS
+HALF_COUNT = SUB_COUNT >> 1
+
+STAGES = (
+    ('parse', "разбор"),
+    ('batching', "накопление пачки"),
+    ('dispatch', "очередь сигналов"),
+    ('controller', "контроллер"),
+    ('model', "модель"),
+    ('refresh_wait', "ожидание перерисовки"),
+    ('redraw', "перерисовка"),
+    ('end_to_end', "чтение → экран"),
+)
+
+
+class LatencyHistogram:
+    """
+    Гистограмма задержек в наносекундах с логарифмически-линейными корзинами.
+
+    Значения до SUB_COUNT нс хранятся точно, далее каждая октава делится на
+    HALF_COUNT корзин. Значения выше max_value_ns учитываются в последней корзине.
+    """
+
+    def __init__(self, max_value_ns=1 << 37):
+        self.max_value_ns = max_value_ns
+        self._counts = [0] * (self._index(max_value_ns) + 1)
+        self.reset()
+
+    def reset(self):
+        for i in range(len(self._counts)):
+            self._counts[i] = 0
+        self.count = 0
+        self.total_ns = 0
+        self.min_ns = None
+        self.max_ns = 0
+
+    @staticmethod
+    def _index(value):
+        if value < SUB_COUNT:
+            return value if value > 0 else 0
+        shift = value.bit_length() - SUB_BITS
+        return SUB_COUNT + (shift - 1) * HALF_COUNT + (value >> shift) - HALF_COUNT
+
+    @staticmethod
+    def _value(index):
+        """Середина диапазона корзины index, нс."""
+        if index < SUB_COUNT:
+            return index
+        shift = (index - SUB_COUNT) // HALF_COUNT + 1
+        sub = (index - SUB_COUNT) % HALF_COUNT + HALF_COUNT
+        return (sub << shift) + (1 << (shift - 1))
+
+    def record(self, value_ns):
+        """Учитывает одно значение задержки (целое число наносекунд)."""
+        value = min(value_ns, self.max_value_ns)
+        self._counts[self._index(value)] += 1
+        self.count += 1
+        self.total_ns += value
+        if self.min_ns is None or value < self.min_ns:
+            self.min_ns = value
+        if value > self.max_ns:
+            self.max_ns = value
+
+    def percentile(self, percent):
+        """Значение процентиля percent (0–100) в наносекундах; 0, если данных нет."""
+        if self.count == 0:
+            return 0
+        target = max(1, -(-self.count * percent // 100))
+        seen = 0
+        for index, count in enumerate(self._counts):
+            seen += count
+            if seen >= target:
+                return min(self._value(index), self.max_ns)
+        return self.max_ns
+
+    def buckets(self):
+        """Непустые корзины: список (значение корзины, нс; количество)."""
+        return [(self._value(index), count) for index, count in enumerate(self._counts) if count]
+
+    def summary(self):
+        """Сводка в миллисекундах."""
+        if self.count == 0:
+            return {'count': 0}
+        return {
+            'count': self.count,
+            'min_ms': self.min_ns / 1e6,
+            'mean_ms': self.total_ns / self.count / 1e6,
+            'p50_ms': self.percentile(50) / 1e6,
+            'p95_ms': self.percentile(95) / 1e6,
+            'p99_ms': self.percentile(99) / 1e6,
+            'max_ms': self.max_ns / 1e6,
+        }
+
+
+class LatencyTracker:
+    """
+    Набор гистограмм по стадиям и состояние текущего измерения.
+
+    Все точки измерения, кроме parse/batching, вызываются в GUI-потоке
+    последовательно (сигнал измерения → DataController → RefreshScheduler),
+    поэтому время чтения текущей пачки и самого старого неотрисованного
+    измерения хранится в атрибутах, а не передается через сигналы.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.histograms = {name: LatencyHistogram() for name, _ in STAGES}
+        self.reset()
+
+    def enable(self, enabled=True):
+        """Включает или выключает сбор; при включении статистика сбрасывается."""
+        if enabled and not self.enabled:
+            self.reset()
+        self.enabled = enabled
+
+    def reset(self):
+        for histogram in self.histograms.values():
+            histogram.reset()
+        self.started = time.time()
+        self._current_read_ns = None   # Время чтения обрабатываемой пачки
+        self._pending_read_ns = None   # Время чтения самого старого неотрисованного измерения
+        self._pending_model_ns = None  # Время его записи в модель
+
+    def record(self, stage, value_ns):
+        self.histograms[stage].record(value_ns)
+
+    def begin_samples(self, read_ns):
+        """Начало обработки пачки (или одиночного ответа), прочитанной в read_ns."""
+        self._current_read_ns = read_ns
+
+    def sample_stored(self, start_ns):
+        """Измерения записаны в модель; start_ns — начало DataController.add_measurement(s_batch)."""
+        now = time.perf_counter_ns()
+        self.record('model', now - start_ns)
+        if self._pending_model_ns is None:
+            self._pending_model_ns = now
+            self._pending_read_ns = self._current_read_ns if self._current_read_ns is not None else start_ns
+
+    def view_refreshed(self, start_ns):
+        """Перерисовка завершена; start_ns — начало MainWidget.on_data_updated."""
+        now = time.perf_counter_ns()
+        self.record('redraw', now - start_ns)
+        if self._pending_model_ns is not None:
+            self.record('refresh_wait', start_ns - self._pending_model_ns)
+            self.record('end_to_end', now - self._pending_read_ns)
+            self._pending_model_ns = self._pending_read_ns = None
+
+    def to_dict(self, include_buckets=True):
+        """Сводка (и непустые корзины) по всем стадиям для сохранения в JSON."""
+        stages = {}
+        for name, description in STAGES:
+            histogram = self.histograms[name]
+            stage = {'description': description, **histogram.summary()}
+            if include_buckets and histogram.count:
+                stage['buckets_ns'] = histogram.buckets()
+            stages[name] = stage
+        return {'started': self.started, 'dumped': time.time(), 'stages': stages}
+
+    def dump_json(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+
+    def hud_text(self):
+        """Короткая строка для статусной строки."""
+        total = self.histograms['end_to_end']
+        if total.count == 0:
+            return "Задержка: нет данных"
+        # Стадия с наибольшим p95 (кроме сквозной) — кандидат на узкое место
+        slowest = max((name for name, _ in STAGES if name != 'end_to_end'),
+                      key=lambda name: self.histograms[name].percentile(95))
+        return (f"Задержка p50 {total.percentile(50) / 1e6:.1f} / p95 {total.percentile(95) / 1e6:.1f} / "
+                f"p99 {total.percentile(99) / 1e6:.1f} мс | max p95: {dict(STAGES)[slowest]} "
+                f"{self.histograms[slowest].percentile(95) / 1e6:.1f} мс")
+
+    def report_text(self):
+        """Таблица по всем стадиям (для всплывающей подсказки)."""
+        lines = [f"{'Стадия':<22} {'n':>8} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8} мс"]
+        for name, description in STAGES:
+            histogram = self.histograms[name]
+            lines.append(f"{description:<22} {histogram.count:>8} {histogram.percentile(50) / 1e6:>8.2f} "
+                         f"{histogram.percentile(95) / 1e6:>8.2f} {histogram.percentile(99) / 1e6:>8.2f} "
+                         f"{histogram.max_ns / 1e6:>8.2f}")
+        return "\n".join(lines)
+
+
+# Общий экземпляр для всех точек измерения приложения
+TRACKER = LatencyTracker()
@@ -0,0 +1,55 @@
+# src/utils/notification_throttle.py
+"""
+Дедупликация и ограничение частоты уведомлений пользователю.
+
+Одинаковое уведомление (по ключу, например коду ошибки) показывается не
+чаще раза в dedup_interval секунд, а всего показывается не больше
+max_notifications уведомлений за period секунд. Подавленные повторы
+считаются и сообщаются вместе со следующим показом этого ключа.
+"""
+
+import time
+from collections import deque
+
+
+class NotificationThrottle:
+    """Решает, показывать ли уведомление; O(1) на вызов."""
+
+    def __init__(self, dedup_interval=5.0, max_notifications=5, period=10.0):
+        """
+        Args:
+            dedup_interval (float): Минимальный интервал между показами одного ключа, сек.
+            max_notifications (int): Предел показов всех ключей за period.
+            period (float): Интервал общего предела, сек.
+        """
+        self.dedup_interval = dedup_interval
+        self.max_notifications = max_notifications
+        self.period = period
+        self.reset()
+
+    def reset(self):
+        self._last_shown = {}  # ключ -> время последнего показа
+        self._suppressed = {}  # ключ -> подавлено повторов после последнего показа
+        self._shown = deque()  # Время показов за period
+        self.suppressed_total = 0
+
+    def offer(self, key, now=None):
+        """
+        Предлагает уведомление с ключом key.
+
+        Returns:
+            int или None: None — не показывать; иначе число подавленных
+                повторов этого ключа с прошлого показа.
+        """
+        now = time.monotonic() if now is None else now
+        shown = self._shown
+        while shown and now - shown[0] >= self.period:
+            shown.popleft()
+        last = self._last_shown.get(key)
+        if (last is not None and now - last < self.dedup_interval) or len(shown) >= self.max_notifications:
+            self._suppressed[key] = self._suppressed.get(key, 0) + 1
+            self.suppressed_total += 1
+            return None
+        self._last_shown[key] = now
+        shown.append(now)
+        return self._suppressed.pop(key, 0)
@@ -0,0 +1,279 @@
+# src/utils/replay.py
+"""
+Запись и воспроизведение потока байт датчика.
+
+Источники воспроизведения:
+
+* файл захвата (CaptureWriter) — сырые куски байт из порта с отметками
+  времени, записанные AsyncSensor;
+* сырой лог без отметок времени — строки воспроизводятся с интервалом
+  raw_interval;
+* файл сессии (SessionRecorder) — измерения и ошибки снова превращаются
+  в строки протокола с исходными интервалами.
+
+ReplaySerialHandler подставляется в SensorController вместо SerialHandler:
+по командам F/M начинается воспроизведение, X ставит его на паузу, поэтому
+поток проходит через весь конвейер приложения (AsyncSensor, FrameParser,
+SensorController, DataController, представления).
+"""
+
+import math
+import struct
+import threading
+import time
+
+from .sensor_simulator import SimulatedM703A, SimulatedSerialHandler
+from ..models import session_format
+
+CAPTURE_MAGIC = b'LIDARCAP'
+CAPTURE_VERSION = 1
+CAPTURE_HEADER = struct.Struct('<8sHd')   # Сигнатура, версия, время создания (сек Unix)
+CHUNK_HEADER = struct.Struct('<dI')       # Время от начала захвата (сек), длина куска
+
+
+class CaptureWriter:
+    """
+    Запись сырого потока байт из порта с отметками времени.
+
+    Формат: заголовок CAPTURE_HEADER, далее куски CHUNK_HEADER + данные.
+    write() вызывается из потока чтения; файл буферизуется и закрывается
+    в close().
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'wb')
+        self._file.write(CAPTURE_HEADER.pack(CAPTURE_MAGIC, CAPTURE_VERSION, time.time()))
+        self._started = time.monotonic()
+        self._lock = threading.Lock()
+        self.bytes_written = 0
+
+    def write(self, data):
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.write(CHUNK_HEADER.pack(time.monotonic() - self._started, len(data)))
+            self._file.write(data)
+            self.bytes_written += len(data)
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+def capture_chunks(path):
+    """Генератор кусков (время от начала, байты) из файла захвата."""
+    with open(path, 'rb') as f:
+        magic, version, _ = CAPTURE_HEADER.unpack(f.read(CAPTURE_HEADER.size))
+        if magic != CAPTURE_MAGIC or version != CAPTURE_VERSION:
+            raise ValueError(f"Неподдерживаемый файл захвата: {path}")
+        while True:
+            header = f.read(CHUNK_HEADER.size)
+            if len(header) < CHUNK_HEADER.size:
+                return  # Конец файла (или оборванный последний кусок)
+            offset, length = CHUNK_HEADER.unpack(header)
+            data = f.read(length)
+            if len(data) < length:
+                return
+            yield offset, data
+
+
+def raw_chunks(path, raw_interval=0.125):
+    """Генератор строк сырого лога без отметок времени (одна строка на raw_interval сек)."""
+    with open(path, 'rb') as f:
+        for index, line in enumerate(f):
+            yield index * raw_interval, line
+
+
+def session_chunks(path, block_size=4096):
+    """Генератор строк протокола, восстановленных из файла сессии."""
+    from ..models.session_reader import SessionReader
+    reader = SessionReader(path)
+    try:
+        if len(reader) == 0:
+            return
+        origin = float(reader.timestamps[0])
+        for start in range(0, len(reader), block_size):
+            end = min(start + block_size, len(reader))
+            records = zip(reader.timestamps[start:end].tolist(), reader.distances[start:end].tolist(),
+                          reader.qualities[start:end].tolist(), reader.error_codes[start:end].tolist())
+            for timestamp, distance, quality, code in records:
+                if code >= session_format.SERVICE_CODE_BASE:
+                    continue  # Служебные записи (разрывы связи) датчик не передавал
+                if math.isnan(distance):
+                    line = f":Er{code:02d}!\r\n"
+                else:
+                    line = f"{distance:6.3f}m,{quality:04d}\r\n"
+                yield timestamp - origin, line.encode('ascii')
+    finally:
+        reader.close()
+
+
+def open_source(path, raw_interval=0.125):
+    """Определяет тип файла по сигнатуре и возвращает генератор кусков."""
+    with open(path, 'rb') as f:
+        magic = f.read(8)
+    if magic == CAPTURE_MAGIC:
+        return capture_chunks(path)
+    if magic == session_format.MAGIC:
+        return session_chunks(path)
+    return raw_chunks(path, raw_interval)
+
+
+class ReplayDevice(SimulatedM703A):
+    """
+    Модуль M703A, который вместо генерации измерений воспроизводит запись.
+
+    Команды O/C/S/V обрабатываются как в симуляторе; F/M запускают (или
+    продолжают) воспроизведение, X ставит его на паузу, D выдает один кусок.
+
+    При speed=None куски выдаются без задержек блоками до block_size байт,
+    но не быстрее, чем приложение вычитывает порт (backlog не больше
+    max_backlog), — так измеряется устойчивая, а не пиковая пропускная
+    способность.
+
+    Для расчета задержек устройство ведет отметки (время выдачи, число
+    измерений, выданных к этому моменту) в mark_times / mark_counts.
+    """
+
+    def __init__(self, output, source, speed=1.0, backlog=None, max_backlog=1 << 20,
+                 block_size=65536, **device_options):
+        """
+        Args:
+            output (callable): Функция передачи байт в порт.
+            source (iterable): Куски (время от начала записи, байты).
+            speed (float, optional): Множитель скорости; None — максимальная скорость.
+            backlog (callable, optional): Возвращает число непрочитанных байт в порту.
+            max_backlog (int): Предел непрочитанных байт при максимальной скорости.
+            block_size (int): Наибольший размер одной выдачи в порт.
+        """
+        super().__init__(output, **device_options)
+        self.source = iter(source)
+        self.speed = speed
+        self.backlog = backlog
+        self.max_backlog = max_backlog
+        self.block_size = block_size
+
+        self.finished = threading.Event()
+        self.mark_times = []   # Время выдачи (time.time(), как у отметок AsyncSensor)
+        self.mark_counts = []  # Накопленное число измерений после выдачи
+        self.samples_sent = 0
+        self.bytes_sent = 0
+        self.max_backlog_seen = 0
+        self._playing = False
+        self._resync = True
+        self._last_byte = b''
+
+    def _handle_command(self, command):
+        if command in ('F', 'M', 'D'):
+            with self._condition:
+                self._playing = True
+                self._single_shot = command == 'D'
+                self._resync = True
+                self._condition.notify_all()
+        elif command == 'X':
+            with self._condition:
+                self._playing = False
+                self._condition.notify_all()
+        else:
+            super()._handle_command(command)
+
+    def _run(self):
+        pending = next(self.source, None)
+        clock_start = offset_start = 0.0
+        while True:
+            with self._condition:
+                if not self._running:
+                    return
+                if not self._playing:
+                    self._condition.wait(0.5)
+                    continue
+                single = self._single_shot
+                if self._resync and pending is not None:
+                    # После паузы время записи отсчитывается от текущего момента
+                    clock_start, offset_start = time.monotonic(), pending[0]
+                    self._resync = False
+
+            if pending is None:
+                self.finished.set()
+                with self._condition:
+                    self._playing = False
+                continue
+
+            if self.backlog is not None:
+                waiting = self.backlog()
+                self.max_backlog_seen = max(self.max_backlog_seen, waiting)
+                if self.speed is None and waiting >= self.max_backlog:
+                    time.sleep(0.001)
+                    continue
+
+            now = time.monotonic()
+            if self.speed and not single:
+                delay = clock_start + (pending[0] - offset_start) / self.speed - now
+                if delay > 0:
+                    with self._condition:
+                        self._condition.wait(min(delay, 0.5))
+                    continue
+
+            block = []
+            size = 0
+            while pending is not None and size < self.block_size:
+                if self.speed and not single and clock_start + (pending[0] - offset_start) / self.speed > now:
+                    break
+                block.append(pending[1])
+                size += len(pending[1])
+                pending = next(self.source, None)
+                if single:
+                    break
+            self._emit(b''.join(block))
+            if single:
+                with self._condition:
+                    self._playing = False
+
+    def _emit(self, data):
+        """Выдает блок в порт и добавляет отметку для расчета задержек."""
+        # Измерение считается выданным по маркеру 'm,' (с учетом разрыва между кусками)
+        self.samples_sent += (self._last_byte + data).count(b'm,')
+        self._last_byte = data[-1:]
+        self.bytes_sent += len(data)
+        self.mark_times.append(time.time())
+        self.mark_counts.append(self.samples_sent)
+        self.output(data)
+        self.frames_sent += 1
+
+
+class ReplaySerialHandler(SimulatedSerialHandler):
+    """
+    Обработчик порта, воспроизводящий запись через интерфейс SerialHandler.
+
+    Args:
+        path (str): Файл захвата, сырой лог или файл сессии.
+        speed (float, optional): Множитель скорости (1.0 — реальное время);
+            None — максимальная скорость.
+        raw_interval (float): Интервал строк сырого лога без отметок времени, сек.
+    """
+
+    def __init__(self, path, speed=1.0, raw_interval=0.125, max_backlog=1 << 20, **handler_options):
+        super().__init__(ports=('REPLAY',), **handler_options)
+        self.path = path
+        self.speed = speed
+        self.raw_interval = raw_interval
+        self.max_backlog = max_backlog
+
+    def _create_device(self, serial_port):
+        options = dict(self.device_options)
+        if self._is_session():
+            # Серийный номер и версия модуля берутся из заголовка сессии
+            from ..models.session_reader import SessionReader
+            reader = SessionReader(self.path)
+            options.setdefault('serial', reader.serial or '0000000000')
+            options.setdefault('version', reader.version or '00000')
+            reader.close()
+        return ReplayDevice(serial_port.push, open_source(self.path, self.raw_interval), speed=self.speed,
+                            backlog=lambda: serial_port.in_waiting, max_backlog=self.max_backlog, **options)
+
+    def _is_session(self):
+        with open(self.path, 'rb') as f:
+            return f.read(8) == session_format.MAGIC
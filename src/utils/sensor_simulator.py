@@ -0,0 +1,394 @@
+# src/utils/sensor_simulator.py
+"""
+Симулятор лазерного датчика JRT M703A.
+
+Позволяет запускать приложение и нагрузочные тесты без физического модуля:
+
+* SimulatedSerialHandler — замена SerialHandler с тем же интерфейсом
+  (get_available_ports, connect, disconnect, send_command,
+  parse_distance_response, parse_status_response, serial_port);
+* PtySimulator — тот же протокол на паре псевдотерминалов, чтобы
+  проверить настоящий путь через pyserial.
+
+Запуск на pty: python -m src.utils.sensor_simulator --pty [--overdrive 10]
+"""
+
+import logging
+import os
+import random
+import threading
+import time
+
+from .frame_parser import FrameParser, DistanceFrame, ErrorFrame, StatusFrame, describe_error
+
+LINE_END = b'\r\n'
+
+# Параметры режимов: период измерения (сек), СКО шума (м), диапазон качества
+MODE_PROFILES = {
+    'F': {'period': (0.125, 0.333), 'noise': 0.003, 'quality': (60, 400)},   # Быстрый, 3–8 Гц
+    'D': {'period': (0.3, 1.0), 'noise': 0.0015, 'quality': (20, 200)},     # Автоматический
+    'M': {'period': (1.0, 4.0), 'noise': 0.001, 'quality': (10, 100)},      # Медленный, точный
+}
+
+
+class SimulatedM703A:
+    """
+    Модель поведения модуля M703A.
+
+    Принимает байты команд через receive() и отдает ответы через функцию
+    output(bytes). Команды O/C/S/V отвечают сразу, D выполняет одно
+    измерение, F и M выдают измерения непрерывно до команды X.
+    """
+
+    def __init__(self, output, distance=5.0, noise_scale=1.0, drift=0.0, error_rate=0.0,
+                 error_codes=tuple(range(5, 16)), overdrive=1.0, serial='1702250029',
+                 version='29456', seed=None):
+        """
+        Args:
+            output (callable): Функция передачи байт ответа.
+            distance (float): Расстояние до цели, м.
+            noise_scale (float): Множитель шума измерения.
+            drift (float): Дрейф расстояния, м/с.
+            error_rate (float): Вероятность ошибки :ErXX! вместо измерения.
+            error_codes (tuple): Коды ошибок, из которых выбирается случайная.
+            overdrive (float): Во сколько раз модуль работает быстрее паспортной частоты.
+            serial (str): Серийный номер (10 цифр) для ответа на V.
+            version (str): Версия ПО (5 цифр) для ответа на V.
+            seed (int, optional): Зерно генератора для воспроизводимых тестов.
+        """
+        self.output = output
+        self.distance = distance
+        self.noise_scale = noise_scale
+        self.drift = drift
+        self.error_rate = error_rate
+        self.error_codes = tuple(error_codes)
+        self.overdrive = max(overdrive, 1e-3)
+        self.serial = serial
+        self.version = version
+        self.rng = random.Random(seed)
+
+        self.laser_on = False
+        self.temperature = 18.0
+        self.voltage = 3.0
+        self.frames_sent = 0
+        self._mode = None
+        self._single_shot = False
+        self._next_due = 0.0
+        self._started = time.monotonic()
+
+        self._condition = threading.Condition()
+        self._running = False
+        self._thread = None
+        self.logger = logging.getLogger(__name__)
+
+    def start(self):
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="SimulatedM703A", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        with self._condition:
+            self._running = False
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join(1.0)
+            self._thread = None
+
+    def receive(self, data):
+        """Обрабатывает байты команд, полученные от хоста."""
+        for byte in bytes(data):
+            self._handle_command(chr(byte).upper())
+
+    def _handle_command(self, command):
+        if command in ('O', 'C'):
+            self.laser_on = command == 'O'
+            self.output(b',OK!' + LINE_END)
+        elif command == 'S':
+            self.output(f"{self.temperature:.1f}'C, {self.voltage:.1f}V".encode('ascii') + LINE_END)
+        elif command == 'V':
+            self.output(f"{self.serial}{self.version}".encode('ascii') + LINE_END)
+        elif command in MODE_PROFILES:
+            with self._condition:
+                self._mode = command
+                self._single_shot = command == 'D'
+                self._next_due = time.monotonic() + self._period(command)
+                self._condition.notify_all()
+        elif command == 'X':
+            with self._condition:
+                self._mode = None
+                self._condition.notify_all()
+        # Прочие байты (переводы строк и т.п.) модуль игнорирует
+
+    def _period(self, mode):
+        low, high = MODE_PROFILES[mode]['period']
+        return self.rng.uniform(low, high) / self.overdrive
+
+    def _run(self):
+        while True:
+            with self._condition:
+                if not self._running:
+                    return
+                if self._mode is None:
+                    self._condition.wait(0.5)
+                    continue
+                delay = self._next_due - time.monotonic()
+                if delay > 0:
+                    self._condition.wait(delay)
+                    continue
+                mode = self._mode
+                if self._single_shot:
+                    self._mode = None
+                else:
+                    self._next_due += self._period(mode)
+            self.output(self._make_frame(mode) + LINE_END)
+            self.frames_sent += 1
+
+    def _make_frame(self, mode):
+        """Формирует строку измерения или ошибки."""
+        if self.error_rate and self.rng.random() < self.error_rate:
+            return f":Er{self.rng.choice(self.error_codes):02d}!".encode('ascii')
+        profile = MODE_PROFILES[mode]
+        quality = self.rng.randint(*profile['quality'])
+        # Чем хуже (больше) качество, тем сильнее шум
+        noise = profile['noise'] * self.noise_scale * (1.0 + quality / 200.0)
+        elapsed = time.monotonic() - self._started
+        distance = self.distance + self.drift * elapsed + self.rng.gauss(0.0, noise)
+        distance = min(max(distance, 0.03), 99.999)
+        self.temperature = min(40.0, self.temperature + 0.001)
+        return f"{distance:6.3f}m,{quality:04d}".encode('ascii')
+
+
+class SimulatedSerialPort:
+    """
+    Потокобезопасная модель объекта serial.Serial для SimulatedSerialHandler.
+
+    Поддерживает используемые приложением атрибуты и методы: port, timeout,
+    is_open, in_waiting, read, write, reset_input_buffer, cancel_read, close.
+    """
+
+    def __init__(self, port, timeout=0.1):
+        self.port = port
+        self.timeout = timeout
+        self.is_open = True
+        self.device = None
+        self._buffer = bytearray()
+        self._condition = threading.Condition()
+        self._cancelled = False
+
+    def push(self, data):
+        """Добавляет байты, «переданные» устройством."""
+        with self._condition:
+            self._buffer += data
+            self._condition.notify_all()
+
+    @property
+    def in_waiting(self):
+        with self._condition:
+            return len(self._buffer)
+
+    def read(self, size=1):
+        deadline = None if self.timeout is None else time.monotonic() + self.timeout
+        with self._condition:
+            while len(self._buffer) < size and self.is_open and not self._cancelled:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    break
+                self._condition.wait(remaining)
+            self._cancelled = False
+            if not self.is_open:
+                raise OSError("Порт закрыт")
+            data = bytes(self._buffer[:size])
+            del self._buffer[:size]
+            return data
+
+    def write(self, data):
+        if not self.is_open:
+            raise OSError("Порт закрыт")
+        self.device.receive(data)
+        return len(data)
+
+    def reset_input_buffer(self):
+        with self._condition:
+            self._buffer.clear()
+
+    def cancel_read(self):
+        with self._condition:
+            self._cancelled = True
+            self._condition.notify_all()
+
+    def close(self):
+        with self._condition:
+            self.is_open = False
+            self._condition.notify_all()
+
+
+class SimulatedSerialHandler:
+    """
+    Обработчик последовательного порта, работающий с симулятором M703A.
+
+    Реализует интерфейс SerialHandler, который использует SensorController.
+    Параметры модели устройства (distance, noise_scale, error_rate, overdrive
+    и т.д.) передаются в SimulatedM703A.
+    """
+
+    def __init__(self, ports=('SIM0',), response_timeout=4.5, read_timeout=0.1, **device_options):
+        self.ports = list(ports)
+        self.response_timeout = response_timeout
+        self.read_timeout = read_timeout
+        self.device_options = device_options
+        self.serial_port = None
+        self.device = None
+        self.logger = logging.getLogger(__name__)
+
+    @property
+    def is_connected(self):
+        return self.serial_port is not None and self.serial_port.is_open
+
+    def get_available_ports(self):
+        return list(self.ports)
+
+    def connect(self, port):
+        if port not in self.ports:
+            self.logger.error(f"Порт {port} не найден в симуляторе")
+            return False
+        self.disconnect()
+        self.serial_port = SimulatedSerialPort(port, timeout=self.read_timeout)
+        self.device = self._create_device(self.serial_port)
+        self.serial_port.device = self.device
+        self.device.start()
+        self.logger.info(f"Симулятор M703A подключен к {port}")
+        return True
+
+    def _create_device(self, serial_port):
+        """Создает модель устройства, подключенную к порту (переопределяется в наследниках)."""
+        return SimulatedM703A(serial_port.push, **self.device_options)
+
+    def disconnect(self):
+        if self.device is not None:
+            self.device.stop()
+            self.device = None
+        if self.serial_port is not None:
+            self.serial_port.close()
+            self.serial_port = None
+        return True
+
+    def send_command(self, command, wait_for_response=True, timeout=None):
+        """Отправляет команду и (при необходимости) ждет строку ответа."""
+        if not self.is_connected:
+            return None
+        if command:
+            self.serial_port.write(command.encode('ascii'))
+        if not wait_for_response:
+            return None
+
+        deadline = time.monotonic() + (timeout if timeout is not None else self.response_timeout)
+        line = b''
+        while not line.endswith(LINE_END):
+            if time.monotonic() >= deadline:
+                return None
+            line += self.serial_port.read(1)
+        return line.decode('ascii', errors='replace').strip()
+
+    def parse_distance_response(self, response):
+        """Возвращает (distance, quality, err_msg) для строки ответа на D/M/F."""
+        for record in FrameParser().feed(response.encode('ascii', errors='replace')):
+            if isinstance(record, DistanceFrame):
+                return record.distance, record.quality, None
+            if isinstance(record, ErrorFrame):
+                return None, None, describe_error(record.code)
+        return None, None, None
+
+    def parse_status_response(self, response):
+        """Возвращает (temperature, voltage, err_msg) для строки ответа на S."""
+        for record in FrameParser().feed(response.encode('ascii', errors='replace')):
+            if isinstance(record, StatusFrame):
+                return record.temperature, record.voltage, None
+            if isinstance(record, ErrorFrame):
+                return None, None, describe_error(record.code)
+        return None, None, f"Некорректный ответ статуса: '{response}'"
+
+
+class PtySimulator:
+    """
+    Симулятор M703A на паре псевдотерминалов (только POSIX).
+
+    Ведомая сторона (port_name) открывается настоящим pyserial, как обычный
+    COM-порт, а симулятор читает команды и пишет ответы в ведущую сторону.
+    """
+
+    def __init__(self, **device_options):
+        self.device_options = device_options
+        self.port_name = None
+        self.device = None
+        self._master = None
+        self._slave = None
+        self._thread = None
+        self._running = False
+
+    def start(self):
+        import tty
+        self._master, self._slave = os.openpty()
+        tty.setraw(self._master)
+        tty.setraw(self._slave)
+        self.port_name = os.ttyname(self._slave)
+        self.device = SimulatedM703A(self._write, **self.device_options)
+        self.device.start()
+        self._running = True
+        self._thread = threading.Thread(target=self._read_commands, name="PtySimulator", daemon=True)
+        self._thread.start()
+        return self.port_name
+
+    def _write(self, data):
+        try:
+            os.write(self._master, data)
+        except OSError:
+            pass  # Ведомая сторона закрыта
+
+    def _read_commands(self):
+        import select
+        while self._running:
+            ready, _, _ = select.select([self._master], [], [], 0.2)
+            if not ready:
+                continue
+            try:
+                data = os.read(self._master, 64)
+            except OSError:
+                break
+            self.device.receive(data)
+
+    def stop(self):
+        self._running = False
+        if self._thread is not None:
+            self._thread.join(1.0)
+        if self.device is not None:
+            self.device.stop()
+        for fd in (self._master, self._slave):
+            if fd is not None:
+                os.close(fd)
+        self._master = self._slave = None
+
+
+def main():
+    import argparse
+    arg_parser = argparse.ArgumentParser(description="Симулятор JRT M703A на псевдотерминале")
+    arg_parser.add_argument('--pty', action='store_true', help="Обслуживать протокол на pty (по умолчанию)")
+    arg_parser.add_argument('--distance', type=float, default=5.0)
+    arg_parser.add_argument('--error-rate', type=float, default=0.0)
+    arg_parser.add_argument('--overdrive', type=float, default=1.0)
+    arg_parser.add_argument('--seed', type=int, default=None)
+    args = arg_parser.parse_args()
+
+    simulator = PtySimulator(distance=args.distance, error_rate=args.error_rate,
+                             overdrive=args.overdrive, seed=args.seed)
+    print(f"Симулятор M703A: {simulator.start()} (Ctrl+C для выхода)")
+    try:
+        while True:
+            time.sleep(1.0)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        simulator.stop()
+
+
+if __name__ == '__main__':
+    main()
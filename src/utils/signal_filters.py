@@ -0,0 +1,272 @@
+# src/utils/signal_filters.py
+"""
+Фильтрация потока расстояний пачками на NumPy.
+
+Каждая ступень обрабатывает пачку массивов (timestamps, values, qualities)
+и возвращает новый массив значений; NaN означает «значения нет» (запись
+ошибки или отбракованное измерение), такие позиции следующие ступени
+пропускают. Состояние ступеней переносится между пачками, поэтому результат
+не зависит от того, как поток разбит на пачки.
+
+Ступени:
+    QualityGate    — отбраковка по качеству сигнала (чем меньше, тем лучше);
+    HampelFilter   — замена выбросов медианой скользящего окна (MAD);
+    KalmanFilter1D — установившийся фильтр Калмана с моделью постоянной скорости.
+
+Ступенью может быть любой объект с методами process() и reset().
+"""
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+# Коэффициент перевода MAD в оценку стандартного отклонения (нормальное распределение)
+MAD_SCALE = 1.4826
+
+
+def _row_medians(rows):
+    """Медианы строк двумерного массива (частичная сортировка вместо np.median)."""
+    width = rows.shape[1]
+    middle = width // 2
+    if width % 2:
+        return np.partition(rows, middle, axis=1)[:, middle]
+    parted = np.partition(rows, (middle - 1, middle), axis=1)
+    return (parted[:, middle - 1] + parted[:, middle]) / 2
+
+
+def _valid_positions(values):
+    """Индексы значений, которые есть (не NaN)."""
+    return np.flatnonzero(~np.isnan(values))
+
+
+class QualityGate:
+    """Отбраковывает измерения с качеством сигнала хуже max_quality."""
+
+    def __init__(self, max_quality):
+        self.max_quality = max_quality
+
+    def reset(self):
+        pass
+
+    def process(self, timestamps, values, qualities):
+        return np.where(qualities > self.max_quality, np.nan, values)
+
+
+class HampelFilter:
+    """
+    Фильтр Хампеля по последним window значениям (включая текущее).
+
+    Значение считается выбросом, если отклоняется от медианы окна больше чем
+    на max(n_sigmas * 1.4826 * MAD, min_deviation), и заменяется медианой.
+    Порог min_deviation не дает считать выбросом шаг дискретизации (1 мм),
+    когда MAD окна нулевой. Окно причинное: будущие измерения не нужны,
+    поэтому задержки нет. Пока окно не заполнено, значения не меняются.
+    """
+
+    def __init__(self, window=7, n_sigmas=3.0, min_deviation=0.005):
+        if window < 2:
+            raise ValueError("Окно фильтра Хампеля должно быть не меньше 2")
+        self.window = window
+        self.n_sigmas = n_sigmas
+        self.min_deviation = min_deviation
+        self.reset()
+
+    def reset(self):
+        # Исходные (не замененные) значения, предшествующие пачке
+        self._history = np.empty(0, dtype=np.float64)
+
+    def process(self, timestamps, values, qualities):
+        positions = _valid_positions(values)
+        if len(positions) == 0:
+            return values
+        samples = values[positions]
+        extended = np.concatenate((self._history, samples))
+        self._history = extended[-(self.window - 1):]
+        if len(extended) < self.window:
+            return values
+
+        windows = sliding_window_view(extended, self.window)
+        medians = _row_medians(windows)
+        deviations = _row_medians(np.abs(windows - medians[:, None]))
+        # Строка окна i заканчивается значением extended[i + window - 1]
+        current = extended[self.window - 1:]
+        threshold = np.maximum(self.n_sigmas * MAD_SCALE * deviations, self.min_deviation)
+        outliers = np.abs(current - medians) > threshold
+        if not outliers.any():
+            return values
+
+        filtered = values.copy()
+        # Последние len(current) значений пачки имеют полное окно
+        tail = positions[len(positions) - len(current):]
+        filtered[tail[outliers]] = medians[outliers]
+        return filtered
+
+
+class KalmanFilter1D:
+    """
+    Фильтр Калмана для расстояния с моделью постоянной скорости.
+
+    Измерения считаются равномерными с шагом dt (сек); используется
+    установившийся коэффициент усиления, поэтому фильтр линейный и
+    стационарный: x[k] = A x[k-1] + K z[k], A = (I - K H) F. Пачка
+    делится на блоки по BLOCK_SIZE значений: отклики всех блоков считаются
+    одним умножением на заранее вычисленную нижнетреугольную матрицу
+    импульсных откликов, а в цикле между блоками переносится только
+    вектор состояния (2 числа).
+
+    После паузы дольше reset_gap сек (перезапуск потока) состояние
+    инициализируется заново по первому измерению.
+    """
+
+    BLOCK_SIZE = 128
+
+    def __init__(self, dt=0.1, process_noise=0.01, measurement_noise=0.003, reset_gap=2.0):
+        """
+        Args:
+            dt (float): Номинальный период измерений, сек.
+            process_noise (float): Спектральная плотность ускорения, м²/с³.
+            measurement_noise (float): СКО шума измерения, м.
+            reset_gap (float): Пауза между измерениями для сброса состояния, сек.
+        """
+        self.dt = dt
+        self.reset_gap = reset_gap
+        self.gain = self._steady_state_gain(dt, process_noise, measurement_noise ** 2)
+        transition = np.array([[1.0, dt], [0.0, 1.0]])
+        self._system = (np.eye(2) - np.outer(self.gain, [1.0, 0.0])) @ transition
+        self._build_block_matrices()
+        self.reset()
+
+    @staticmethod
+    def _steady_state_gain(dt, q, r):
+        """Решение уравнения Риккати итерациями (выполняется один раз)."""
+        transition = np.array([[1.0, dt], [0.0, 1.0]])
+        noise = q * np.array([[dt ** 3 / 3, dt ** 2 / 2], [dt ** 2 / 2, dt]])
+        covariance = np.eye(2)
+        for _ in range(10000):
+            predicted = transition @ covariance @ transition.T + noise
+            gain = predicted[:, 0] / (predicted[0, 0] + r)
+            updated = predicted - np.outer(gain, predicted[0])
+            if np.allclose(updated, covariance, rtol=1e-12, atol=1e-18):
+                break
+            covariance = updated
+        return gain
+
+    def _build_block_matrices(self):
+        size = self.BLOCK_SIZE
+        powers = np.empty((size + 1, 2, 2))
+        powers[0] = np.eye(2)
+        for i in range(1, size + 1):
+            powers[i] = self._system @ powers[i - 1]
+        # Отклик состояния на измерение, поступившее m шагов назад: A^m K
+        responses = powers[:size] @ self.gain
+        lags = np.subtract.outer(np.arange(size), np.arange(size))
+        # _impulse[j, i] — вклад измерения i в оценку расстояния j блока
+        self._impulse = np.where(lags >= 0, responses[np.clip(lags, 0, None), 0], 0.0)
+        # Вклад измерений в скорость в конце блока длины n: _velocity_response[n - 1 - i]
+        self._velocity_response = responses[:, 1]
+        # _carry[j] = A^(j+1) — вклад состояния до блока
+        self._carry = powers[1:]
+
+    def reset(self):
+        self._state = None
+        self._last_time = None
+
+    def process(self, timestamps, values, qualities):
+        positions = _valid_positions(values)
+        if len(positions) == 0:
+            return values
+        times = timestamps[positions]
+        samples = values[positions]
+
+        # Границы сегментов: первое измерение и паузы дольше reset_gap
+        previous = np.empty_like(times)
+        previous[0] = times[0] if self._last_time is None else self._last_time
+        previous[1:] = times[:-1]
+        starts = np.flatnonzero(times - previous > self.reset_gap)
+        if self._state is None and (len(starts) == 0 or starts[0] != 0):
+            starts = np.concatenate(([0], starts))
+
+        estimates = np.empty_like(samples)
+        segment_start = 0
+        for start in starts.tolist():
+            self._run(samples[segment_start:start], estimates[segment_start:start])
+            self._state = np.array([samples[start], 0.0])
+            estimates[start] = samples[start]
+            segment_start = start + 1
+        self._run(samples[segment_start:], estimates[segment_start:])
+        self._last_time = times[-1]
+
+        filtered = np.full(len(values), np.nan)
+        filtered[positions] = estimates
+        return filtered
+
+    def _run(self, samples, out):
+        """Фильтрует samples блоками, записывая оценку расстояния в out."""
+        size = self.BLOCK_SIZE
+        full = len(samples) // size * size
+        if full:
+            # Отклики всех полных блоков при нулевом начальном состоянии — одно умножение матриц
+            blocks = samples[:full].reshape(-1, size)
+            responses = blocks @ self._impulse.T
+            end_velocities = blocks @ self._velocity_response[::-1]
+            # Последовательно переносится только состояние между блоками: x = A^size x + отклик
+            (a, b), (c, d) = self._carry[-1].tolist()
+            position, velocity = self._state.tolist()
+            initial = np.empty((len(blocks), 2))
+            for i, (end_position, end_velocity) in enumerate(zip(responses[:, -1].tolist(),
+                                                                 end_velocities.tolist())):
+                initial[i] = position, velocity
+                position, velocity = (a * position + b * velocity + end_position,
+                                      c * position + d * velocity + end_velocity)
+            out[:full] = (responses + initial @ self._carry[:, 0, :].T).ravel()
+            self._state = np.array([position, velocity])
+
+        block = samples[full:]
+        if len(block):
+            count = len(block)
+            carry = self._carry[:count] @ self._state
+            out[full:] = carry[:, 0] + self._impulse[:count, :count] @ block
+            self._state = np.array([out[-1], carry[-1, 1] + self._velocity_response[count - 1::-1] @ block])
+
+
+class FilterPipeline:
+    """Последовательность ступеней фильтрации."""
+
+    def __init__(self, stages=()):
+        self.stages = list(stages)
+
+    def reset(self):
+        for stage in self.stages:
+            stage.reset()
+
+    def process(self, timestamps, distances, qualities):
+        """
+        Фильтрует пачку измерений.
+
+        Returns:
+            numpy.ndarray: Отфильтрованные расстояния (float64); NaN — значения нет.
+        """
+        values = np.asarray(distances, dtype=np.float64)
+        timestamps = np.asarray(timestamps, dtype=np.float64)
+        qualities = np.asarray(qualities)
+        for stage in self.stages:
+            values = stage.process(timestamps, values, qualities)
+        return values
+
+    @classmethod
+    def from_options(cls, options):
+        """
+        Строит конвейер из словаря настроек (значение None отключает ступень).
+
+        Ключи: max_quality, hampel_window, hampel_sigmas, hampel_min_deviation,
+        kalman_dt, kalman_process_noise, kalman_measurement_noise.
+        """
+        stages = []
+        if options.get('max_quality', 2000) is not None:
+            stages.append(QualityGate(options.get('max_quality', 2000)))
+        if options.get('hampel_window', 7) is not None:
+            stages.append(HampelFilter(options.get('hampel_window', 7), options.get('hampel_sigmas', 3.0),
+                                       options.get('hampel_min_deviation', 0.005)))
+        if options.get('kalman_dt', 0.1) is not None:
+            stages.append(KalmanFilter1D(options.get('kalman_dt', 0.1), options.get('kalman_process_noise', 0.01),
+                                         options.get('kalman_measurement_noise', 0.003)))
+        return cls(stages)
@@ -0,0 +1,80 @@
+# src/utils/startup_timing.py
+"""
+Замер времени запуска GUI.
+
+Этапы отмечаются вызовом STARTUP.mark(name) по мере запуска; время
+отсчитывается от старта процесса (на Linux — по /proc/self/stat, иначе от
+первого импорта этого модуля):
+
+    imports      — модули окна импортированы (начало MainWindow.__init__);
+    window_built — главное окно построено;
+    first_paint  — первая отрисовка окна;
+    ports_listed — фоновый поиск COM-портов завершен;
+    plot_canvas  — график создан (при первых данных).
+
+Повторные отметки этапа игнорируются, поэтому точки замера можно ставить
+в обработчики, которые вызываются многократно.
+"""
+
+import json
+import os
+import time
+
+STAGES = (
+    ('imports', "импорт модулей"),
+    ('window_built', "построение окна"),
+    ('first_paint', "первая отрисовка"),
+    ('ports_listed', "поиск портов"),
+    ('plot_canvas', "создание графика"),
+)
+
+
+def _process_age():
+    """Секунды с момента старта процесса или None, если узнать нельзя."""
+    try:
+        with open('/proc/self/stat', 'rb') as f:
+            # Поля после имени процесса (в скобках); starttime — 22-е поле
+            fields = f.read().rsplit(b')', 1)[1].split()
+        with open('/proc/uptime', 'rb') as f:
+            uptime = float(f.read().split()[0])
+        return max(uptime - int(fields[19]) / os.sysconf('SC_CLK_TCK'), 0.0)
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+class StartupTimer:
+    """Отметки этапов запуска в миллисекундах от старта процесса."""
+
+    def __init__(self):
+        age = _process_age()
+        self.from_process_start = age is not None
+        self.origin = time.perf_counter() - (age or 0.0)
+        self.marks = {}
+
+    def mark(self, name):
+        """Отмечает этап name (только первый раз); возвращает время от старта, мс."""
+        if name not in self.marks:
+            self.marks[name] = (time.perf_counter() - self.origin) * 1000.0
+        return self.marks[name]
+
+    def to_dict(self):
+        return {'from_process_start': self.from_process_start, 'marks_ms': dict(self.marks)}
+
+    def dump_json(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+
+    def report_text(self):
+        """Этапы по времени: от старта и прирост относительно предыдущего этапа."""
+        origin = "старта процесса" if self.from_process_start else "импорта модуля замера"
+        descriptions = dict(STAGES)
+        lines = [f"Время запуска (от {origin}):"]
+        previous = 0.0
+        for name, value in sorted(self.marks.items(), key=lambda item: item[1]):
+            lines.append(f"  {descriptions.get(name, name):<18} {value:>8.1f} мс  (+{value - previous:.1f})")
+            previous = value
+        return "\n".join(lines)
+
+
+# Общий экземпляр для всего приложения
+STARTUP = StartupTimer()
@@ -0,0 +1,113 @@
+import time
+
+from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
+                             QListWidget, QTableWidget, QTableWidgetItem, QHeaderView, QSplitter)
+from PyQt5.QtCore import Qt, QTimer, pyqtSignal
+
+from .refresh_scheduler import RefreshScheduler
+from ..utils.frame_parser import ERROR_CODES
+from ..utils.notification_throttle import NotificationThrottle
+
+
+class ErrorPanel(QWidget):
+    """
+    Немодальная панель ошибок датчика.
+
+    Вверху — счетчики по кодам из журнала ошибок модели (всего и в минуту
+    за скользящее окно), внизу — лента уведомлений. Уведомления проходят
+    через NotificationThrottle: повтор одного кода не чаще dedup_interval,
+    подавленные повторы дописываются к следующему показу. Счетчики
+    пересчитываются не чаще двух раз в секунду (и раз в секунду, пока
+    панель видна, чтобы частота убывала после прекращения ошибок), поэтому
+    поток ошибок не нагружает GUI-поток.
+    """
+
+    # Показано новое уведомление (текст) — например, для строки состояния окна
+    notification_shown = pyqtSignal(str)
+
+    MAX_NOTIFICATIONS = 200
+
+    def __init__(self, data_controller, throttle=None, parent=None):
+        super().__init__(parent)
+        self.data_controller = data_controller
+        self.throttle = throttle or NotificationThrottle()
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+
+        self.summary_label = QLabel("Ошибок нет")
+        layout.addWidget(self.summary_label)
+
+        splitter = QSplitter(Qt.Vertical)
+        self.counters_table = QTableWidget(0, 4)
+        self.counters_table.setHorizontalHeaderLabels(["Код", "Описание", "Всего", "В минуту"])
+        self.counters_table.verticalHeader().setVisible(False)
+        self.counters_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.counters_table.horizontalHeader().setSectionResizeMode(1, QHeaderView.Stretch)
+        splitter.addWidget(self.counters_table)
+
+        self.notifications_list = QListWidget()
+        splitter.addWidget(self.notifications_list)
+        layout.addWidget(splitter)
+
+        buttons_layout = QHBoxLayout()
+        buttons_layout.addStretch()
+        self.clear_button = QPushButton("Очистить ленту")
+        self.clear_button.clicked.connect(self.clear_notifications)
+        buttons_layout.addWidget(self.clear_button)
+        layout.addLayout(buttons_layout)
+
+        self.refresh_scheduler = RefreshScheduler(self.refresh_counters, 2, self)
+        self.data_controller.error_recorded.connect(self.on_error_recorded)
+        # Счетчики зависят от отображаемых данных (текущие измерения или файл)
+        self.data_controller.session_view_changed.connect(self.refresh_scheduler.mark_dirty)
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setInterval(1000)
+        self.refresh_timer.timeout.connect(self._on_refresh_timer)
+        self.refresh_timer.start()
+
+    def on_error_recorded(self, code):
+        """Ошибка добавлена в журнал: уведомление (с ограничением) и пересчет счетчиков."""
+        self.refresh_scheduler.mark_dirty()
+        suppressed = self.throttle.offer(code)
+        if suppressed is None:
+            return
+        text = f"{time.strftime('%H:%M:%S')}  :Er{code:02d}! {ERROR_CODES.get(code, 'Неизвестная ошибка')}"
+        if suppressed:
+            text += f" (еще {suppressed} повтор.)"
+        self.notifications_list.addItem(text)
+        if self.notifications_list.count() > self.MAX_NOTIFICATIONS:
+            self.notifications_list.takeItem(0)
+        self.notifications_list.scrollToBottom()
+        self.notification_shown.emit(text)
+
+    def _on_refresh_timer(self):
+        if self.isVisible():
+            self.refresh_scheduler.mark_dirty()
+
+    def clear_notifications(self):
+        self.notifications_list.clear()
+        self.throttle.reset()
+
+    def refresh_counters(self):
+        """Заполняет таблицу счетчиков из журнала ошибок модели."""
+        model = self.data_controller.model
+        errors = model.errors
+        # Для записанной сессии окно частоты отсчитывается от последней ошибки
+        summary = errors.summary(None if model.read_only else time.time())
+        self.counters_table.setRowCount(len(summary))
+        for row, (code, total, per_minute) in enumerate(summary):
+            description = ERROR_CODES.get(code, "Коды вне документации")
+            values = (f"{code:02d}" if code else "—", description, str(total), f"{per_minute:.1f}")
+            for column, value in enumerate(values):
+                item = self.counters_table.item(row, column)
+                if item is None:
+                    self.counters_table.setItem(row, column, QTableWidgetItem(value))
+                else:
+                    item.setText(value)
+        if errors.total_count:
+            self.summary_label.setText(f"Ошибок: {errors.total_count}, "
+                                       f"{errors.rate() * 60.0:.1f} в минуту за последние "
+                                       f"{errors.rate_window:.0f} с")
+        else:
+            self.summary_label.setText("Ошибок нет")
@@ -1,30 +1,21 @@
+import math
+import time
+
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel,
                            QPushButton, QComboBox, QGroupBox,
                            QFormLayout, QMessageBox, QSplitter,
                            QRadioButton, QButtonGroup, QLCDNumber,
-                           QTableWidget, QTableWidgetItem, QHeaderView, QSizePolicy)
+                           QTableView, QHeaderView, QSizePolicy, QCheckBox)
 from PyQt5.QtCore import Qt, pyqtSlot, QTimer
-import time
-import numpy as np
 
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-from matplotlib.figure import Figure
 from ..config.settings import PLOT_SETTINGS
+from ..controllers.port_scan_worker import PortScanWorker
+from .measurement_table_model import MeasurementTableModel
+from .refresh_scheduler import RefreshScheduler
+from ..utils.decimation import MinMaxPyramid, minmax_decimate
+from ..utils.latency import TRACKER
+from ..utils.startup_timing import STARTUP
 
-class PlotCanvas(FigureCanvas):
-    """Класс для встраивания графика Matplotlib в PyQt."""
-    def __init__(self, parent=None, width=5, height=4, dpi=100):
-        fig = Figure(figsize=(width, height), dpi=dpi)
-        self.axes = fig.add_subplot(111)
-        super().__init__(fig)
-        self.setParent(parent)
-        FigureCanvas.setSizePolicy(self,
-                                  QSizePolicy.Expanding,
-                                  QSizePolicy.Expanding)
-        FigureCanvas.updateGeometry(self)
-        self.axes.set_xlabel("Номер измерения")
-        self.axes.set_ylabel("Расстояние (м)")
-        self.axes.grid(True)
 
 class MainWidget(QWidget):
     def __init__(self, sensor_controller, data_controller):
@@ -88,6 +79,22 @@ class MainWidget(QWidget):
         self.info_layout.addRow("Температура:", self.temperature_label)
         self.info_layout.addRow("Напряжение:", self.voltage_label)
 
+        # Фактический режим непрерывного измерения и частота
+        self.acquisition_mode_label = QLabel("Н/Д")
+        self.acquisition_mode_label.setWordWrap(True)
+        self.info_layout.addRow("Режим:", self.acquisition_mode_label)
+        self._acquisition_mode = ('', '')
+        self._effective_rate = 0.0
+
+        # Статистика расстояния: последние N измерений / вся сессия
+        self.stats_scope_label = QLabel()
+        self.info_layout.addRow("Статистика:", self.stats_scope_label)
+        self.stats_labels = {}
+        for key, title in (('mean', "Среднее:"), ('std', "СКО:"), ('range', "Мин … макс:"),
+                           ('median', "Медиана:"), ('drift', "Дрейф:"), ('weighted_mean', "Среднее по качеству:")):
+            self.stats_labels[key] = QLabel("Н/Д")
+            self.info_layout.addRow(title, self.stats_labels[key])
+
         self.connection_info_layout.addWidget(self.info_group)
 
         self.splitter.addWidget(self.connection_info_widget)
@@ -191,8 +198,28 @@ class MainWidget(QWidget):
         self.plot_layout = QVBoxLayout()
         self.plot_group.setLayout(self.plot_layout)
 
-        self.plot_canvas = PlotCanvas(self)
-        self.plot_layout.addWidget(self.plot_canvas)
+        # График (matplotlib) создается при первых данных — см. ensure_plot_canvas()
+        self.plot_canvas = None
+        self.plot_toolbar = None
+        self.plot_placeholder = QLabel("График появится после первых измерений")
+        self.plot_placeholder.setAlignment(Qt.AlignCenter)
+        self.plot_placeholder.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+
+        self.plot_options_layout = QHBoxLayout()
+        self.whole_session_checkbox = QCheckBox("Вся сессия")
+        self.follow_button = QPushButton("Слежение")
+        self.follow_button.setToolTip("Вернуть автоматическое отслеживание новых данных")
+        self.follow_button.setEnabled(False)
+        self.plot_options_layout.addWidget(self.whole_session_checkbox)
+        self.plot_options_layout.addWidget(self.follow_button)
+        self.plot_options_layout.addStretch(1)
+
+        self.plot_layout.addWidget(self.plot_placeholder)
+        self.plot_layout.addLayout(self.plot_options_layout)
+
+        # Пирамида min/max для просмотра всей сессии и масштабирования длинной истории
+        self.plot_pyramid = MinMaxPyramid()
+        self._plot_manual_range = None  # Пределы X, заданные пользователем (отн. сек)
 
         self.data_display_layout.addWidget(self.plot_group)
 
@@ -200,9 +227,12 @@ class MainWidget(QWidget):
         self.results_layout = QVBoxLayout()
         self.results_group.setLayout(self.results_layout)
 
-        self.results_table = QTableWidget(0, 3)
-        self.results_table.setHorizontalHeaderLabels(["Время", "Расстояние (м)", "Качество (%)"])
+        self.results_model = MeasurementTableModel(self.data_controller.model, self)
+        self.results_table = QTableView()
+        self.results_table.setModel(self.results_model)
         self.results_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        # Фиксированная высота строк: представлению не нужно измерять каждую строку
+        self.results_table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
 
         self.results_layout.addWidget(self.results_table)
 
@@ -217,6 +247,12 @@ class MainWidget(QWidget):
         self.connection_status_timer = QTimer()
         self.connection_status_timer.setInterval(5000)
 
+        # Перерисовка таблицы, графика и индикаторов не чаще max_refresh_rate раз в секунду
+        self.refresh_scheduler = RefreshScheduler(self.on_data_updated,
+                                                  PLOT_SETTINGS.get('max_refresh_rate', 20), self)
+
+        # Поиск портов в фоне: окно показывается, не дожидаясь перечисления
+        self.port_scan_worker = None
         self.refresh_ports()
 
         self.connect_signals()
@@ -230,6 +266,14 @@ class MainWidget(QWidget):
 
         self.sensor_controller.connection_changed.connect(self.on_connection_changed)
         self.sensor_controller.status_updated.connect(self.on_status_updated)
+        self.sensor_controller.single_measurement_finished.connect(self.on_single_measurement_finished)
+        self.sensor_controller.acquisition_mode_changed.connect(self.on_acquisition_mode_changed)
+        self.sensor_controller.effective_rate_changed.connect(self.on_effective_rate_changed)
+        supervisor = getattr(self.sensor_controller, 'supervisor', None)
+        if supervisor is not None:
+            supervisor.link_lost.connect(self.on_link_lost)
+            supervisor.reconnect_scheduled.connect(self.on_reconnect_scheduled)
+            supervisor.link_restored.connect(self.on_link_restored)
         if hasattr(self.sensor_controller, 'laser_state_changed'):
             self.sensor_controller.laser_state_changed.connect(self.on_laser_state_changed)
         else:
@@ -245,14 +289,29 @@ class MainWidget(QWidget):
         self.stop_button.clicked.connect(self.on_stop_measurement)
         self.reset_button.clicked.connect(self.on_reset_data)
 
-        self.sensor_controller.measurement_taken.connect(self.on_measurement_taken)
+        self.data_controller.data_updated.connect(self.refresh_scheduler.mark_dirty)
+        self.data_controller.data_reset.connect(self.on_data_reset)
 
-        self.data_controller.data_updated.connect(self.on_data_updated)
+        self.whole_session_checkbox.toggled.connect(self.on_follow_plot)
+        self.follow_button.clicked.connect(self.on_follow_plot)
 
     def refresh_ports(self):
-        """Обновление списка доступных портов"""
+        """Запускает фоновое обновление списка доступных портов"""
+        if self.port_scan_worker is not None:
+            return
+        self.refresh_ports_button.setEnabled(False)
+        self.port_scan_worker = PortScanWorker(self.sensor_controller, self)
+        self.port_scan_worker.ports_found.connect(self.on_ports_found)
+        self.port_scan_worker.finished.connect(self.port_scan_worker.deleteLater)
+        self.port_scan_worker.start()
+
+    @pyqtSlot(list)
+    def on_ports_found(self, ports):
+        """Заполняет список портов по результату фонового поиска"""
+        STARTUP.mark('ports_listed')
+        self.port_scan_worker = None
+        self.refresh_ports_button.setEnabled(True)
         current_port = self.port_combo.currentText()
-        ports = self.sensor_controller.get_available_ports()
 
         self.port_combo.clear()
         self.port_combo.addItems(ports)
@@ -260,6 +319,23 @@ class MainWidget(QWidget):
         if current_port in ports:
             self.port_combo.setCurrentText(current_port)
 
+    def ensure_plot_canvas(self):
+        """Создает график при первой необходимости (импорт matplotlib откладывается до этого момента)."""
+        if self.plot_canvas is not None:
+            return self.plot_canvas
+        from .plot_canvas import PlotCanvas, NavigationToolbar
+
+        self.plot_canvas = PlotCanvas(self, y_limits=(PLOT_SETTINGS.get('distance_min_y', 0),
+                                                      PLOT_SETTINGS.get('distance_max_y', 10)))
+        self.plot_toolbar = NavigationToolbar(self.plot_canvas, self)
+        self.plot_layout.replaceWidget(self.plot_placeholder, self.plot_canvas)
+        self.plot_layout.insertWidget(0, self.plot_toolbar)
+        self.plot_placeholder.deleteLater()
+        self.plot_placeholder = None
+        self.plot_canvas.view_range_changed.connect(self.on_plot_range_changed)
+        STARTUP.mark('plot_canvas')
+        return self.plot_canvas
+
     @pyqtSlot()
     def on_connect(self):
         """Обработчик нажатия кнопки подключения"""
@@ -290,6 +366,9 @@ class MainWidget(QWidget):
         self.connect_button.setEnabled(not connected)
         self.disconnect_button.setEnabled(connected)
         self.connection_status_label.setText("Подключено" if connected else "Не подключено")
+        if connected:
+            # Создаем график сразу после подключения, а не на первой пачке измерений
+            QTimer.singleShot(0, self.ensure_plot_canvas)
 
         self.laser_button.setEnabled(connected)
         if not connected:
@@ -310,12 +389,47 @@ class MainWidget(QWidget):
             self.measure_button.setEnabled(False)
             self.stop_button.setEnabled(False)
 
+    @pyqtSlot(str)
+    def on_link_lost(self, reason):
+        """Обработчик потери связи (восстановление идет автоматически)"""
+        self.connection_status_label.setText(f"Связь потеряна: {reason}")
+
+    @pyqtSlot(int, float)
+    def on_reconnect_scheduled(self, attempt, delay):
+        self.connection_status_label.setText(f"Переподключение: попытка {attempt} через {delay:.1f} с")
+
+    @pyqtSlot(float)
+    def on_link_restored(self, gap):
+        self.connection_status_label.setText(f"Подключено (связь восстановлена, разрыв {gap:.1f} с)")
+
     @pyqtSlot(float, float)
     def on_status_updated(self, temperature, voltage):
         """Обработчик обновления статуса датчика"""
         self.temperature_label.setText(f"{temperature:.1f}°C")
         self.voltage_label.setText(f"{voltage:.2f} В")
 
+    @pyqtSlot(str, str)
+    def on_acquisition_mode_changed(self, mode, reason):
+        """Обработчик смены фактического режима непрерывного измерения"""
+        self._acquisition_mode = (mode, reason)
+        self._effective_rate = 0.0
+        self._update_acquisition_mode_label()
+
+    @pyqtSlot(float)
+    def on_effective_rate_changed(self, rate):
+        """Обработчик обновления фактической частоты измерений"""
+        self._effective_rate = rate
+        self._update_acquisition_mode_label()
+
+    def _update_acquisition_mode_label(self):
+        mode, reason = self._acquisition_mode
+        if not mode:
+            self.acquisition_mode_label.setText("Н/Д")
+            return
+        names = {'fast': "Быстрый (F)", 'auto': "Авто (D)", 'slow': "Медленный (M)"}
+        text = f"{names.get(mode, mode)}, {self._effective_rate:.1f} Гц"
+        self.acquisition_mode_label.setText(f"{text}\n{reason}" if reason else text)
+
     @pyqtSlot()
     def update_sensor_status(self):
         """Запрос обновления статуса датчика"""
@@ -362,7 +476,6 @@ class MainWidget(QWidget):
             QMessageBox.warning(self, "Ошибка", "Датчик не подключен.")
             return
 
-        self.connection_status_timer.stop()
         self.reset_button.setEnabled(False)
         self.single_mode_radio.setEnabled(False)
         self.continuous_mode_radio.setEnabled(False)
@@ -370,20 +483,13 @@ class MainWidget(QWidget):
         self.laser_button.setEnabled(False)
 
         if self.single_mode_radio.isChecked():
+            # Измерение D (до нескольких секунд) идет в фоне, опрос статуса не прерывается;
+            # элементы управления возвращает on_single_measurement_finished
             self.measure_button.setEnabled(False)
-            result = self.sensor_controller.get_single_measurement()
-            self.measure_button.setEnabled(True)
-            self.reset_button.setEnabled(True)
-            self.single_mode_radio.setEnabled(True)
-            self.continuous_mode_radio.setEnabled(True)
-            self.rate_combo.setEnabled(self.continuous_mode_radio.isChecked())
-            self.laser_button.setEnabled(True)
-
-            self.connection_status_timer.start()
-
-            if not result or result[0] is None:
-                QMessageBox.warning(self, "Ошибка", "Не удалось выполнить измерение.")
+            if not self.sensor_controller.get_single_measurement():
+                self.on_single_measurement_finished(False)
         else:
+            self.connection_status_timer.stop()
             rate_mode = self.rate_combo.currentText()
             if rate_mode == "Быстро":
                 measurement_type = "fast"
@@ -397,6 +503,19 @@ class MainWidget(QWidget):
             self.measure_button.setEnabled(False)
             self.stop_button.setEnabled(True)
 
+    @pyqtSlot(bool)
+    def on_single_measurement_finished(self, success):
+        """Обработчик завершения одиночного измерения"""
+        self.measure_button.setEnabled(True)
+        self.reset_button.setEnabled(True)
+        self.single_mode_radio.setEnabled(True)
+        self.continuous_mode_radio.setEnabled(True)
+        self.rate_combo.setEnabled(self.continuous_mode_radio.isChecked())
+        self.laser_button.setEnabled(True)
+
+        if not success:
+            QMessageBox.warning(self, "Ошибка", "Не удалось выполнить измерение.")
+
     @pyqtSlot()
     def on_stop_measurement(self):
         """Обработчик нажатия кнопки остановки измерения"""
@@ -426,78 +545,140 @@ class MainWidget(QWidget):
 
         if reply == QMessageBox.Yes:
             self.data_controller.clear_data()
-            self.results_table.setRowCount(0)
             self.count_lcd.display(0)
             self.distance_lcd.display(0.0)
             self.quality_lcd.display(0)
 
-            self.plot_canvas.axes.clear()
-            self.plot_canvas.axes.set_xlabel("Время (отн. сек)")
-            self.plot_canvas.axes.set_ylabel("Расстояние (м)")
-            self.plot_canvas.axes.grid(True)
-            self.plot_canvas.draw()
-
-    @pyqtSlot(float, int)
-    def on_measurement_taken(self, distance, quality):
-        """Обработчик получения нового измерения"""
-        self.distance_lcd.display(distance)
-        self.quality_lcd.display(quality)
+            if self.plot_canvas is not None:
+                self.plot_canvas.reset()
 
     @pyqtSlot()
-    def on_data_updated(self):
-        """Обработчик обновления данных"""
-        measurements = self.data_controller.model.measurements
+    def on_data_reset(self):
+        """
+        Хранилище очищено или заменено: таблица синхронизируется сразу, не
+        дожидаясь кадра RefreshScheduler, иначе перерисовка прочитала бы
+        новое хранилище со старым числом строк. Пирамида графика строится
+        заново: по total_count она не отличит очистку, после которой пришло
+        больше измерений, чем было.
+        """
+        self.plot_pyramid.clear()
+        self.refresh_scheduler.mark_dirty()
+        self.refresh_scheduler.flush()
 
-        count = len(measurements)
+    def on_data_updated(self):
+        """Перерисовка по данным, накопленным с прошлого кадра (вызывается RefreshScheduler)"""
+        if TRACKER.enabled:
+            start_ns = time.perf_counter_ns()
+        model = self.data_controller.model
+        count = len(model.store)
         self.count_lcd.display(count)
 
-        self.results_table.setRowCount(count)
-
-        for i, (timestamp, distance, quality) in enumerate(reversed(measurements)):
-            row_index = count - 1 - i
-            if row_index < 0: continue
-
-            try:
-                time_str = time.strftime("%H:%M:%S", time.localtime(timestamp))
-            except OSError:
-                time_str = "Invalid Time"
-
-            time_item = QTableWidgetItem(time_str)
-            distance_item = QTableWidgetItem(f"{distance:.3f}")
-            quality_item = QTableWidgetItem(f"{quality}")
-
-            self.results_table.setItem(row_index, 0, time_item)
-            self.results_table.setItem(row_index, 1, distance_item)
-            self.results_table.setItem(row_index, 2, quality_item)
-
         if count > 0:
-            self.results_table.scrollToBottom()
+            # Индикаторы показывают самое свежее измерение пакета
+            self.distance_lcd.display(round(float(model.get_distances(1)[0]), 3))
+            self.quality_lcd.display(int(model.get_quality_values(1)[0]))
 
-        self.plot_canvas.axes.clear()
+        if self.results_model.sync() > 0:
+            self.results_table.scrollToBottom()
 
-        history_length = PLOT_SETTINGS.get('history_length', 100)
-        plot_data = measurements[-history_length:] if len(measurements) > 0 else []
+        self.update_statistics()
+        self.update_plot()
+        if TRACKER.enabled:
+            TRACKER.view_refreshed(start_ns)
+
+    def update_statistics(self):
+        """Показывает статистику окна и сессии в группе «Информация» (O(1), без обхода истории)."""
+        statistics = self.data_controller.model.statistics
+        window, session = statistics.window_snapshot(), statistics.session_snapshot()
+        self.stats_scope_label.setText(f"последние {statistics.window.size} / сессия ({session.count})")
+
+        def pair(window_value, session_value, scale=1.0, fmt="{:.4f}", unit="м"):
+            values = ["Н/Д" if math.isnan(value) else fmt.format(value * scale)
+                      for value in (window_value, session_value)]
+            return f"{values[0]} / {values[1]} {unit}"
+
+        labels = self.stats_labels
+        labels['mean'].setText(pair(window.mean, session.mean))
+        labels['std'].setText(pair(window.std, session.std, 1000.0, "{:.2f}", "мм"))
+        spans = ["Н/Д" if snapshot.count == 0 else f"{snapshot.min:.3f} … {snapshot.max:.3f}"
+                 for snapshot in (window, session)]
+        labels['range'].setText(f"{spans[0]} / {spans[1]} м")
+        labels['median'].setText(pair(window.median, session.median))
+        labels['drift'].setText(pair(window.drift, session.drift, 1000.0, "{:+.3f}", "мм/с"))
+        labels['weighted_mean'].setText(pair(window.weighted_mean, session.weighted_mean))
+
+    def update_plot(self):
+        """Обновляет линию графика для текущего окна просмотра."""
+        store = self.data_controller.model.store
+        if len(store) == 0:
+            if self.plot_canvas is not None:
+                self.plot_canvas.reset()
+            return
+        self.ensure_plot_canvas()
 
-        if plot_data:
-            timestamps = [m[0] for m in plot_data]
-            distances = [m[1] for m in plot_data]
+        if self._plot_manual_range is not None:
+            self.plot_pyramid.update(store)
+            x, y = self._query_manual_range()
+            self.plot_canvas.update_line(x, y, autoscale=False)
+            return
 
-            if len(timestamps) > 1:
-                first_timestamp = timestamps[0]
-                rel_timestamps = [t - first_timestamp for t in timestamps]
-                self.plot_canvas.axes.plot(rel_timestamps, distances, marker='.', linestyle='-')
-                self.plot_canvas.axes.set_title(f"Последние {len(distances)} измерений")
-            elif len(timestamps) == 1:
-                self.plot_canvas.axes.plot(0, distances[0], marker='o')
-                self.plot_canvas.axes.set_title("Одиночное измерение")
+        if store.read_only and not self.whole_session_checkbox.isChecked():
+            # Пирамида для сессии из файла строится только при обзоре всей сессии
+            origin = float(store.timestamps()[0])
         else:
-            self.plot_canvas.axes.set_title("Нет данных")
+            self.plot_pyramid.update(store)
+            origin = self.plot_pyramid.origin
+
+        max_points = 2 * self.plot_canvas.plot_width
+        filtered = None
+        if self.whole_session_checkbox.isChecked():
+            end = float(store.timestamps(1)[0])
+            timestamps, distances = self.plot_pyramid.query(store, origin, end, max_points)
+            self.plot_canvas.set_title(f"Вся сессия ({store.total_count} измерений)")
+        else:
+            history_length = PLOT_SETTINGS.get('history_length', 100)
+            timestamps, distances = minmax_decimate(store.timestamps(history_length),
+                                                    store.distances(history_length), max_points // 2)
+            model = self.data_controller.model
+            if model.filter_pipeline.stages and len(timestamps) == min(history_length, len(store)):
+                # Линия фильтра рисуется, пока окно не прореживается
+                filtered = model.get_filtered_distances(history_length)
+            self.plot_canvas.set_title(f"Последние {history_length} измерений")
+        self.plot_canvas.update_line(timestamps - origin, distances, filtered=filtered)
+
+    def _query_manual_range(self):
+        """Данные для пределов, выбранных пользователем, в разрешении графика."""
+        origin = self.plot_pyramid.origin
+        x_min, x_max = self._plot_manual_range
+        timestamps, distances = self.plot_pyramid.query(self.data_controller.model.store,
+                                                        origin + x_min, origin + x_max,
+                                                        2 * self.plot_canvas.plot_width)
+        return timestamps - origin, distances
 
-        min_y = PLOT_SETTINGS.get('distance_min_y', 0)
-        max_y = PLOT_SETTINGS.get('distance_max_y', 10)
-        self.plot_canvas.axes.set_ylim(min_y, max_y)
-        self.plot_canvas.axes.set_xlabel("Время")
-        self.plot_canvas.axes.set_ylabel("Расстояние (м)")
-        self.plot_canvas.axes.grid(True)
+    @pyqtSlot(float, float)
+    def on_plot_range_changed(self, x_min, x_max):
+        """Пользователь изменил масштаб или сдвинул график — отключаем слежение."""
+        self._plot_manual_range = (x_min, x_max)
+        self.follow_button.setEnabled(True)
+        store = self.data_controller.model.store
+        if len(store) > 0:
+            self.plot_pyramid.update(store)
+            # Панель инструментов сама выполнит полную перерисовку с новыми пределами
+            self.plot_canvas.line.set_data(*self._query_manual_range())
 
-        self.plot_canvas.draw()
+    @pyqtSlot()
+    def on_follow_plot(self):
+        """Возвращает автоматическое отслеживание новых данных."""
+        self._plot_manual_range = None
+        self.follow_button.setEnabled(False)
+        if self.plot_canvas is None:
+            self.update_plot()
+            return
+        if self.plot_toolbar.mode:
+            # Выключаем активный режим масштабирования/сдвига панели
+            if self.plot_toolbar.mode == 'zoom rect':
+                self.plot_toolbar.zoom()
+            else:
+                self.plot_toolbar.pan()
+        self.plot_canvas.reset()
+        self.update_plot()
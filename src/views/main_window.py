@@ -1,9 +1,16 @@
+import logging
+
 from PyQt5.QtWidgets import (QMainWindow, QTabWidget, QVBoxLayout,
                            QHBoxLayout, QWidget, QMenuBar, QMenu,
-                           QAction, QFileDialog, QMessageBox)
-from PyQt5.QtCore import Qt
+                           QAction, QFileDialog, QMessageBox, QProgressDialog, QLabel,
+                           QDockWidget)
+from PyQt5.QtCore import Qt, QTimer
 
+from .error_panel import ErrorPanel
+from ..models.session_format import EVENT_LINK_LOST, EVENT_LINK_RESTORED
 from .main_widget import MainWidget
+from ..utils.latency import TRACKER
+from ..utils.startup_timing import STARTUP
 
 class MainWindow(QMainWindow):
     """
@@ -13,7 +20,7 @@ class MainWindow(QMainWindow):
     включая отображение данных измерений, управление сессиями, сохранение и загрузку данных,
     а также отображение информации о приложении.
     """
-    def __init__(self, sensor_controller, data_controller):
+    def __init__(self, sensor_controller, data_controller, handler_factory=None):
         """
         Инициализирует главное окно приложения.
 
@@ -22,11 +29,18 @@ class MainWindow(QMainWindow):
                              Отвечает за подключение, отключение, запуск и остановку измерений.
             data_controller: Контроллер для управления данными измерений.
                            Отвечает за хранение, обработку, сохранение и загрузку данных измерений.
+            handler_factory (callable, optional): Создает обработчик порта для каждого
+                           датчика в окне «Несколько датчиков». По умолчанию — класс
+                           обработчика основного контроллера.
         """
         super().__init__()
+        STARTUP.mark('imports')
+        self.logger = logging.getLogger(__name__)
 
         self.sensor_controller = sensor_controller
         self.data_controller = data_controller
+        self.handler_factory = handler_factory or type(sensor_controller.serial_handler)
+        self.multi_sensor_window = None
 
         self.setWindowTitle("Measurement Application")
         self.resize(900, 700)
@@ -39,12 +53,260 @@ class MainWindow(QMainWindow):
         self.combined_widget = MainWidget(self.sensor_controller, self.data_controller)
         self.main_layout.addWidget(self.combined_widget)
 
+        # Ошибки датчика (:ErXX!) показываются в немодальной панели с ограничением
+        # частоты уведомлений; панель открывается при первом уведомлении
+        self.error_panel = ErrorPanel(self.data_controller)
+        self.error_dock = QDockWidget("Ошибки датчика", self)
+        self.error_dock.setObjectName("error_dock")
+        self.error_dock.setWidget(self.error_panel)
+        self.addDockWidget(Qt.BottomDockWidgetArea, self.error_dock)
+        self.error_dock.hide()
+        self._error_dock_opened = False
+
+        self.setup_menu()
         self.setup_connections()
+        STARTUP.mark('window_built')
+
+    def setup_menu(self):
+        """Создает главное меню приложения."""
+        self.file_menu = self.menuBar().addMenu("Файл")
+
+        self.start_recording_action = QAction("Начать запись сессии...", self)
+        self.start_recording_action.triggered.connect(self.on_start_recording)
+        self.file_menu.addAction(self.start_recording_action)
+
+        self.stop_recording_action = QAction("Остановить запись", self)
+        self.stop_recording_action.setEnabled(False)
+        self.stop_recording_action.triggered.connect(self.data_controller.stop_recording)
+        self.file_menu.addAction(self.stop_recording_action)
+
+        self.file_menu.addSeparator()
+
+        self.open_session_action = QAction("Открыть сессию...", self)
+        self.open_session_action.triggered.connect(self.on_open_session)
+        self.file_menu.addAction(self.open_session_action)
+
+        self.close_session_action = QAction("Вернуться к текущим измерениям", self)
+        self.close_session_action.setEnabled(False)
+        self.close_session_action.triggered.connect(self.data_controller.close_session)
+        self.file_menu.addAction(self.close_session_action)
+
+        self.file_menu.addSeparator()
+
+        self.export_action = QAction("Экспорт...", self)
+        self.export_action.triggered.connect(self.on_export)
+        self.file_menu.addAction(self.export_action)
+        self.export_worker = None
+        self.export_progress = None
+
+        self.tools_menu = self.menuBar().addMenu("Сервис")
+        self.multi_sensor_action = QAction("Несколько датчиков...", self)
+        self.multi_sensor_action.triggered.connect(self.on_multi_sensor)
+        self.tools_menu.addAction(self.multi_sensor_action)
+        self.error_dock_action = self.error_dock.toggleViewAction()
+        self.error_dock_action.setText("Панель ошибок датчика")
+        self.tools_menu.addAction(self.error_dock_action)
+        self.tools_menu.addSeparator()
+
+        self.latency_hud_action = QAction("Показатели задержек", self)
+        self.latency_hud_action.setCheckable(True)
+        self.latency_hud_action.toggled.connect(self.on_latency_hud_toggled)
+        self.tools_menu.addAction(self.latency_hud_action)
+
+        self.save_latency_action = QAction("Сохранить задержки в JSON...", self)
+        self.save_latency_action.setEnabled(False)
+        self.save_latency_action.triggered.connect(self.on_save_latency)
+        self.tools_menu.addAction(self.save_latency_action)
+
+        self.startup_report_action = QAction("Время запуска...", self)
+        self.startup_report_action.triggered.connect(self.on_startup_report)
+        self.tools_menu.addAction(self.startup_report_action)
+
+        # Индикатор задержек в статусной строке (виден, пока включен сбор)
+        self.latency_label = QLabel()
+        self.latency_label.setVisible(False)
+        self.statusBar().addPermanentWidget(self.latency_label)
+        self.latency_timer = QTimer(self)
+        self.latency_timer.setInterval(500)
+        self.latency_timer.timeout.connect(self.update_latency_hud)
 
     def setup_connections(self):
         """Устанавливает связи между сигналами и слотами для взаимодействия компонентов."""
-        self.sensor_controller.measurement_taken.connect(self.data_controller.add_measurement)
+        self.sensor_controller.measurements_batch.connect(self.data_controller.add_measurements_batch)
+        self.sensor_controller.sensor_error.connect(self.data_controller.add_error)
         self.sensor_controller.error_occurred.connect(self.show_error)
+        self.error_panel.notification_shown.connect(self.on_error_notification)
+        supervisor = self.sensor_controller.supervisor
+        if supervisor is not None:
+            # Разрыв связи отмечается в записи сессии служебными записями
+            supervisor.link_lost.connect(lambda reason: self.data_controller.add_event(EVENT_LINK_LOST,
+                                                                                       supervisor.lost_at))
+            supervisor.link_restored.connect(lambda gap: self.data_controller.add_event(EVENT_LINK_RESTORED))
+        self.data_controller.recording_changed.connect(self.on_recording_changed)
+        self.data_controller.recording_failed.connect(self.on_recording_failed)
+        self.data_controller.session_view_changed.connect(self.on_session_view_changed)
+
+    def on_start_recording(self):
+        """Запрашивает файл и начинает запись сессии."""
+        path, _ = QFileDialog.getSaveFileName(self, "Запись сессии", "session.bin",
+                                              "Файлы сессии (*.bin);;Все файлы (*)",
+                                              options=QFileDialog.DontConfirmOverwrite)
+        if not path:
+            return
+        try:
+            self.data_controller.start_recording(path, self.sensor_controller.serial_number,
+                                                 self.sensor_controller.firmware_version)
+        except (OSError, ValueError) as e:
+            QMessageBox.critical(self, "Ошибка", f"Не удалось начать запись сессии: {e}")
+
+    def on_open_session(self):
+        """Открывает записанную сессию для просмотра."""
+        path, _ = QFileDialog.getOpenFileName(self, "Открыть сессию", "",
+                                              "Файлы сессии (*.bin);;Все файлы (*)")
+        if not path:
+            return
+        try:
+            self.data_controller.open_session(path)
+        except (OSError, ValueError) as e:
+            QMessageBox.critical(self, "Ошибка", f"Не удалось открыть сессию: {e}")
+
+    def on_export(self):
+        """Запрашивает файл и запускает экспорт отображаемых данных в фоновом потоке."""
+        store = self.data_controller.model.store
+        if len(store) == 0:
+            QMessageBox.information(self, "Экспорт", "Нет данных для экспорта.")
+            return
+
+        filters = {"CSV (*.csv)": 'csv', "Parquet (*.parquet)": 'parquet', "HDF5 (*.h5 *.hdf5)": 'hdf5'}
+        path, selected_filter = QFileDialog.getSaveFileName(self, "Экспорт измерений", "measurements.csv",
+                                                            ";;".join(filters))
+        if not path:
+            return
+
+        from ..controllers.export_worker import ExportWorker
+        from ..models.exporters import snapshot_columns
+        # Колонки фиксируются здесь, в GUI-потоке, который пополняет хранилище
+        columns = snapshot_columns(self.data_controller.model.store)
+        self.export_worker = ExportWorker(columns, path, filters.get(selected_filter), self)
+        self.export_progress = QProgressDialog("Экспорт измерений...", "Отмена", 0, 100, self)
+        self.export_progress.setWindowTitle("Экспорт")
+        self.export_progress.setWindowModality(Qt.WindowModal)
+        self.export_progress.setMinimumDuration(500)
+        self.export_progress.canceled.connect(self.export_worker.cancel)
+
+        self.export_worker.progress.connect(self.on_export_progress)
+        self.export_worker.export_finished.connect(self.on_export_finished)
+        self.export_worker.export_failed.connect(self.on_export_failed)
+        self.export_worker.export_cancelled.connect(self.on_export_done)
+        self.export_worker.finished.connect(self.export_worker.deleteLater)
+        self.export_action.setEnabled(False)
+        self.export_worker.start()
+
+    def on_export_progress(self, written, total):
+        if self.export_progress is not None and total:
+            self.export_progress.setValue(int(written * 100 / total))
+
+    def on_export_finished(self, written):
+        path = self.export_worker.path
+        self.on_export_done()
+        self.statusBar().showMessage(f"Экспортировано {written} строк в {path}", 10000)
+
+    def on_export_failed(self, message):
+        self.on_export_done()
+        QMessageBox.critical(self, "Ошибка", f"Не удалось выполнить экспорт: {message}")
+
+    def on_export_done(self):
+        """Закрывает индикатор прогресса и разблокирует повторный экспорт."""
+        if self.export_progress is not None:
+            self.export_progress.close()
+            self.export_progress = None
+        self.export_worker = None
+        self.export_action.setEnabled(True)
+
+    def on_session_view_changed(self, path):
+        """Отражает в меню и статусной строке, какая сессия отображается."""
+        self.close_session_action.setEnabled(bool(path))
+        if path:
+            reader = self.data_controller.model.session_reader
+            self.statusBar().showMessage(f"Просмотр сессии {path}: {len(reader)} записей, "
+                                         f"модуль {reader.serial or 'н/д'}, ПО {reader.version or 'н/д'}")
+        else:
+            self.statusBar().clearMessage()
+
+    def on_recording_changed(self, recording):
+        """Обновляет меню и заголовок окна при начале/окончании записи."""
+        self.start_recording_action.setEnabled(not recording)
+        self.stop_recording_action.setEnabled(recording)
+        if recording:
+            self.setWindowTitle(f"Measurement Application — запись: {self.data_controller.recorder.path}")
+        else:
+            self.setWindowTitle("Measurement Application")
+
+    def on_recording_failed(self, message):
+        QMessageBox.critical(self, "Ошибка", f"Запись сессии остановлена: {message}")
+
+    def on_multi_sensor(self):
+        """Открывает окно одновременной работы с несколькими датчиками."""
+        if self.multi_sensor_window is None:
+            # Окно и график с matplotlib загружаются только при первом открытии
+            from .multi_sensor_window import MultiSensorWindow
+            from ..controllers.sensor_manager import SensorManager
+            busy_ports = []
+            if self.sensor_controller.is_connected and self.sensor_controller.serial_handler.serial_port:
+                busy_ports.append(self.sensor_controller.serial_handler.serial_port.port)
+            self.multi_sensor_window = MultiSensorWindow(SensorManager(self.handler_factory, parent=self),
+                                                         busy_ports)
+        self.multi_sensor_window.show()
+        self.multi_sensor_window.raise_()
+
+    def on_latency_hud_toggled(self, enabled):
+        """Включает сбор задержек по стадиям и их отображение в статусной строке."""
+        TRACKER.enable(enabled)
+        self.latency_label.setVisible(enabled)
+        self.save_latency_action.setEnabled(enabled)
+        if enabled:
+            self.update_latency_hud()
+            self.latency_timer.start()
+        else:
+            self.latency_timer.stop()
+
+    def update_latency_hud(self):
+        self.latency_label.setText(TRACKER.hud_text())
+        self.latency_label.setToolTip(f"<pre>{TRACKER.report_text()}</pre>")
+
+    def on_save_latency(self):
+        """Сохраняет гистограммы задержек в JSON."""
+        path, _ = QFileDialog.getSaveFileName(self, "Сохранить задержки", "latency.json",
+                                              "JSON (*.json);;Все файлы (*)")
+        if not path:
+            return
+        try:
+            TRACKER.dump_json(path)
+        except OSError as e:
+            QMessageBox.critical(self, "Ошибка", f"Не удалось сохранить задержки: {e}")
+            return
+        self.statusBar().showMessage(f"Задержки сохранены в {path}", 5000)
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if 'first_paint' not in STARTUP.marks:
+            STARTUP.mark('first_paint')
+            QTimer.singleShot(0, self.report_startup)
+
+    def report_startup(self):
+        """Сообщает время до первой отрисовки окна (журнал и статусная строка)."""
+        self.logger.info(STARTUP.report_text())
+        self.statusBar().showMessage(f"Окно готово за {STARTUP.marks['first_paint']:.0f} мс", 5000)
+
+    def on_startup_report(self):
+        QMessageBox.information(self, "Время запуска", f"<pre>{STARTUP.report_text()}</pre>")
+
+    def on_error_notification(self, text):
+        """Уведомление об ошибке датчика: строка состояния и (один раз) открытие панели."""
+        self.statusBar().showMessage(text, 5000)
+        if not self._error_dock_opened:
+            self._error_dock_opened = True
+            self.error_dock.show()
 
     def show_error(self, message):
         """Отображает сообщение об ошибке."""
@@ -52,7 +314,15 @@ class MainWindow(QMainWindow):
 
     def closeEvent(self, event):
         """Обработчик события закрытия окна."""
+        if self.sensor_controller.supervisor is not None:
+            self.sensor_controller.supervisor.cancel()
         if self.sensor_controller and hasattr(self.sensor_controller, 'serial_handler') and self.sensor_controller.serial_handler.is_connected:
             self.sensor_controller.stop_continuous_measurement()
             self.sensor_controller.disconnect_sensor()
+        if self.export_worker is not None:
+            self.export_worker.cancel()
+            self.export_worker.wait()
+        self.data_controller.stop_recording()
+        if self.multi_sensor_window is not None:
+            self.multi_sensor_window.close()
         event.accept()
\ No newline at end of file
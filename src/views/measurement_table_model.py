@@ -0,0 +1,97 @@
+import math
+import time
+
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex
+
+
+class MeasurementTableModel(QAbstractTableModel):
+    """
+    Табличная модель истории измерений поверх хранилища MeasurementModel.
+
+    Ячейки не создаются заранее: текст форматируется в data() только для
+    видимых строк. При поступлении данных sync() сообщает представлению
+    лишь о новых строках (и о строках, вытесненных из кольцевого буфера),
+    поэтому добавление измерения не зависит от длины истории.
+    """
+
+    HEADERS = ("Время", "Расстояние (м)", "Качество (%)")
+
+    def __init__(self, measurement_model, parent=None):
+        super().__init__(parent)
+        self.measurement_model = measurement_model
+        self._rows = 0   # Число строк, о котором знает представление
+        self._total = 0  # Значение total_count хранилища на момент последней синхронизации
+        self._store = measurement_model.store
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._rows
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return super().headerData(section, orientation, role)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole or not index.isValid():
+            return None
+
+        store = self.measurement_model.store
+        row = index.row()
+        if row >= self._rows or row >= len(store):
+            return None  # Хранилище изменилось, sync() еще не вызван
+        column = index.column()
+        if column == 0:
+            try:
+                return time.strftime("%H:%M:%S", time.localtime(store.timestamps()[row]))
+            except (OSError, OverflowError, ValueError):
+                return "Invalid Time"
+        if column == 1:
+            distance = store.distances()[row]
+            return "Ошибка" if math.isnan(distance) else f"{distance:.3f}"
+        return f"{store.qualities()[row]}"
+
+    def sync(self):
+        """
+        Приводит число строк в соответствие с хранилищем.
+
+        Returns:
+            int: Количество добавленных строк.
+        """
+        store = self.measurement_model.store
+        total = store.total_count
+        size = len(store)
+
+        if store is not self._store or total < self._total:
+            # Хранилище было очищено или заменено (открыта сессия из файла)
+            self._store = store
+            self._reset(total, size)
+            return size
+
+        added = total - self._total
+        if added == 0:
+            return 0
+
+        dropped = min(self._rows, self._rows + added - size)
+        if dropped == self._rows > 0:
+            # Кольцевой буфер перезаписан целиком — дешевле сбросить модель
+            self._reset(total, size)
+            return size
+        if dropped > 0:
+            self.beginRemoveRows(QModelIndex(), 0, dropped - 1)
+            self._rows -= dropped
+            self.endRemoveRows()
+
+        self.beginInsertRows(QModelIndex(), self._rows, size - 1)
+        self._rows = size
+        self._total = total
+        self.endInsertRows()
+        return added
+
+    def _reset(self, total, size):
+        self.beginResetModel()
+        self._rows = size
+        self._total = total
+        self.endResetModel()
@@ -0,0 +1,254 @@
+import time
+
+from PyQt5.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QGridLayout,
+                             QPushButton, QComboBox, QListWidget, QListWidgetItem, QLabel,
+                             QRadioButton, QButtonGroup, QStackedWidget, QGroupBox)
+from PyQt5.QtCore import Qt
+import numpy as np
+
+from ..config.settings import PLOT_SETTINGS
+from .plot_canvas import PlotCanvas
+from .refresh_scheduler import RefreshScheduler
+from ..utils.decimation import minmax_decimate
+
+
+class OverlayPlotCanvas(PlotCanvas):
+    """График с несколькими линиями (по одной на датчик) на общих осях."""
+
+    def __init__(self, parent=None, **kwargs):
+        self.lines = {}
+        super().__init__(parent, **kwargs)
+        self.line.set_visible(False)  # Основная линия PlotCanvas не используется
+
+    def _on_draw(self, event):
+        super()._on_draw(event)
+        for line in self.lines.values():
+            self.axes.draw_artist(line)
+
+    def reset(self):
+        for line in self.lines.values():
+            line.set_data([], [])
+        super().reset()
+
+    def set_series(self, keys):
+        """Создает линии для ключей keys и удаляет лишние."""
+        for key in list(self.lines):
+            if key not in keys:
+                self.lines.pop(key).remove()
+        for key in keys:
+            if key not in self.lines:
+                self.lines[key], = self.axes.plot([], [], linestyle='-', animated=True, label=key)
+        if self.lines:
+            self.axes.legend(handles=list(self.lines.values()), loc='upper left')
+        elif self.axes.get_legend() is not None:
+            self.axes.get_legend().remove()
+        self._request_full_draw()
+
+    def update_lines(self, series):
+        """
+        Обновляет данные линий.
+
+        Args:
+            series (dict): Ключ линии -> (x, y).
+        """
+        for key, (x, y) in series.items():
+            self.lines[key].set_data(x, y)
+        filled = [(x, y) for x, y in series.values() if len(x)]
+        if filled and self._rescale_if_needed(np.concatenate([x for x, _ in filled]),
+                                              np.concatenate([y for _, y in filled])):
+            self._request_full_draw()
+        elif self._background is not None:
+            self.restore_region(self._background)
+            for line in self.lines.values():
+                self.axes.draw_artist(line)
+            self.blit(self.axes.bbox)
+
+
+class MultiSensorWindow(QMainWindow):
+    """
+    Окно одновременной работы с несколькими датчиками.
+
+    Показывает данные каждого датчика на отдельном графике (плитка) или
+    все датчики на общем графике (наложение). Перерисовка всех графиков
+    объединяется одним RefreshScheduler.
+    """
+
+    MODES = (("Быстрый (F)", 'fast'), ("Медленный (M)", 'slow'))
+
+    def __init__(self, sensor_manager, exclude_ports=(), parent=None):
+        """
+        Args:
+            sensor_manager (SensorManager): Менеджер датчиков.
+            exclude_ports (iterable): Порты, занятые основным окном.
+        """
+        super().__init__(parent)
+        self.sensor_manager = sensor_manager
+        self.exclude_ports = set(exclude_ports)
+        self.setWindowTitle("Несколько датчиков")
+        self.resize(1000, 700)
+
+        central = QWidget()
+        self.setCentralWidget(central)
+        layout = QHBoxLayout(central)
+
+        # --- Управление ---
+        controls = QGroupBox("Датчики")
+        controls_layout = QVBoxLayout(controls)
+        self.port_list = QListWidget()
+        controls_layout.addWidget(self.port_list)
+        self.refresh_ports_button = QPushButton("Обновить")
+        self.connect_button = QPushButton("Подключить отмеченные")
+        self.disconnect_button = QPushButton("Отключить все")
+        self.mode_combo = QComboBox()
+        for title, mode in self.MODES:
+            self.mode_combo.addItem(title, mode)
+        self.start_button = QPushButton("Старт")
+        self.stop_button = QPushButton("Стоп")
+        self.clear_button = QPushButton("Очистить")
+        for widget in (self.refresh_ports_button, self.connect_button, self.disconnect_button,
+                       self.mode_combo, self.start_button, self.stop_button, self.clear_button):
+            controls_layout.addWidget(widget)
+
+        self.tile_radio = QRadioButton("Плитка")
+        self.overlay_radio = QRadioButton("Наложение")
+        self.tile_radio.setChecked(True)
+        self.layout_group = QButtonGroup(self)
+        self.layout_group.addButton(self.tile_radio)
+        self.layout_group.addButton(self.overlay_radio)
+        controls_layout.addWidget(self.tile_radio)
+        controls_layout.addWidget(self.overlay_radio)
+        controls_layout.addStretch()
+        layout.addWidget(controls)
+
+        # --- Графики ---
+        self.plot_stack = QStackedWidget()
+        self.tile_widget = QWidget()
+        self.tile_layout = QGridLayout(self.tile_widget)
+        self.overlay_canvas = OverlayPlotCanvas(
+            y_limits=(PLOT_SETTINGS.get('distance_min_y', 0), PLOT_SETTINGS.get('distance_max_y', 10)))
+        self.plot_stack.addWidget(self.tile_widget)
+        self.plot_stack.addWidget(self.overlay_canvas)
+        layout.addWidget(self.plot_stack, 1)
+
+        self.tiles = {}       # Порт -> PlotCanvas
+        self._origin = None   # Общее начало оси времени для всех датчиков
+        self._rate_marks = {}  # Порт -> (время, total_count) для расчета скорости
+        self._rates = {}
+
+        self.rate_label = QLabel()
+        self.statusBar().addPermanentWidget(self.rate_label)
+
+        self.refresh_scheduler = RefreshScheduler(self.refresh, PLOT_SETTINGS.get('max_refresh_rate', 20), self)
+
+        self.refresh_ports_button.clicked.connect(self.refresh_ports)
+        self.connect_button.clicked.connect(self.on_connect)
+        self.disconnect_button.clicked.connect(self.sensor_manager.close_all)
+        self.start_button.clicked.connect(self.on_start)
+        self.stop_button.clicked.connect(self.sensor_manager.stop_all)
+        self.clear_button.clicked.connect(self.on_clear)
+        self.overlay_radio.toggled.connect(self.on_layout_changed)
+        self.sensor_manager.sensors_changed.connect(self.rebuild_plots)
+        self.sensor_manager.data_updated.connect(self.refresh_scheduler.mark_dirty)
+        self.sensor_manager.sensor_error.connect(self.on_sensor_error)
+
+        self.refresh_ports()
+        self.rebuild_plots()
+
+    def refresh_ports(self):
+        """Заполняет список свободных портов."""
+        self.port_list.clear()
+        for port in self.sensor_manager.discover_ports(self.exclude_ports):
+            item = QListWidgetItem(port)
+            item.setFlags(item.flags() | Qt.ItemIsUserCheckable)
+            item.setCheckState(Qt.Unchecked)
+            self.port_list.addItem(item)
+
+    def on_connect(self):
+        ports = [self.port_list.item(i).text() for i in range(self.port_list.count())
+                 if self.port_list.item(i).checkState() == Qt.Checked]
+        opened = self.sensor_manager.open_sensors(ports)
+        self.statusBar().showMessage(f"Подключено датчиков: {len(opened)} из {len(ports)}", 5000)
+        self.refresh_ports()
+
+    def on_start(self):
+        self._origin = None
+        self.sensor_manager.start_all(self.mode_combo.currentData())
+
+    def on_clear(self):
+        self.sensor_manager.clear_data()
+        self._origin = None
+        self.overlay_canvas.reset()
+        for canvas in self.tiles.values():
+            canvas.reset()
+
+    def on_sensor_error(self, port, message):
+        self.statusBar().showMessage(f"{port}: {message}", 5000)
+
+    def on_layout_changed(self):
+        self.plot_stack.setCurrentIndex(1 if self.overlay_radio.isChecked() else 0)
+        self.refresh()
+
+    def rebuild_plots(self):
+        """Пересоздает плитки графиков под текущий набор датчиков."""
+        ports = list(self.sensor_manager.channels)
+        for port in list(self.tiles):
+            if port not in ports:
+                canvas = self.tiles.pop(port)
+                self.tile_layout.removeWidget(canvas)
+                canvas.deleteLater()
+        columns = max(1, int(np.ceil(np.sqrt(len(ports)))))
+        for index, port in enumerate(ports):
+            canvas = self.tiles.get(port)
+            if canvas is None:
+                canvas = PlotCanvas(width=3, height=2,
+                                    y_limits=(PLOT_SETTINGS.get('distance_min_y', 0),
+                                              PLOT_SETTINGS.get('distance_max_y', 10)))
+                self.tiles[port] = canvas
+            self.tile_layout.addWidget(canvas, index // columns, index % columns)
+        self.overlay_canvas.set_series(ports)
+        self.refresh()
+
+    def _recent(self, channel, history_length, max_points):
+        """Прореженные последние измерения датчика относительно общего начала."""
+        store = channel.store
+        timestamps, distances = minmax_decimate(store.timestamps(history_length),
+                                                store.distances(history_length), max_points // 2)
+        return timestamps - self._origin, distances
+
+    def _update_rates(self):
+        now = time.monotonic()
+        for port, channel in self.sensor_manager.channels.items():
+            mark = self._rate_marks.get(port)
+            total = channel.store.total_count
+            if mark is None or total < mark[1]:
+                self._rate_marks[port] = (now, total)
+            elif now - mark[0] >= 1.0:
+                self._rates[port] = (total - mark[1]) / (now - mark[0])
+                self._rate_marks[port] = (now, total)
+        rates = [self._rates.get(port, 0.0) for port in self.sensor_manager.channels]
+        self.rate_label.setText(f"Датчиков: {len(rates)}, всего {sum(rates):.1f} изм/с")
+
+    def refresh(self):
+        """Перерисовывает графики по данным, накопленным с прошлого кадра."""
+        self._update_rates()
+        channels = [channel for channel in self.sensor_manager.channels.values() if len(channel.store)]
+        if not channels:
+            return
+        if self._origin is None:
+            self._origin = min(float(channel.store.timestamps()[0]) for channel in channels)
+
+        history_length = PLOT_SETTINGS.get('history_length', 100)
+        if self.overlay_radio.isChecked():
+            max_points = 2 * self.overlay_canvas.plot_width
+            self.overlay_canvas.set_title(f"Последние {history_length} измерений")
+            self.overlay_canvas.update_lines({channel.port: self._recent(channel, history_length, max_points)
+                                              for channel in channels})
+        else:
+            for channel in channels:
+                canvas = self.tiles[channel.port]
+                canvas.set_title(f"{channel.port}: {self._rates.get(channel.port, 0.0):.1f} изм/с")
+                canvas.update_line(*self._recent(channel, history_length, 2 * canvas.plot_width))
+
+    def closeEvent(self, event):
+        self.sensor_manager.close_all()
+        event.accept()
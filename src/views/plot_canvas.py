@@ -0,0 +1,146 @@
+# src/views/plot_canvas.py
+"""
+График Matplotlib для встраивания в PyQt.
+
+Модуль импортирует matplotlib (самый тяжелый импорт приложения), поэтому
+представления загружают его только при первом создании графика.
+"""
+
+from PyQt5.QtWidgets import QSizePolicy
+from PyQt5.QtCore import pyqtSignal
+import numpy as np
+
+from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+from matplotlib.backends.backend_qt5agg import NavigationToolbar2QT as NavigationToolbar
+from matplotlib.figure import Figure
+
+
+class PlotCanvas(FigureCanvas):
+    """
+    Класс для встраивания графика Matplotlib в PyQt.
+
+    Линия графика создается один раз и обновляется через set_data. Статичная
+    часть осей (сетка, подписи, метки) кешируется как фон после полной
+    отрисовки, а при поступлении данных перерисовывается только линия
+    (blit). Полная перерисовка выполняется лишь тогда, когда данные выходят
+    за текущие пределы осей или меняется размер окна.
+
+    Изменение пределов по оси X пользователем (масштаб/сдвиг панели
+    инструментов) сообщается сигналом view_range_changed.
+    """
+
+    view_range_changed = pyqtSignal(float, float)
+
+    # Запас при расширении пределов, чтобы не перестраивать оси на каждом измерении
+    RESCALE_MARGIN = 0.5
+
+    def __init__(self, parent=None, width=5, height=4, dpi=100, y_limits=(0, 10)):
+        fig = Figure(figsize=(width, height), dpi=dpi)
+        self.axes = fig.add_subplot(111)
+        super().__init__(fig)
+        self.setParent(parent)
+        FigureCanvas.setSizePolicy(self,
+                                  QSizePolicy.Expanding,
+                                  QSizePolicy.Expanding)
+        FigureCanvas.updateGeometry(self)
+        self.axes.set_xlabel("Время (отн. сек)")
+        self.axes.set_ylabel("Расстояние (м)")
+        self.axes.grid(True)
+
+        self._initial_y_limits = y_limits
+        self.line, = self.axes.plot([], [], marker='.', linestyle='-', animated=True)
+        # Отфильтрованные расстояния поверх исходных (пустая линия, если не передаются)
+        self.filtered_line, = self.axes.plot([], [], linestyle='-', linewidth=1.5, animated=True)
+        self._background = None
+        self._own_limits_change = False
+        self.reset()
+        self.mpl_connect('draw_event', self._on_draw)
+        self.axes.callbacks.connect('xlim_changed', self._on_xlim_changed)
+
+    def _on_xlim_changed(self, axes):
+        if not self._own_limits_change:
+            x_min, x_max = axes.get_xlim()
+            self.view_range_changed.emit(x_min, x_max)
+
+    @property
+    def plot_width(self):
+        """Ширина области графика в пикселях."""
+        return max(1, int(self.axes.bbox.width))
+
+    def _on_draw(self, event):
+        """Кеширует фон осей после полной отрисовки и рисует поверх него линию."""
+        self._background = self.copy_from_bbox(self.axes.bbox)
+        self.axes.draw_artist(self.line)
+        self.axes.draw_artist(self.filtered_line)
+
+    def reset(self):
+        """Очищает график и возвращает исходные пределы осей."""
+        self.line.set_data([], [])
+        self.filtered_line.set_data([], [])
+        self._own_limits_change = True
+        self.axes.set_xlim(0, 10)
+        self.axes.set_ylim(*self._initial_y_limits)
+        self._own_limits_change = False
+        self.axes.set_title("Нет данных")
+        self._request_full_draw()
+
+    def set_title(self, title):
+        """Меняет заголовок графика (требует полной перерисовки)."""
+        if self.axes.get_title() != title:
+            self.axes.set_title(title)
+            self._request_full_draw()
+
+    def update_line(self, x, y, autoscale=True, filtered=None):
+        """
+        Обновляет данные линии.
+
+        Args:
+            x (numpy.ndarray): Значения по оси X.
+            y (numpy.ndarray): Значения по оси Y (может быть представлением хранилища).
+            autoscale (bool): Расширять ли пределы осей под данные. Отключается,
+                когда пределы задал пользователь.
+            filtered (numpy.ndarray, optional): Отфильтрованные значения для тех же x;
+                если None, линия фильтра скрывается.
+        """
+        self.line.set_data(x, y)
+        if filtered is None:
+            self.filtered_line.set_data([], [])
+        else:
+            self.filtered_line.set_data(x, filtered)
+        if autoscale and len(x) and self._rescale_if_needed(x, y):
+            self._request_full_draw()
+        elif self._background is not None:
+            self.restore_region(self._background)
+            self.axes.draw_artist(self.line)
+            self.axes.draw_artist(self.filtered_line)
+            self.blit(self.axes.bbox)
+
+    def _rescale_if_needed(self, x, y):
+        """Расширяет пределы осей, если данные вышли за них. Возвращает True при изменении."""
+        self._own_limits_change = True
+        try:
+            return self._expand_limits(x, y)
+        finally:
+            self._own_limits_change = False
+
+    def _expand_limits(self, x, y):
+        changed = False
+        x_min, x_max = self.axes.get_xlim()
+        data_x_min, data_x_max = float(np.min(x)), float(np.max(x))
+        if data_x_min < x_min or data_x_max > x_max:
+            span = max(data_x_max - data_x_min, 1e-9)
+            self.axes.set_xlim(data_x_min, data_x_max + span * self.RESCALE_MARGIN)
+            changed = True
+
+        y_min, y_max = self.axes.get_ylim()
+        data_y_min, data_y_max = float(np.min(y)), float(np.max(y))
+        if data_y_min < y_min or data_y_max > y_max:
+            margin = max(data_y_max - data_y_min, 1.0) * self.RESCALE_MARGIN / 2
+            self.axes.set_ylim(min(y_min, data_y_min - margin), max(y_max, data_y_max + margin))
+            changed = True
+        return changed
+
+    def _request_full_draw(self):
+        """Сбрасывает кеш фона и планирует полную перерисовку."""
+        self._background = None
+        self.draw_idle()
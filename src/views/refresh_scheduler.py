@@ -0,0 +1,58 @@
+import time
+
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+
+
+class RefreshScheduler(QObject):
+    """
+    Планировщик перерисовки с объединением запросов.
+
+    Источники данных вызывают mark_dirty() на каждое изменение, а функция
+    перерисовки вызывается не чаще max_rate раз в секунду: все изменения,
+    пришедшие между кадрами, применяются одним пакетом. Если с прошлого
+    кадра прошло больше периода, перерисовка выполняется без задержки,
+    поэтому редкие измерения отображаются сразу.
+    """
+
+    # Перерисовка выполнена (для измерения задержки до экрана)
+    refreshed = pyqtSignal()
+
+    def __init__(self, refresh_callback, max_rate=20, parent=None):
+        """
+        Args:
+            refresh_callback (callable): Функция перерисовки представления.
+            max_rate (float): Максимальное число перерисовок в секунду.
+        """
+        super().__init__(parent)
+        self.refresh_callback = refresh_callback
+        self._period = 1.0 / max(max_rate, 0.1)
+        self._dirty = False
+        self._last_refresh = 0.0
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._on_timeout)
+
+    @property
+    def max_rate(self):
+        return 1.0 / self._period
+
+    def mark_dirty(self):
+        """Помечает представление устаревшим и планирует перерисовку."""
+        if self._dirty:
+            return
+        self._dirty = True
+        delay = self._last_refresh + self._period - time.monotonic()
+        self._timer.start(max(0, int(delay * 1000)))
+
+    def flush(self):
+        """Немедленно выполняет отложенную перерисовку, если она есть."""
+        if self._dirty:
+            self._timer.stop()
+            self._on_timeout()
+
+    def _on_timeout(self):
+        self._dirty = False
+        self._last_refresh = time.monotonic()
+        self.refresh_callback()
+        self.refreshed.emit()